@@ -0,0 +1,404 @@
+"""
+benchmarks/run_benchmarks.py
+---------------------------------------------------------
+Data pipeline benchmark harness.
+Times each stage (download, read_excel, per-sheet worker
+parse, streaming projected read, unit fields, compact
+schema, phase overview, all-units list, task lookup, unit
+view models) on synthetic workbooks served by a local
+stand-in for the Google Sheets export, records frame memory
+and the peak allocation of both workbook readers, writes
+the results as JSON, and optionally compares them against
+a baseline run to catch regressions.
+
+Usage:
+    python benchmarks/run_benchmarks.py --sizes 1000 10000
+    python benchmarks/run_benchmarks.py --baseline benchmarks/results/baseline.json
+---------------------------------------------------------
+"""
+
+# ruff: noqa: E402  (src/ must be on sys.path and console logging off before the app imports)
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+os.environ.setdefault("DMRB_LOG_CONSOLE", "0")  # Keep pipeline logging out of the timings output
+
+import numpy as np
+import pandas as pd
+from streamlit.logger import set_log_level
+
+set_log_level("error")  # Streamlit warns about bare-mode caching when cached functions are defined
+
+from synthetic_workbook import build_workbook_bytes
+
+from core import datasource
+from core.data_logic import compute_all_unit_fields
+from core.phase_logic import build_all_units, build_phase_overview
+from core.schema import apply_unit_schema, format_bytes, frame_bytes
+from core.sheet_parser import parse_sheets, process_workers, shutdown_pool
+from core.sheet_reader import read_projected_sheets
+from core.snapshot_service import DASHBOARD_COLUMN_MAP, UNIT_COLUMN_MAP
+from core.task_logic import build_task_index, build_task_summaries, get_tasks_for_date
+from core.transport import get_transport
+from ui.unit_viewmodels import build_unit_viewmodels
+
+DEFAULT_SIZES = [1000, 10000]
+DEFAULT_RESULTS_DIR = ROOT / "benchmarks" / "results"
+DEFAULT_CACHE_DIR = ROOT / "benchmarks" / ".cache"
+NOISE_FLOOR_S = 0.005  # Ignore regressions smaller than this (timer noise)
+XLSX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+STAGES = [
+    "load_excel_bytes",
+    "read_excel",
+    "parse_sheets",
+    "stream_sheets",
+    "compute_all_unit_fields",
+    "apply_unit_schema",
+    "build_phase_overview",
+    "build_all_units",
+    "get_tasks_for_date",
+    "build_unit_viewmodels",
+]
+
+
+class _StandInServer:
+    """Serves one workbook over HTTP like the Google Sheets export endpoint."""
+
+    def __init__(self, body: bytes):
+        self.body = body
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # Keep-alive, like the real endpoint
+
+            def do_GET(self):
+                self.send_response(200)
+                self.send_header("Content-Type", XLSX_CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(server.body)))
+                self.end_headers()
+                self.wfile.write(server.body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}/export?format=xlsx"
+
+    def __enter__(self) -> "_StandInServer":
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def _workbook(n_units: int, seed: int, today: date, cache_dir: Optional[Path]) -> bytes:
+    """Synthetic workbook bytes, cached on disk per (size, seed, day)."""
+    if cache_dir is None:
+        return build_workbook_bytes(n_units, seed=seed, today=today)
+    path = cache_dir / f"dmrb_{n_units}_{seed}_{today:%Y%m%d}.xlsx"
+    if not path.exists():
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(build_workbook_bytes(n_units, seed=seed, today=today))
+    return path.read_bytes()
+
+
+def _time(fn: Callable[[], object], repeat: int) -> Dict[str, object]:
+    """Run fn `repeat` times; return the timings and the last result."""
+    runs, result = [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        runs.append(time.perf_counter() - start)
+    return {
+        "runs": runs,
+        "min": min(runs),
+        "median": statistics.median(runs),
+        "mean": statistics.fmean(runs),
+        "result": result,
+    }
+
+
+def _peak_bytes(fn: Callable[[], object]) -> int:
+    """Peak Python allocation while fn runs (measured apart from the timed runs)."""
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def _cold_download() -> bytes:
+    """load_excel_bytes with no fresh payload or previous version to revalidate."""
+    datasource.clear_data_cache()
+    datasource._sources.clear()
+    content, _ = datasource.load_excel_bytes()
+    return content
+
+
+def benchmark_size(
+    n_units: int,
+    repeat: int = 3,
+    seed: int = 0,
+    cache_dir: Optional[Path] = DEFAULT_CACHE_DIR,
+) -> Dict[str, object]:
+    """
+    Time every pipeline stage on one synthetic workbook size.
+
+    Each stage feeds the next, mirroring the page load: the workbook is
+    downloaded, parsed, enriched, then aggregated for the Dashboard.
+    """
+    today = date.today()
+    body = _workbook(n_units, seed, today, cache_dir)
+    stages: Dict[str, Dict[str, object]] = {}
+
+    with _StandInServer(body) as server:
+        previous_url = os.environ.get("GDRIVE_XLSX_URL")
+        os.environ["GDRIVE_XLSX_URL"] = server.url
+        try:
+            stages["load_excel_bytes"] = _time(_cold_download, repeat)
+            download = get_transport().last()
+        finally:
+            if previous_url is None:
+                os.environ.pop("GDRIVE_XLSX_URL", None)
+            else:
+                os.environ["GDRIVE_XLSX_URL"] = previous_url
+
+    content = stages["load_excel_bytes"]["result"]
+    sheet_names = ["Unit", "Task"]
+
+    def read_excel():
+        return pd.read_excel(BytesIO(content), sheet_name=sheet_names)
+
+    def stream_sheets():
+        return read_projected_sheets(content, sheet_names)
+
+    stages["read_excel"] = _time(read_excel, repeat)
+    sheets = stages["read_excel"]["result"]
+    # Worker-process parse regardless of PARSE_PROCESS_MIN_BYTES (in-process on single-core hosts)
+    parse_workers = process_workers(2, len(content), min_bytes=0)
+    stages["parse_sheets"] = _time(lambda: parse_sheets(content, sheet_names, min_bytes=0), repeat)
+    stages["stream_sheets"] = _time(stream_sheets, repeat)
+    peak_bytes = {
+        "read_excel": _peak_bytes(read_excel),
+        "stream_sheets": _peak_bytes(stream_sheets),
+    }
+
+    units_raw = sheets["Unit"].rename(columns=UNIT_COLUMN_MAP)
+    stages["compute_all_unit_fields"] = _time(
+        lambda: compute_all_unit_fields(units_raw, today=today), repeat
+    )
+    enriched = stages["compute_all_unit_fields"]["result"]
+    stages["apply_unit_schema"] = _time(lambda: apply_unit_schema(enriched), repeat)
+    units = stages["apply_unit_schema"]["result"]
+    dashboard_units = units.rename(columns=DASHBOARD_COLUMN_MAP)
+
+    stages["build_phase_overview"] = _time(
+        lambda: build_phase_overview(dashboard_units, today=today), repeat
+    )
+    stages["build_all_units"] = _time(lambda: build_all_units(dashboard_units), repeat)
+    yesterday = today - timedelta(days=1)
+    stages["get_tasks_for_date"] = _time(
+        lambda: get_tasks_for_date(sheets["Task"], yesterday), repeat
+    )
+    task_summaries = build_task_summaries(build_task_index(sheets["Task"]), today)
+    stages["build_unit_viewmodels"] = _time(
+        lambda: build_unit_viewmodels(units, task_summaries), repeat
+    )
+
+    for timing in stages.values():
+        timing.pop("result")
+    return {
+        "units": n_units,
+        "tasks": len(sheets["Task"]),
+        "workbook_bytes": len(body),
+        "parse_workers": parse_workers,
+        "download": {
+            "wire_bytes": download.wire_bytes,
+            "ttfb_s": download.ttfb_s,
+            "transfer_s": download.transfer_s,
+            "throughput_bps": download.throughput_bps,
+        },
+        "memory_bytes": {
+            "units_enriched": frame_bytes(enriched),
+            "units_compact": frame_bytes(units),
+            "tasks": frame_bytes(sheets["Task"]),
+        },
+        "peak_bytes": peak_bytes,
+        "stages": stages,
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT, capture_output=True, text=True, timeout=10,
+        )
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def run_benchmarks(
+    sizes: List[int],
+    repeat: int = 3,
+    seed: int = 0,
+    cache_dir: Optional[Path] = DEFAULT_CACHE_DIR,
+) -> Dict[str, object]:
+    """Benchmark every size and return the JSON-serializable report."""
+    report = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "environment": {
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "git_commit": _git_commit(),
+        },
+        "config": {"sizes": sizes, "repeat": repeat, "seed": seed},
+        "results": [
+            benchmark_size(n, repeat=repeat, seed=seed, cache_dir=cache_dir) for n in sizes
+        ],
+    }
+    shutdown_pool()
+    return report
+
+
+def compare_results(
+    report: Dict[str, object], baseline: Dict[str, object], tolerance: float = 0.25
+) -> List[str]:
+    """
+    List stages whose median got slower than baseline * (1 + tolerance).
+
+    Only sizes present in both reports are compared; differences under
+    NOISE_FLOOR_S are ignored.
+    """
+    base_by_size = {r["units"]: r["stages"] for r in baseline.get("results", [])}
+    regressions = []
+    for result in report["results"]:
+        base_stages = base_by_size.get(result["units"])
+        if base_stages is None:
+            continue
+        for stage, timing in result["stages"].items():
+            if stage not in base_stages:
+                continue
+            before, after = base_stages[stage]["median"], timing["median"]
+            if after > before * (1 + tolerance) and after - before > NOISE_FLOOR_S:
+                regressions.append(
+                    f"{result['units']} units / {stage}: "
+                    f"{before * 1000:.1f} ms -> {after * 1000:.1f} ms"
+                )
+    return regressions
+
+
+def _print_report(report: Dict[str, object]) -> None:
+    for result in report["results"]:
+        print(
+            f"\n{result['units']} units, {result['tasks']} tasks "
+            f"({result['workbook_bytes'] / 1e6:.1f} MB)"
+        )
+        if "parse_workers" in result:
+            workers = result["parse_workers"]
+            mode = f"{workers} worker processes" if workers else "in-process (single core)"
+            print(f"  parse_sheets: {mode}")
+        memory = result.get("memory_bytes")
+        if memory:
+            print(
+                f"  units frame {format_bytes(memory['units_enriched'])} -> "
+                f"{format_bytes(memory['units_compact'])} compact, "
+                f"tasks frame {format_bytes(memory['tasks'])}"
+            )
+        peak = result.get("peak_bytes")
+        if peak:
+            print(
+                f"  reader peak: read_excel {format_bytes(peak['read_excel'])}, "
+                f"stream_sheets {format_bytes(peak['stream_sheets'])}"
+            )
+        download = result.get("download")
+        if download:
+            print(
+                f"  download: ttfb {download['ttfb_s'] * 1000:.1f} ms, "
+                f"transfer {download['transfer_s'] * 1000:.1f} ms "
+                f"({download['throughput_bps'] / 1024 ** 2:.0f} MB/s)"
+            )
+        for stage, timing in result["stages"].items():
+            print(
+                f"  {stage:<26} median {timing['median'] * 1000:9.1f} ms   "
+                f"min {timing['min'] * 1000:9.1f} ms"
+            )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the DMRB data pipeline.")
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+        help="Unit counts (e.g. 1000 10000 100000)",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per stage")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--output", type=Path,
+        help="JSON output path (default: benchmarks/results/<timestamp>.json)",
+    )
+    parser.add_argument("--baseline", type=Path, help="Previous JSON report to compare against")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.25,
+        help="Allowed slowdown vs baseline (0.25 = 25%%)",
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true",
+        help="Regenerate workbooks instead of using benchmarks/.cache",
+    )
+    args = parser.parse_args()
+
+    cache_dir = None if args.no_cache else DEFAULT_CACHE_DIR
+    report = run_benchmarks(args.sizes, repeat=args.repeat, seed=args.seed, cache_dir=cache_dir)
+    _print_report(report)
+
+    output = args.output or DEFAULT_RESULTS_DIR / f"bench_{datetime.now():%Y%m%d_%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"\nResults written to {output}")
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        regressions = compare_results(report, baseline, args.tolerance)
+        if regressions:
+            print("\nRegressions vs baseline:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print("\nNo regressions vs baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
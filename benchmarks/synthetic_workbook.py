@@ -0,0 +1,121 @@
+"""
+benchmarks/synthetic_workbook.py
+---------------------------------------------------------
+Synthetic DMRB workbooks for benchmarks and load tests.
+Unit and Task sheets use the real column names; sizes are
+configurable (1k, 10k, 100k units). Output is deterministic
+for a given seed and reference day.
+---------------------------------------------------------
+"""
+
+import argparse
+from datetime import date
+from io import BytesIO
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+# Task sheet date columns (see core.task_logic.TASK_DATE_COLUMNS)
+TASK_DATE_COLUMNS = [
+    'Inspection Date', 'Bids Date', 'Paint Date', 'MR date', 'HK Date',
+    'F/C Date', 'Other Task Date', 'O/T Date', 'Final walk Date',
+]
+
+UNITS_PER_BUILDING = 24
+BUILDINGS_PER_PHASE = 17
+STATUSES = ['Ready', 'In Turn', 'Started', 'In Progress', 'Pending', 'Hold', None]
+VENDORS = ['Ana', 'Bob', 'Carlos', 'Dee', 'ProPaint', 'CleanCo', None]
+TASK_STATUSES = ['Open', 'Scheduled', 'Done', None]
+
+
+def _random_days(
+    rng: np.random.Generator, base: pd.Timestamp, n: int, low: int, high: int, missing: float
+) -> pd.Series:
+    """Dates base + [low, high) days, with a `missing` share left blank."""
+    values = base + pd.to_timedelta(rng.integers(low, high, size=n), unit='D')
+    return pd.Series(values).where(rng.random(n) >= missing)
+
+
+def generate_units(n_units: int, seed: int = 0, today: Optional[date] = None) -> pd.DataFrame:
+    """
+    Build a Unit sheet with n_units rows.
+
+    Columns: Unit id, Unit, Phases, Building, Move-out, Move-in, Status, DV, DTBR.
+    """
+    rng = np.random.default_rng(seed)
+    base = pd.Timestamp(today or date.today())
+
+    slot = np.arange(n_units)
+    building_slot = slot // UNITS_PER_BUILDING
+    phase = building_slot // BUILDINGS_PER_PHASE + 1
+    building = building_slot % BUILDINGS_PER_PHASE + 1
+    unit = (slot % UNITS_PER_BUILDING) // 6 * 100 + 100 + slot % 6  # floor * 100 + door
+
+    move_out = _random_days(rng, base, n_units, -60, 30, missing=0.25)
+    turn_days = pd.to_timedelta(rng.integers(5, 45, size=n_units), unit='D')
+    move_in = (move_out + turn_days).where(rng.random(n_units) >= 0.5)
+    dv = (base - move_out).dt.days.where(move_out <= base)
+    dtbr = (move_in - base).dt.days
+
+    return pd.DataFrame({
+        'Unit id': [f"P-{p} / Bld-{b} / U-{u}" for p, b, u in zip(phase, building, unit)],
+        'Unit': unit,
+        'Phases': phase,
+        'Building': building,
+        'Move-out': move_out,
+        'Move-in': move_in,
+        'Status': rng.choice(np.array(STATUSES, dtype=object), size=n_units),
+        'DV': dv,
+        'DTBR': dtbr,
+    })
+
+
+def generate_tasks(
+    units: pd.DataFrame, seed: int = 0, today: Optional[date] = None
+) -> pd.DataFrame:
+    """
+    Build a Task sheet with one row per unit in turn (units with a Move-out).
+
+    Columns: Unit ID, Vendor / Employee, Task Status and the nine task date columns.
+    """
+    rng = np.random.default_rng(seed + 1)
+    base = pd.Timestamp(today or date.today())
+    in_turn = units[units['Move-out'].notna()]
+    n = len(in_turn)
+
+    tasks = pd.DataFrame({
+        'Unit ID': in_turn['Unit id'].to_numpy(),
+        'Vendor / Employee': rng.choice(np.array(VENDORS, dtype=object), size=n),
+        'Task Status': rng.choice(np.array(TASK_STATUSES, dtype=object), size=n),
+    })
+    for col in TASK_DATE_COLUMNS:
+        tasks[col] = _random_days(rng, base, n, -14, 14, missing=0.4).to_numpy()
+    return tasks
+
+
+def build_workbook_bytes(n_units: int, seed: int = 0, today: Optional[date] = None) -> bytes:
+    """Write Unit and Task sheets for n_units to an in-memory xlsx."""
+    units = generate_units(n_units, seed=seed, today=today)
+    tasks = generate_tasks(units, seed=seed, today=today)
+    buffer = BytesIO()
+    with pd.ExcelWriter(buffer, engine='openpyxl') as writer:
+        units.to_excel(writer, sheet_name='Unit', index=False)
+        tasks.to_excel(writer, sheet_name='Task', index=False)
+    return buffer.getvalue()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Write a synthetic DMRB workbook.")
+    parser.add_argument("units", type=int, help="Number of units (e.g. 1000, 10000, 100000)")
+    parser.add_argument("output", type=Path, help="Output .xlsx path")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    args.output.write_bytes(build_workbook_bytes(args.units, seed=args.seed))
+    print(f"Wrote {args.units} units to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,7 +8,9 @@ Home page with community overview and module navigation.
 import streamlit as st
 from utils.styling import inject_css
 from core.logger import log_event
-from utils.constants import APP_NAME, APP_VERSION, TOTAL_UNITS
+from utils.constants import APP_NAME, APP_VERSION
+from core.properties import load_properties, portfolio_total_units
+from core.snapshot_service import load_portfolio
 
 # --- Page Configuration ---
 st.set_page_config(
@@ -31,16 +33,19 @@ st.title("🍁 Thousand Oaks")
 st.caption(f"{APP_NAME} · v{APP_VERSION}")
 st.divider()
 
+properties = load_properties()
+
 # --- Overview Stats ---
 st.subheader("🏢 Community Overview")
 
 col1, col2, col3 = st.columns(3, gap="large")
 
 with col1:
+    total_units = portfolio_total_units(properties)
     st.markdown(f'''
     <div style='background: var(--gray-200); border: 1px solid var(--gray-400); border-radius: var(--radius-md); padding: var(--spacing-md); text-align: center; box-shadow: var(--shadow-md);'>
         <div style='color: var(--gray-700); font-size: 0.75rem; font-weight: 600; text-transform: uppercase;'>Total Units</div>
-        <div style='color: var(--gray-900); font-size: 2.5rem; font-weight: 800; margin: 0.5rem 0;'>{TOTAL_UNITS:,}</div>
+        <div style='color: var(--gray-900); font-size: 2.5rem; font-weight: 800; margin: 0.5rem 0;'>{total_units:,}</div>
         <div style='color: var(--gray-700); font-size: 0.875rem;'>Apartment Units</div>
     </div>
     ''', unsafe_allow_html=True)
@@ -65,6 +70,17 @@ with col3:
 
 st.divider()
 
+# --- Portfolio (several properties, loaded concurrently) ---
+if len(properties) > 1:
+    st.subheader("🏘️ Portfolio")
+    portfolio = load_portfolio(properties)
+    st.dataframe(portfolio.summary(), hide_index=True, use_container_width=True)
+    st.caption(
+        f"{len(portfolio.snapshots)}/{len(properties)} properties loaded "
+        f"in {portfolio.load_s:.1f}s"
+    )
+    st.divider()
+
 # --- Dashboard Modules ---
 st.subheader("📍 Dashboard Modules")
 
@@ -8,24 +8,28 @@ Main dashboard view with occupancy metrics and phase overview.
 
 import streamlit as st
 import pandas as pd
-from datetime import datetime, timedelta
+from datetime import timedelta
 
 # --- Internal Imports ---
 import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
 
-from core.data_loader import load_units_sheet, load_task_sheet
-from core.data_logic import compute_all_unit_fields
+from core.snapshot_service import get_property_snapshot, snapshot_freshness
 from utils.styling import inject_css, render_section_container_start, render_section_container_end, render_section_container_start, render_section_container_end
-from utils.constants import TOTAL_UNITS
 from ui.hero_cards import render_kpi_card, render_kpi_card_with_progress
-from ui.expanders import render_phase_expander, render_unit_row
+from ui.expanders import RULE_HTML, render_phase_expander, render_unit_rows
 from ui.toggle_controls import render_expand_collapse_controls, get_expanded_state
 from ui.sections import create_simple_section, render_section
-from ui.refresh_controls import render_refresh_controls
+from ui.refresh_controls import (
+    render_property_selector, render_refresh_controls, render_staleness_badge,
+)
+from ui.debug_panel import render_profiler_panel
+from utils.profiler import end_rerun, start_rerun
 from core.logger import log_event
 from core.phase_logic import build_phase_overview, build_all_units
+from core.task_logic import build_task_index
+from ui.task_cards import render_all_tasks, render_task_calendar
 
 # --- Page Setup ---
 st.set_page_config(
@@ -35,38 +39,26 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# --- Rerun profiling (see ui.debug_panel) ---
+start_rerun("Dashboard")
+
 # --- Inject Global CSS ---
 inject_css()
 
 # --- Constants (imported from utils.constants) ---
 
+# --- Property (picker shown when several are configured) ---
+with st.sidebar:
+    selected_property = render_property_selector(key_prefix="dash")
+
 # --- Load Data ---
 try:
-    units_df = load_units_sheet()
-    # Compute lifecycle labels and other derived fields
-    column_mapping = {
-        'Move-out': 'move_out',
-        'Move-in': 'move_in',
-        'Unit': 'unit_id',
-        'Phases': 'phase',
-        'Building': 'building',
-        'Status': 'status',
-        'DV': 'days_vacant',        # Pull from Excel (not calculated)
-        'DTBR': 'days_to_be_ready'  # Pull from Excel (not calculated)
-    }
-    units_df = units_df.rename(columns=column_mapping)
-    # Compute all derived fields including NVM status
+    # Loading, column normalization and derived fields (incl. NVM status) run once
+    # per data version in the shared snapshot; this page only reads from it.
+    snapshot = get_property_snapshot(selected_property)
+    units_df = snapshot.dashboard_units
     # Use a single, consistent 'today' for derived computations on this page
-    today_ref = datetime.now().date()
-    units_df = compute_all_unit_fields(units_df, today=today_ref)
-    # Rename back for compatibility (nvm is computed, stays lowercase)
-    units_df = units_df.rename(columns={
-        'move_out': 'Move-out',
-        'move_in': 'Move-in',
-        'unit_id': 'Unit',
-        'phase': 'Phases',
-        'building': 'Building'
-    })
+    today_ref = snapshot.today
 except Exception as e:
     st.error(f"❌ Failed to load Excel data: {e}")
     st.stop()
@@ -78,14 +70,11 @@ if missing_cols:
     st.error(f"❌ Missing required columns: {missing_cols}")
     st.stop()
 
-# --- Vacancy Calculation ---
-from utils.constants import VACANT_STATUSES
-nvm_normalized = units_df["nvm"].fillna("").astype(str).str.strip().str.lower()
-vacant_units = nvm_normalized.isin([s.lower() for s in VACANT_STATUSES]).sum()
-
-# --- Occupancy Calculation ---
-occupied_units = TOTAL_UNITS - vacant_units
-occupancy_pct = round((occupied_units / TOTAL_UNITS) * 100, 1) if TOTAL_UNITS else 0
+# --- Vacancy / Occupancy (precomputed in the snapshot) ---
+kpis = snapshot.kpis
+vacant_units = kpis['vacant_units']
+occupied_units = kpis['occupied_units']
+occupancy_pct = round(kpis['occupancy_pct'], 1)
 
 # --- Sidebar Controls ---
 with st.sidebar:
@@ -112,13 +101,16 @@ st.markdown("""
         margin-bottom: 25px;
     }
 </style>
-
-<h1 class="main-title">🍁 Thousand Oaks</h1>
+""", unsafe_allow_html=True)
+st.markdown(f"""
+<h1 class="main-title">🍁 {selected_property.name}</h1>
 <div class="caption-centered">
     Operational Dashboard
 </div>
 """, unsafe_allow_html=True)
 
+# --- Stale data badge (served while the sheet revalidates) ---
+render_staleness_badge(snapshot_freshness(snapshot))
 
 # --- KPI Section ---
 render_section_container_start("Key Performance Indicators", "📊")
@@ -128,7 +120,7 @@ col1, col2, col3, col4 = st.columns(4, gap="medium")
 with col1:
     render_kpi_card(
         label="🏢 Total Units",
-        value=f"{TOTAL_UNITS:,}",
+        value=f"{kpis['total_units']:,}",
         emoji=""
     )
 
@@ -166,17 +158,18 @@ def render_move_outs_today(context):
     today = context['today']
     
     move_out_dates = pd.to_datetime(units_df['Move-out'], errors='coerce')
-    move_outs = units_df[move_out_dates.dt.date >= today].copy()
+    move_outs = units_df[move_out_dates.dt.date >= today]
     move_outs = move_outs.sort_values('Move-out')
     
     st.markdown(f"**{len(move_outs)} move-outs** today and upcoming")
     st.divider()
     
     if len(move_outs) > 0:
+        units = []
         for _, row in move_outs.iterrows():
             move_out_date = pd.to_datetime(row.get('Move-out'), errors='coerce')
             move_in_date = pd.to_datetime(row.get('Move-in'), errors='coerce')
-            unit = {
+            units.append({
                 'unit_num': str(row.get('Unit id', '')),
                 'status_emoji': '🔴',  # Red - still occupied
                 'move_out_str': move_out_date.strftime('%m/%d/%y') if pd.notna(move_out_date) else '—',
@@ -185,8 +178,8 @@ def render_move_outs_today(context):
                 'days_to_be_ready': row.get('days_to_be_ready', '—'),
                 'nvm': row.get('nvm', '—'),
                 'lifecycle_label': row.get('lifecycle_label', 'Not Ready')
-            }
-            render_unit_row(unit)
+            })
+        render_unit_rows(units, separator="")
     else:
         st.info("No upcoming move-outs")
 
@@ -196,16 +189,17 @@ def render_move_ins_tomorrow(context):
     tomorrow = context['today'] + timedelta(days=1)
     
     move_in_dates = pd.to_datetime(units_df['Move-in'], errors='coerce')
-    move_ins = units_df[move_in_dates.dt.date == tomorrow].copy()
+    move_ins = units_df[move_in_dates.dt.date == tomorrow]
     
     st.markdown(f"**{len(move_ins)} move-ins** scheduled for tomorrow")
     st.divider()
     
     if len(move_ins) > 0:
+        units = []
         for _, row in move_ins.iterrows():
             move_in_date = pd.to_datetime(row.get('Move-in'), errors='coerce')
             move_out_date = pd.to_datetime(row.get('Move-out'), errors='coerce')
-            unit = {
+            units.append({
                 'unit_num': str(row.get('Unit id', '')),
                 'status_emoji': '🔴',  # Red - moving in (occupied)
                 'move_out_str': move_out_date.strftime('%m/%d/%y') if pd.notna(move_out_date) else '—',
@@ -214,8 +208,8 @@ def render_move_ins_tomorrow(context):
                 'days_to_be_ready': row.get('days_to_be_ready', '—'),
                 'nvm': row.get('nvm', '—'),
                 'lifecycle_label': row.get('lifecycle_label', 'Not Ready')
-            }
-            render_unit_row(unit)
+            })
+        render_unit_rows(units, separator="")
     else:
         st.info("No move-ins tomorrow")
 
@@ -243,25 +237,34 @@ st.divider()
 
 # --- Walk of the Day Section ---
 
-# Load Task sheet
-try:
-    tasks_df = load_task_sheet()
-except Exception as e:
-    tasks_df = pd.DataFrame()
-    log_event("WARNING", f"Could not load tasks: {e}")
+# Task sheet (loaded with the snapshot)
+tasks_df = snapshot.tasks
 
 # Render Walk of the Day section
-from core.task_logic import get_yesterday_tasks
-from ui.task_cards import render_all_tasks
-
 render_section_container_start("Walk of the Day", "🚶")
 
 if not tasks_df.empty:
-    # Get yesterday's tasks grouped by type
-    yesterday_tasks = get_yesterday_tasks(tasks_df)
+    # Task dates are indexed once per data version; any day is a slice lookup
+    task_index = snapshot.view("task_index", lambda snap: build_task_index(snap.tasks))
+    walk_date = st.date_input("🗓️ Walk date", value=today_ref - timedelta(days=1), key="walk_date")
+
+    # Walk date's tasks per type as Phase → Building hierarchies (memoized per date and type)
+    walk_hierarchies = task_index.hierarchies_for(walk_date)
     
     # Render all tasks in hierarchical structure
-    render_all_tasks(yesterday_tasks, units_df)
+    render_all_tasks(walk_hierarchies)
+
+    # Week planner: task counts per day for a date range (defaults to the next 7 days)
+    with st.expander("📅 Task Calendar", expanded=False):
+        calendar_range = st.date_input(
+            "Date range",
+            value=(today_ref, today_ref + timedelta(days=6)),
+            key="task_calendar_range",
+        )
+        if isinstance(calendar_range, (tuple, list)) and len(calendar_range) == 2:
+            render_task_calendar(task_index, *calendar_range)
+        else:
+            st.caption("Select a start and end date")
 else:
     st.warning("Task sheet not available")
 
@@ -279,8 +282,10 @@ expand_all, collapse_all = render_expand_collapse_controls(
 
 st.divider()
 
-today = datetime.now().date()
-phase_data = build_phase_overview(units_df, today=today)
+phase_data = snapshot.view(
+    "dashboard_phase_overview",
+    lambda snap: build_phase_overview(snap.dashboard_units, today=snap.today),
+)
 
 # Render phase cards
 if phase_data:
@@ -301,32 +306,26 @@ st.divider()
 # --- All Units Section ---
 render_section_container_start("All Units", "📋")
 
-all_units = build_all_units(units_df)
+all_units = snapshot.view("dashboard_all_units", lambda snap: build_all_units(snap.dashboard_units))
 
 with st.expander(f"📋 View All Units ({len(all_units)} total)", expanded=False):
-    for idx, unit in enumerate(all_units):
-        render_unit_row(unit)
-        if idx < len(all_units) - 1:
-            st.divider()
+    render_unit_rows(all_units, separator=RULE_HTML)
 
 render_section_container_end()
 # --- All Units with Move-in dates only, sorted by Move-in (ascending - soonest first) ---
 render_section_container_start("All Units moving dates", "📋")
 
-# Filter units with Move-in dates only
-units_with_movein = units_df[pd.notna(units_df['Move-in'])].copy()
+def _build_units_with_movein(snap) -> list:
+    """Units with Move-in dates only, sorted by Move-in (ascending - soonest first)."""
+    units = snap.dashboard_units
+    units_with_movein = units[pd.notna(units['Move-in'])]
+    units_with_movein = units_with_movein.sort_values('Move-in', na_position='last')
+    return build_all_units(units_with_movein)
 
-# Sort by Move-in date (ascending - soonest first)
-units_with_movein = units_with_movein.sort_values('Move-in', na_position='last')
-
-# Build unit list
-all_units = build_all_units(units_with_movein)
+all_units = snapshot.view("dashboard_units_with_movein", _build_units_with_movein)
 
 with st.expander(f"📋 View All Units ({len(all_units)} total)", expanded=False):
-    for idx, unit in enumerate(all_units):
-        render_unit_row(unit)
-        if idx < len(all_units) - 1:
-            st.divider()
+    render_unit_rows(all_units, separator=RULE_HTML)
 
 render_section_container_end()
 
@@ -335,3 +334,6 @@ st.divider()
 st.caption("© 2025 Thousand Oaks | Local MVP | Internal Use Only")
 
 log_event("INFO", "Dashboard page loaded successfully")
+
+# --- Debug: per-rerun stage timings (DMRB_PROFILE=1 or ?profile=1) ---
+render_profiler_panel(end_rerun(), snapshot)
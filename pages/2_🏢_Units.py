@@ -15,16 +15,20 @@ from pathlib import Path
 import re
 sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
 
-from core.data_loader import load_units_sheet, load_task_sheet
-from core.data_logic import compute_all_unit_fields
-from utils.constants import EXCEL_FILE_PATH, TOTAL_UNITS, NVM_EMOJI_MAP
-from ui.unit_cards import render_unit_kpi_cards
-from ui.expanders import render_unit_row
+from core.snapshot_service import get_property_snapshot, snapshot_freshness
+from utils.constants import NVM_EMOJI_MAP
+from ui.unit_cards import render_unit_kpi_cards, render_unit_changes
+from ui.expanders import render_pager, render_unit_rows
 from ui.sections import create_simple_section, render_section
 from core.logger import log_event
 from utils.styling import inject_css, render_section_container_start, render_section_container_end
-from ui.refresh_controls import render_refresh_controls
-from ui.unit_viewmodels import build_enhanced_unit
+from ui.refresh_controls import (
+    render_property_selector, render_refresh_controls, render_staleness_badge,
+)
+from ui.debug_panel import render_profiler_panel
+from utils.profiler import end_rerun, start_rerun
+from ui.unit_viewmodels import build_unit_viewmodels, unit_records
+from core.task_logic import build_task_index, build_task_summaries
 
 # --- Page Setup ---
 st.set_page_config(
@@ -34,37 +38,28 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# --- Rerun profiling (see ui.debug_panel) ---
+start_rerun("Units")
+
 # --- Inject Global CSS ---
 inject_css()
 
+# --- Property (picker shown when several are configured) ---
+with st.sidebar:
+    selected_property = render_property_selector(key_prefix="units")
+
 # --- Load Data ---
 try:
-    units_df = load_units_sheet(EXCEL_FILE_PATH)
-    column_mapping = {
-        'Move-out': 'move_out',
-        'Move-in': 'move_in',
-        'Unit': 'unit_number',
-        'Unit id': 'unit_id',  # Full path like P-5 / Bld-1 / U-210
-        'Phases': 'phase',
-        'Building': 'building',
-        'Status': 'status',
-        'DV': 'days_vacant',        # Pull from Excel (not calculated)
-        'DTBR': 'days_to_be_ready'  # Pull from Excel (not calculated)
-    }
-    units_df = units_df.rename(columns=column_mapping)
-    # Keep status as-is (will be NaN if not populated in Excel)
+    # Column normalization and derived fields are computed once per data
+    # version in the shared snapshot; this page only reads from it.
+    snapshot = get_property_snapshot(selected_property)
+    units_df = snapshot.units
     # Use a single, consistent 'today' for all derived computations and UI
-    today_ref = datetime.now().date()
-    units_df = compute_all_unit_fields(units_df, today=today_ref)
+    today_ref = snapshot.today
 except Exception as e:
     st.error(f"Failed to load data: {e}")
     st.stop()
 
-try:
-    tasks_df = load_task_sheet(EXCEL_FILE_PATH)
-except:
-    tasks_df = pd.DataFrame()
-
 # --- Sidebar ---
 with st.sidebar:
     render_refresh_controls(key_prefix="units", auto_refresh=True)
@@ -72,35 +67,20 @@ with st.sidebar:
 # --- Header ---
 st.markdown("<h1 style='text-align: center;'>🏢 Units Lifecycle Tracker</h1>", unsafe_allow_html=True)
 st.markdown("<p style='text-align: center; color: var(--gray-700);'>Phase → Building → Unit | Notice → Vacant → In Turn → Ready</p>", unsafe_allow_html=True)
+render_staleness_badge(snapshot_freshness(snapshot))
 st.divider()
 
 # --- KPIs ---
-# Use TOTAL_UNITS constant (1300) for calculations like Dashboard
-nvm_norm = units_df['nvm'].fillna('').astype(str).str.lower()
-vacant_units = nvm_norm.isin(['vacant', 'smi']).sum()
-occupied_units = TOTAL_UNITS - vacant_units
-occupancy_pct = (occupied_units / TOTAL_UNITS * 100) if TOTAL_UNITS else 0
-vacancy_pct = (vacant_units / TOTAL_UNITS * 100) if TOTAL_UNITS else 0
-total_units = TOTAL_UNITS  # Use constant for display
-avg_days_vacant = units_df['days_vacant'].mean() if 'days_vacant' in units_df.columns else 0
-active_turns = units_df['lifecycle_label'].isin(['In Turn']).sum() if 'lifecycle_label' in units_df.columns else 0
-units_ready = units_df['lifecycle_label'].isin(['Ready']).sum() if 'lifecycle_label' in units_df.columns else 0
-not_ready_units = units_df['lifecycle_label'].isin(['Not Ready']).sum() if 'lifecycle_label' in units_df.columns else 0
-
-kpi_metrics = {
-    'total_units': total_units,
-    'vacant_units': vacant_units,
-    'occupied_units': occupied_units,
-    'occupancy_pct': occupancy_pct,
-    'vacancy_pct': vacancy_pct,
-    'avg_days_vacant': avg_days_vacant,
-    'active_turns': active_turns,
-    'units_ready': units_ready,
-    'not_ready_units': not_ready_units
-}
+# Precomputed in the snapshot against the property's unit count (like Dashboard)
+kpi_metrics = dict(snapshot.kpis)
+vacant_units = kpi_metrics['vacant_units']
+total_units = kpi_metrics['total_units']  # From the property registry
+avg_days_vacant = kpi_metrics['avg_days_vacant']
 
 render_section_container_start("Key Performance Indicators", "📊")
 render_unit_kpi_cards(kpi_metrics)
+# Units whose NVM / lifecycle changed since the previous data version
+render_unit_changes(snapshot.transitions)
 render_section_container_end()
 
 st.divider()
@@ -108,12 +88,11 @@ st.divider()
 # --- Lifecycle Breakdown Section ---
 render_section_container_start("Lifecycle Status Breakdown", "🔄")
 
-# Calculate lifecycle counts
-lifecycle_counts = units_df['lifecycle_label'].value_counts()
-ready_count = lifecycle_counts.get('Ready', 0)
-in_turn_count = lifecycle_counts.get('In Turn', 0)
-not_ready_count = lifecycle_counts.get('Not Ready', 0)
-total_count = len(units_df)
+# Lifecycle counts (precomputed)
+ready_count = kpi_metrics['units_ready']
+in_turn_count = kpi_metrics['active_turns']
+not_ready_count = kpi_metrics['not_ready_units']
+total_count = kpi_metrics['units_in_data']
 
 # Calculate percentages
 ready_pct = (ready_count / total_count * 100) if total_count > 0 else 0
@@ -135,19 +114,9 @@ with col_c:
 render_section_container_end()
 st.divider()
 
-# Build card-style distribution by NVM status
-nvm_series = units_df.get('nvm', pd.Series(dtype=str)).fillna('').astype(str)
-lifecycle_series = units_df.get('lifecycle_label', pd.Series(dtype=str)).fillna('Not Ready').astype(str)
-
-# Normalize for grouping
-nvm_norm = nvm_series.str.lower().str.strip()
-
-# Preserve appearance order of NVM statuses and skip blanks
-seen = []
-for val in nvm_series:
-    key = str(val).lower().strip()
-    if key and key not in seen:
-        seen.append(key)
+# Card-style distribution by NVM status (precomputed, appearance order, blanks skipped)
+nvm_breakdown = kpi_metrics['nvm_breakdown']
+seen = [entry['key'] for entry in nvm_breakdown]
 
 if len(seen) > 0:
     render_section_container_start("NVM Status vs Lifecycle Distribution", "🧩")
@@ -161,15 +130,15 @@ if len(seen) > 0:
     # Render cards in rows of 3
     cards_per_row = 3
     for i in range(0, len(seen), cards_per_row):
-        batch = seen[i:i + cards_per_row]
+        batch = nvm_breakdown[i:i + cards_per_row]
         cols = st.columns(len(batch), gap="small")
-        for col, status_key in zip(cols, batch):
+        for col, entry in zip(cols, batch):
+            status_key = entry['key']
             with col:
-                mask = (nvm_norm == status_key)
-                total = int(mask.sum())
-                ready = int(((lifecycle_series == 'Ready') & mask).sum())
-                in_turn = int(((lifecycle_series == 'In Turn') & mask).sum())
-                not_ready = int(((lifecycle_series == 'Not Ready') & mask).sum())
+                total = entry['total']
+                ready = entry['ready']
+                in_turn = entry['in_turn']
+                not_ready = entry['not_ready']
 
                 st.markdown(
                     f"""
@@ -190,11 +159,23 @@ if len(seen) > 0:
 
 st.divider()
 
-# (build_enhanced_unit moved to ui/unit_viewmodels)
+# --- Unit row view models (built once per data version; renderers index into them) ---
+def _build_unit_viewmodels(snap):
+    task_index = snap.view("task_index", lambda s: build_task_index(s.tasks))
+    return build_unit_viewmodels(snap.units, build_task_summaries(task_index, snap.today))
+
+unit_viewmodels = snapshot.view("unit_viewmodels", _build_unit_viewmodels)
 
 # --- Render Helper: Phase > Building > Units ---
-def render_units_by_hierarchy(units_subset, tasks_df, title_prefix=""):
-    """Render units grouped by Phase > Building with nested expanders."""
+def render_units_by_hierarchy(units_subset, viewmodels, title_prefix="", key="units"):
+    """
+    Render units grouped by Phase > Building with nested expanders.
+
+    Expanders rerun on toggle and only render their contents while open;
+    unit rows inside a building are paginated (UNITS_PAGE_SIZE per page) and
+    read from the precomputed `viewmodels` table (ui.unit_viewmodels).
+    `key` must be unique per call so expander / pager state stays per tab.
+    """
     if len(units_subset) == 0:
         st.info("No units to display")
         return
@@ -224,8 +205,17 @@ def render_units_by_hierarchy(units_subset, tasks_df, title_prefix=""):
     for phase in sorted(units_subset['phase'].dropna().unique(), key=_numeric_sort_key):
         phase_units = units_subset[units_subset['phase'] == phase]
 
-        # Phase expander
-        with st.expander(f"🧱 Phase {_safe_numeric_label(phase)} — {len(phase_units)} units", expanded=False):
+        # Phase expander (contents built only while open)
+        phase_expander = st.expander(
+            f"🧱 Phase {_safe_numeric_label(phase)} — {len(phase_units)} units",
+            expanded=False,
+            key=f"{key}_phase_{phase}",
+            on_change="rerun",
+        )
+        if not phase_expander.open:
+            continue
+
+        with phase_expander:
             for building in sorted(phase_units['building'].dropna().unique(), key=_numeric_sort_key):
                 building_units = phase_units[phase_units['building'] == building]
                 
@@ -236,92 +226,115 @@ def render_units_by_hierarchy(units_subset, tasks_df, title_prefix=""):
                 move_in_count = (nvm_norm == 'move in').sum()
 
                 # Building expander inside phase
-                with st.expander(f"🏢 Building {_safe_numeric_label(building)} — {len(building_units)} units | 📢 Notice {notice_count} | 🟢 Vacant {vacant_count} | 🔴 Move-In {move_in_count}", expanded=False):
-                    # Each unit in its own row with a subtle hairline between rows
-                    for idx, (_, unit_row) in enumerate(building_units.iterrows()):
-                        render_unit_row(build_enhanced_unit(unit_row, tasks_df))
-                        if idx < len(building_units) - 1:  # No divider after last unit
-                            st.markdown('<div class="hairline"></div>', unsafe_allow_html=True)
+                building_key = f"{key}_phase_{phase}_building_{building}"
+                building_expander = st.expander(
+                    f"🏢 Building {_safe_numeric_label(building)} — {len(building_units)} units"
+                    f" | 📢 Notice {notice_count} | 🟢 Vacant {vacant_count}"
+                    f" | 🔴 Move-In {move_in_count}",
+                    expanded=False,
+                    key=building_key,
+                    on_change="rerun",
+                )
+                if not building_expander.open:
+                    continue
+
+                with building_expander:
+                    page = render_pager(len(building_units), key=f"{building_key}_page")
+                    page_units = building_units.iloc[page]
+                    # One element for the page, with a subtle hairline between rows
+                    render_unit_rows(unit_records(viewmodels, page_units))
 
 
 # --- Tab Renderers ---
 def render_active_units_tab(context):
-    units_df, tasks_df = context['units_df'], context['tasks_df']
+    units_df, viewmodels = context['units_df'], context['viewmodels']
     # Active = Not Ready or In Turn (anything not fully Ready)
-    active = units_df[units_df['lifecycle_label'].isin(['Not Ready', 'In Turn'])].copy()
+    active = units_df[units_df['lifecycle_label'].isin(['Not Ready', 'In Turn'])]
     active = active.sort_values('days_vacant', ascending=False, na_position='last')
-    render_units_by_hierarchy(active, tasks_df, "in active pipeline")
+    render_units_by_hierarchy(active, viewmodels, "in active pipeline", key="units_active")
+
+def _render_notice_units(units_df, viewmodels):
+    # Notice = nvm contains 'notice' (includes NOTICE and NOTICE + SMI)
+    nvm_norm = units_df['nvm'].fillna('').astype(str).str.lower()
+    notice = units_df[nvm_norm.str.contains('notice', na=False)]
+    notice = notice.sort_values('days_vacant', ascending=False, na_position='last')
+    render_units_by_hierarchy(notice, viewmodels, "on notice", key="units_notice")
+
+def _render_vacant_units(units_df, viewmodels):
+    # Vacant = nvm column contains 'vacant' or 'smi'
+    nvm_norm = units_df['nvm'].fillna('').astype(str).str.lower()
+    vacant = units_df[nvm_norm.isin(['vacant', 'smi'])]
+    vacant = vacant.sort_values('days_vacant', ascending=False, na_position='last')
+    render_units_by_hierarchy(vacant, viewmodels, "vacant", key="units_vacant")
+
+def _render_moving_units(units_df, viewmodels):
+    # Moving = 72-hour hold after move-in (from move-in day through day 3)
+    move_in_dates = pd.to_datetime(units_df['move_in'], errors='coerce')
+    now = datetime.now()
+    past_72h = now - timedelta(hours=72)
+    moving = units_df[(move_in_dates <= now) & (move_in_dates >= past_72h)]
+    
+    # Add time remaining in 72h window
+    if len(moving) > 0:
+        moving_with_time = []
+        for idx, row in moving.iterrows():
+            mi = pd.to_datetime(row['move_in'])
+            hours_since = (now - mi).total_seconds() / 3600
+            hours_remaining = 72 - hours_since
+            days_remaining = int(hours_remaining / 24)
+            hours_rem = int(hours_remaining % 24)
+            moving_with_time.append({
+                'unit': row.get('unit_number', 'N/A'),
+                'time_display': f"Day {3 - days_remaining} of 3 ({hours_rem}h remaining)"
+            })
+    
+    moving = moving.sort_values('move_in', ascending=False, na_position='last')
+    
+    st.caption(f"**{len(moving)} units** in 72-hour post-move-in hold")
+    st.info("💡 Units remain in 'Moving' status for 72 hours (3 days) after move-in date")
+    st.divider()
+    
+    if len(moving) > 0:
+        render_units_by_hierarchy(moving, viewmodels, "in 72h hold period", key="units_moving")
+    else:
+        st.info("No units currently in 72-hour move-in hold period")
+
+def _render_ready_units(units_df, viewmodels):
+    ready = units_df[units_df['lifecycle_label'] == 'Ready']
+    ready = ready.sort_values('days_vacant', ascending=False, na_position='last')
+    render_units_by_hierarchy(ready, viewmodels, "ready", key="units_ready")
+
+def _render_not_ready_units(units_df, viewmodels):
+    # Not Ready includes both 'Not Ready' and 'In Turn'
+    not_ready = units_df[units_df['lifecycle_label'].isin(['Not Ready', 'In Turn'])]
+    not_ready = not_ready.sort_values('days_vacant', ascending=False, na_position='last')
+    render_units_by_hierarchy(not_ready, viewmodels, "not ready", key="units_not_ready")
+
+def _render_lazy_sub_tabs(context, key, tabs):
+    """Nested tabs; only the selected one (kept in session state under key) renders."""
+    streamlit_tabs = st.tabs([label for label, _ in tabs], key=key, on_change="rerun")
+    for streamlit_tab, (_, render_fn) in zip(streamlit_tabs, tabs):
+        if streamlit_tab.open:
+            with streamlit_tab:
+                render_fn(context['units_df'], context['viewmodels'])
 
 def render_nvm_tab(context):
-    units_df, tasks_df = context['units_df'], context['tasks_df']
-    
-    nvm_tabs = st.tabs(["📢 Notice", "🟢 Vacant", "📦 Moving"])
-
-    with nvm_tabs[0]:
-        # Notice = nvm contains 'notice' (includes NOTICE and NOTICE + SMI)
-        nvm_norm = units_df['nvm'].fillna('').astype(str).str.lower()
-        notice = units_df[nvm_norm.str.contains('notice', na=False)].copy()
-        notice = notice.sort_values('days_vacant', ascending=False, na_position='last')
-        render_units_by_hierarchy(notice, tasks_df, "on notice")
-
-    with nvm_tabs[1]:
-        # Vacant = nvm column contains 'vacant' or 'smi'
-        nvm_norm = units_df['nvm'].fillna('').astype(str).str.lower()
-        vacant = units_df[nvm_norm.isin(['vacant', 'smi'])].copy()
-        vacant = vacant.sort_values('days_vacant', ascending=False, na_position='last')
-        render_units_by_hierarchy(vacant, tasks_df, "vacant")
-
-    with nvm_tabs[2]:
-        # Moving = 72-hour hold after move-in (from move-in day through day 3)
-        move_in_dates = pd.to_datetime(units_df['move_in'], errors='coerce')
-        now = datetime.now()
-        past_72h = now - timedelta(hours=72)
-        moving = units_df[(move_in_dates <= now) & (move_in_dates >= past_72h)].copy()
-        
-        # Add time remaining in 72h window
-        if len(moving) > 0:
-            moving_with_time = []
-            for idx, row in moving.iterrows():
-                mi = pd.to_datetime(row['move_in'])
-                hours_since = (now - mi).total_seconds() / 3600
-                hours_remaining = 72 - hours_since
-                days_remaining = int(hours_remaining / 24)
-                hours_rem = int(hours_remaining % 24)
-                moving_with_time.append({
-                    'unit': row.get('unit_number', 'N/A'),
-                    'time_display': f"Day {3 - days_remaining} of 3 ({hours_rem}h remaining)"
-                })
-        
-        moving = moving.sort_values('move_in', ascending=False, na_position='last')
-        
-        st.caption(f"**{len(moving)} units** in 72-hour post-move-in hold")
-        st.info("💡 Units remain in 'Moving' status for 72 hours (3 days) after move-in date")
-        st.divider()
-        
-        if len(moving) > 0:
-            render_units_by_hierarchy(moving, tasks_df, "in 72h hold period")
-        else:
-            st.info("No units currently in 72-hour move-in hold period")
+    _render_lazy_sub_tabs(context, "units_nvm_tabs", [
+        ("📢 Notice", _render_notice_units),
+        ("🟢 Vacant", _render_vacant_units),
+        ("📦 Moving", _render_moving_units),
+    ])
 
 def render_ready_vs_not_tab(context):
-    units_df, tasks_df = context['units_df'], context['tasks_df']
-    ready_tabs = st.tabs(["✅ Ready", "⚠️ Not Ready"])
-
-    with ready_tabs[0]:
-        ready = units_df[units_df['lifecycle_label'] == 'Ready'].copy()
-        ready = ready.sort_values('days_vacant', ascending=False, na_position='last')
-        render_units_by_hierarchy(ready, tasks_df, "ready")
-
-    with ready_tabs[1]:
-        # Not Ready includes both 'Not Ready' and 'In Turn'
-        not_ready = units_df[units_df['lifecycle_label'].isin(['Not Ready', 'In Turn'])].copy()
-        not_ready = not_ready.sort_values('days_vacant', ascending=False, na_position='last')
-        render_units_by_hierarchy(not_ready, tasks_df, "not ready")
+    _render_lazy_sub_tabs(context, "units_ready_tabs", [
+        ("✅ Ready", _render_ready_units),
+        ("⚠️ Not Ready", _render_not_ready_units),
+    ])
 
 def render_all_units_tab(context):
-    units_df, tasks_df = context['units_df'], context['tasks_df']
+    units_df, viewmodels = context['units_df'], context['viewmodels']
     all_units = units_df.sort_values('days_vacant', ascending=False, na_position='last')
-    render_units_by_hierarchy(all_units, tasks_df, "total")
+    render_units_by_hierarchy(all_units, viewmodels, "total", key="units_all")
 
 # --- Main Sections ---
 units_section = create_simple_section(
@@ -332,12 +345,13 @@ units_section = create_simple_section(
         ("Notice / Vacant / Moving", render_nvm_tab),
         ("Ready vs Not Ready", render_ready_vs_not_tab),
         ("All Units", render_all_units_tab)
-    ]
+    ],
+    lazy=True
 )
 
 context = {
     'units_df': units_df,
-    'tasks_df': tasks_df,
+    'viewmodels': unit_viewmodels,
     'today': today_ref
 }
 
@@ -350,9 +364,9 @@ render_section_container_start("Performance Summary", "📈")
 
 footer_col1, footer_col2, footer_col3, footer_col4 = st.columns(4)
 
-sla_compliant = units_df[units_df['days_vacant'] <= 8].shape[0] if 'days_vacant' in units_df.columns else 0
+sla_compliant = kpi_metrics['sla_compliant']
 sla_pct = (sla_compliant / vacant_units * 100) if vacant_units > 0 else 0
-units_at_risk = units_df[(units_df['days_vacant'] > 25) & (units_df['lifecycle_label'] != 'Ready')].shape[0] if 'days_vacant' in units_df.columns else 0
+units_at_risk = kpi_metrics['units_at_risk']
 health_status = "🟢 Healthy" if avg_days_vacant <= 10 else "🟡 Lagging" if avg_days_vacant <= 20 else "🔴 Critical"
 
 with footer_col1:
@@ -373,3 +387,6 @@ st.divider()
 st.caption("© 2025 Thousand Oaks | Units Lifecycle")
 
 log_event("INFO", "Units page loaded")
+
+# --- Debug: per-rerun stage timings (DMRB_PROFILE=1 or ?profile=1) ---
+render_profiler_panel(end_rerun(), snapshot)
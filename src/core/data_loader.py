@@ -7,18 +7,117 @@ Now supports both local files and Google Sheets via datasource.py
 """
 
 import pandas as pd
+import streamlit as st
 from pathlib import Path
 
 from core.logger import log_event
-from core.datasource import get_excel_file
+from core.datasource import content_hash, get_excel_payload
+from core.sheet_parser import parse_sheets, process_workers, workbook_sheet_names
+from core.sheet_reader import workbook_reader
+from core.snapshot_store import load_snapshot, save_snapshot
+from utils.constants import REQUIRED_SHEETS, WORKBOOK_CACHE_ENTRIES
+from utils.profiler import profiled
+
+
+@st.cache_data(max_entries=WORKBOOK_CACHE_ENTRIES, show_spinner=False)
+@profiled()
+def parse_workbook(
+    workbook_hash: str,
+    _excel_bytes: bytes,
+    snapshot_dir: str = None,
+) -> dict[str, pd.DataFrame]:
+    """
+    Parse the required sheets of one workbook version.
+
+    Cached by content hash, so the xlsx is opened once per data version and
+    the parsed frames are shared across pages, reruns and sessions. On a cache
+    miss the on-disk snapshot for the same hash is tried before openpyxl.
+    Large workbooks are parsed one sheet per worker process (core.sheet_parser).
+
+    Args:
+        workbook_hash: Content hash of the workbook bytes (cache key)
+        _excel_bytes: Raw xlsx bytes (excluded from hashing)
+        snapshot_dir: Where the property's snapshots are saved (default: SNAPSHOT_DIR)
+
+    Returns:
+        Dictionary with sheet names as keys and DataFrames as values
+        (sheets missing from the workbook are omitted).
+    """
+    sheets = load_snapshot(workbook_hash, REQUIRED_SHEETS, snapshot_dir)
+    if sheets is not None:
+        return sheets
+
+    available = workbook_sheet_names(_excel_bytes)
+    sheet_names = []
+    for sheet_name in REQUIRED_SHEETS:
+        if sheet_name not in available:
+            log_event("INFO", f"Workbook {workbook_hash[:12]} has no {sheet_name} sheet")
+            continue
+        sheet_names.append(sheet_name)
+
+    workers = process_workers(len(sheet_names), len(_excel_bytes))
+    sheets = parse_sheets(_excel_bytes, sheet_names)
+
+    mode = f"{workbook_reader()} reader, " + (f"{workers} processes" if workers else "in-process")
+    log_event("INFO", f"Parsed workbook {workbook_hash[:12]} ({len(_excel_bytes)} bytes, {mode})")
+    save_snapshot(workbook_hash, sheets, snapshot_dir)
+    return sheets
+
+
+def local_workbook_path(file_path: str = None) -> Path | None:
+    """Return the local workbook path if one was given and exists (development mode)."""
+    if file_path:
+        p = Path(file_path)
+        if p.exists():
+            return p
+    return None
+
+
+@profiled()
+def read_workbook_bytes(
+    file_path: str = None, url: str = None, cold_wait_s: float = None
+) -> tuple[bytes, str]:
+    """
+    Return (excel_bytes, content_hash), preferring an existing local file over the export URL.
+
+    cold_wait_s limits how long a first download is waited for (see
+    datasource.load_excel_payload); None waits until it completes.
+    """
+    # If a local path is provided and exists, prefer local file for development
+    local_path = local_workbook_path(file_path)
+    if local_path is not None:
+        excel_bytes = local_path.read_bytes()
+        return excel_bytes, content_hash(excel_bytes)
+    return get_excel_payload(url, cold_wait_s)
+
+
+def _get_sheet(sheets: dict[str, pd.DataFrame], sheet_name: str) -> pd.DataFrame:
+    if sheet_name not in sheets:
+        raise ValueError(f"Workbook is missing the {sheet_name} sheet")
+    return sheets[sheet_name]
+
+
+def load_workbook_sheets(file_path: str = None) -> dict[str, pd.DataFrame]:
+    """
+    Load the parsed Unit and Task sheets for the current workbook version.
+
+    Args:
+        file_path: Optional local workbook path (used when it exists)
+
+    Returns:
+        Dictionary with sheet names as keys and DataFrames as values.
+    """
+    excel_bytes, workbook_hash = read_workbook_bytes(file_path)
+    return parse_workbook(workbook_hash, excel_bytes)
 
 
+@profiled()
 def load_units_sheet(file_path: str = None) -> pd.DataFrame:
     """
     Load the Unit sheet from Excel (local or Google Sheets).
     
     Args:
-        file_path: Legacy parameter, ignored (kept for backward compatibility)
+        file_path: Optional local workbook path (used when it exists)
 
     Returns:
         DataFrame with normalized column names (stripped whitespace).
@@ -27,17 +126,7 @@ def load_units_sheet(file_path: str = None) -> pd.DataFrame:
         ValueError: If Unit sheet is missing.
     """
     try:
-        # If a local path is provided and exists, prefer local file for development
-        if file_path:
-            p = Path(file_path)
-            if p.exists():
-                xls = pd.ExcelFile(p)
-            else:
-                xls = get_excel_file()
-        else:
-            xls = get_excel_file()
-        df = pd.read_excel(xls, sheet_name="Unit")
-        df.columns = df.columns.str.strip()
+        df = _get_sheet(load_workbook_sheets(file_path), "Unit")
 
         log_event("INFO", f"Loaded {len(df)} units from data source")
         return df
@@ -52,7 +141,7 @@ def load_task_sheet(file_path: str = None) -> pd.DataFrame:
     Load the Task sheet from Excel (local or Google Sheets).
     
     Args:
-        file_path: Legacy parameter, ignored (kept for backward compatibility)
+        file_path: Optional local workbook path (used when it exists)
 
     Returns:
         DataFrame with normalized column names.
@@ -61,16 +150,7 @@ def load_task_sheet(file_path: str = None) -> pd.DataFrame:
         ValueError: If Task sheet is missing.
     """
     try:
-        if file_path:
-            p = Path(file_path)
-            if p.exists():
-                xls = pd.ExcelFile(p)
-            else:
-                xls = get_excel_file()
-        else:
-            xls = get_excel_file()
-        df = pd.read_excel(xls, sheet_name="Task")
-        df.columns = df.columns.str.strip()
+        df = _get_sheet(load_workbook_sheets(file_path), "Task")
 
         log_event("INFO", f"Loaded {len(df)} tasks from data source")
         return df
@@ -85,15 +165,13 @@ def load_all_sheets(file_path: str = None) -> dict[str, pd.DataFrame]:
     Load all required sheets from Excel (local or Google Sheets).
     
     Args:
-        file_path: Legacy parameter, ignored (kept for backward compatibility)
+        file_path: Optional local workbook path (used when it exists)
 
     Returns:
         Dictionary with sheet names as keys and DataFrames as values.
     """
     try:
-        sheets = {}
-        sheets["Unit"] = load_units_sheet()
-        sheets["Task"] = load_task_sheet()
+        sheets = load_workbook_sheets(file_path)
 
         log_event("INFO", f"Successfully loaded all {len(sheets)} required sheets")
         return sheets
@@ -7,17 +7,21 @@ normalizes readiness / vacancy logic.
 ---------------------------------------------------------
 """
 
-import pandas as pd
 from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
 from core.logger import log_event
 from utils.constants import (
+    NVM_STATUS_BLANK,
     NVM_STATUS_MOVE_IN,
+    NVM_STATUS_NOTICE,
+    NVM_STATUS_NOTICE_SMI,
     NVM_STATUS_SMI,
     NVM_STATUS_VACANT,
-    NVM_STATUS_NOTICE_SMI,
-    NVM_STATUS_NOTICE,
-    NVM_STATUS_BLANK
 )
+from utils.profiler import profiled
 
 
 # =======================================================
@@ -171,22 +175,155 @@ def compute_nvm_status(row: pd.Series, today: object | None = None) -> str:
     return NVM_STATUS_BLANK
 
 
+# =======================================================
+# 🧩  VECTORIZED ENGINE (COLUMN-LEVEL)
+# =======================================================
+# Column-at-a-time equivalents of the per-unit functions above.
+# They must stay in lock-step with the row-wise rules; the parity
+# test in tests/test_unit_fields_parity.py compares both engines.
+BLOCKED_KEYWORDS = ["hold", "blocked", "issue"]
+IN_TURN_STATUSES = ["in turn", "currently work", "started", "in progress"]
+
+
+def _column(df: pd.DataFrame, col: str, default: object = None) -> pd.Series:
+    """Return df[col], or a Series filled with default when the column is missing."""
+    if col in df.columns:
+        return df[col]
+    return pd.Series([default] * len(df), index=df.index, dtype=object)
+
+
+def _datetime_column(df: pd.DataFrame, col: str) -> pd.Series:
+    """Column coerced to datetime64 (NaT when missing or unparseable)."""
+    if col in df.columns:
+        return pd.to_datetime(df[col], errors="coerce")
+    return pd.Series(pd.NaT, index=df.index, dtype="datetime64[ns]")
+
+
+def _lower_str(series: pd.Series) -> pd.Series:
+    """Vectorized str(value).lower(); missing values never match a token."""
+    return series.astype(str).str.lower()
+
+
+def _days_between_series(
+    later: pd.Series | pd.Timestamp, earlier: pd.Series | pd.Timestamp
+) -> pd.Series:
+    """
+    Vectorized _safe_days_between.
+    Mirrors the dtype DataFrame.apply infers from the row-wise results:
+    int64 when complete, float64 with NaN when partial, object None when empty.
+    """
+    days = (later - earlier).dt.days
+    if days.isna().all():
+        return pd.Series([None] * len(days), index=days.index, dtype=object)
+    return days
+
+
+def _turn_level_days(series: pd.Series) -> pd.Series:
+    """
+    Numeric days_vacant as seen by compute_turn_level (`value or 0`):
+    None becomes 0, while NaN stays NaN and fails every threshold.
+    """
+    days = pd.to_numeric(series, errors="coerce")
+    if series.dtype == object:
+        is_none = np.fromiter((v is None for v in series), dtype=bool, count=len(series))
+        days = days.mask(is_none, 0)
+    return days
+
+
+def vectorized_turn_level(df: pd.DataFrame) -> pd.Series:
+    """Column-level compute_turn_level."""
+    days_vacant = _turn_level_days(_column(df, "days_vacant"))
+    lifecycle = _lower_str(_column(df, "status", ""))
+    nvm = _lower_str(_column(df, "nvm", ""))
+
+    ready_vacant = (lifecycle == "ready") & (nvm == "vacant")
+    conditions = [
+        ready_vacant & (days_vacant <= 8),
+        ready_vacant & (days_vacant <= 15),
+        ready_vacant & (days_vacant <= 25),
+        ready_vacant,
+        days_vacant <= 8,
+        days_vacant <= 15,
+        days_vacant <= 25,
+        days_vacant <= 30,
+    ]
+    choices = [
+        "Fresh Ready", "Idle Ready", "Aging Ready", "Stale Ready",
+        "On Track", "Lagging", "Delayed", "Critical",
+    ]
+    labels = np.select(conditions, choices, default="Exception")
+    return pd.Series(labels, index=df.index, dtype=object)
+
+
+def vectorized_unit_blocked(df: pd.DataFrame) -> pd.Series:
+    """Column-level compute_unit_blocked."""
+    comments = _lower_str(_column(df, "comments", ""))
+    return comments.str.contains("|".join(BLOCKED_KEYWORDS), regex=True, na=False).astype(bool)
+
+
+def vectorized_lifecycle_label(df: pd.DataFrame) -> pd.Series:
+    """Column-level compute_lifecycle_label."""
+    status = _lower_str(_column(df, "status", "")).str.strip()
+    conditions = [status == "ready", status.isin(IN_TURN_STATUSES)]
+    levels = np.select(conditions, ["Ready", "In Turn"], default="Not Ready")
+    return pd.Series(levels, index=df.index, dtype=object)
+
+
+def vectorized_nvm_status(df: pd.DataFrame, today: object | None = None) -> pd.Series:
+    """Column-level compute_nvm_status (same priority order)."""
+    today = _norm_today(today)
+    move_out = _datetime_column(df, "move_out")
+    move_in = _datetime_column(df, "move_in")
+
+    mo_past = move_out <= today
+    mo_future = move_out > today
+    mi_missing = move_in.isna()
+    mi_future = move_in > today
+
+    conditions = [
+        move_in <= today,
+        mo_past & mi_future,
+        mo_past & mi_missing,
+        mo_future & mi_future,
+        mo_future & mi_missing,
+    ]
+    choices = [
+        NVM_STATUS_MOVE_IN,
+        NVM_STATUS_SMI,
+        NVM_STATUS_VACANT,
+        NVM_STATUS_NOTICE_SMI,
+        NVM_STATUS_NOTICE,
+    ]
+    statuses = np.select(conditions, choices, default=NVM_STATUS_BLANK)
+    return pd.Series(statuses, index=df.index, dtype=object)
+
+
 # =======================================================
 # 🧩  AGGREGATION WRAPPER
 # =======================================================
-def compute_all_unit_fields(df_units: pd.DataFrame, today: object | None = None) -> pd.DataFrame:
+@profiled()
+def compute_all_unit_fields(
+    df_units: pd.DataFrame,
+    today: object | None = None,
+    engine: str = "vectorized",
+) -> pd.DataFrame:
     """
     Apply all per-unit computations and return
     enriched DataFrame ready for metrics.
     Inputs: DataFrame with at least move_in/move_out/status columns (if present).
     Outputs: Adds days_vacant, days_to_be_ready, turn_level, unit_blocked, lifecycle_label, nvm.
+    engine: "vectorized" (default, column-level) or "rowwise" (reference per-row functions).
     Used by: Pages (Dashboard, Units) and any aggregator in core.phase_logic.
     """
+    if engine not in ("vectorized", "rowwise"):
+        raise ValueError(f"Unknown engine: {engine!r}")
+
     if df_units.empty:
         log_event("WARNING", "Units DataFrame is empty in compute_all_unit_fields.")
         return df_units
 
-    df = df_units.copy()
+    # Shallow: derived columns are assigned whole, never written in place
+    df = df_units.copy(deep=False)
 
     # Ensure datetimes
     for col in ["move_out", "move_in"]:
@@ -195,22 +332,37 @@ def compute_all_unit_fields(df_units: pd.DataFrame, today: object | None = None)
 
     # Derived columns
     t = _norm_today(today)
+    rowwise = engine == "rowwise"
 
     # Use Excel columns if available (DV, DTBR), otherwise calculate
     if "days_vacant" not in df.columns or df["days_vacant"].isna().all():
-        df["days_vacant"] = df.apply(lambda r: compute_days_vacant(r, today=t), axis=1)  # type: ignore
-    
+        if rowwise:
+            df["days_vacant"] = df.apply(lambda r: compute_days_vacant(r, today=t), axis=1)  # type: ignore
+        else:
+            df["days_vacant"] = _days_between_series(t, _datetime_column(df, "move_out"))
+
     if "days_to_be_ready" not in df.columns or df["days_to_be_ready"].isna().all():
-        df["days_to_be_ready"] = df.apply(lambda r: compute_days_to_be_ready(r, today=t), axis=1)  # type: ignore
+        if rowwise:
+            df["days_to_be_ready"] = df.apply(  # type: ignore
+                lambda r: compute_days_to_be_ready(r, today=t), axis=1
+            )
+        else:
+            df["days_to_be_ready"] = _days_between_series(_datetime_column(df, "move_in"), t)
     else:
         # Excel DTBR is inverted (negative values), flip the sign
         df["days_to_be_ready"] = df["days_to_be_ready"] * -1
-    
-    # Always compute these fields
-    df["turn_level"] = df.apply(compute_turn_level, axis=1)  # type: ignore
-    df["unit_blocked"] = df.apply(compute_unit_blocked, axis=1)  # type: ignore
-    df["lifecycle_label"] = df.apply(compute_lifecycle_label, axis=1)  # type: ignore
-    df["nvm"] = df.apply(lambda r: compute_nvm_status(r, today=t), axis=1)  # type: ignore - COMPUTED NVM STATUS
+
+    # Always compute these fields (turn_level reads the incoming nvm, so it goes first)
+    if rowwise:
+        df["turn_level"] = df.apply(compute_turn_level, axis=1)  # type: ignore
+        df["unit_blocked"] = df.apply(compute_unit_blocked, axis=1)  # type: ignore
+        df["lifecycle_label"] = df.apply(compute_lifecycle_label, axis=1)  # type: ignore
+        df["nvm"] = df.apply(lambda r: compute_nvm_status(r, today=t), axis=1)  # type: ignore - COMPUTED NVM STATUS
+    else:
+        df["turn_level"] = vectorized_turn_level(df)
+        df["unit_blocked"] = vectorized_unit_blocked(df)
+        df["lifecycle_label"] = vectorized_lifecycle_label(df)
+        df["nvm"] = vectorized_nvm_status(df, today=t)
 
     log_event("INFO", f"Computed derived fields for {len(df)} units (days_vacant/days_to_be_ready from Excel if available).")
     return df
@@ -2,14 +2,29 @@
 core/datasource.py
 ---------------------------------------------------------
 Google Sheets data source handler for DMRB Dashboard.
-Loads Excel from Google Sheets export URL only.
+Loads Excel from Google Sheets export URL only. A fetched
+workbook is served for REFRESH_INTERVAL_MIN before the next
+read revalidates it; core.scheduler refreshes it ahead of
+that so reads rarely wait on the network. Stale reads
+revalidate on a background thread and wait at most
+REVALIDATE_WAIT_S before serving the stale workbook, and a
+circuit breaker pauses downloads after repeated failures.
+Downloads go through the pooled core.transport session.
+State is kept per export URL (WorkbookSource), so each
+property of core.properties revalidates independently.
 ---------------------------------------------------------
 """
 
+import hashlib
+import os
+import threading
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta
 from io import BytesIO
-from datetime import datetime
-import streamlit as st
+from typing import Dict, Optional
+
 import pandas as pd
+import streamlit as st
 
 try:
     import requests
@@ -17,75 +32,501 @@ except ImportError:
     requests = None
 
 from core.logger import log_event
+from core.transport import FetchMetrics, HTTPTransport, get_transport
+from utils.constants import (
+    BREAKER_COOLDOWN_S,
+    BREAKER_FAILURES,
+    FETCH_CONNECT_TIMEOUT_S,
+    FETCH_READ_TIMEOUT_S,
+    REFRESH_INTERVAL_MIN,
+    REVALIDATE_WAIT_S,
+)
+
+PAYLOAD_TTL_S = REFRESH_INTERVAL_MIN * 60  # Serve a fetched workbook this long before revalidating
 
 
 def get_gdrive_url() -> str:
     """
-    Get Google Sheets export URL from Streamlit secrets.
+    Get Google Sheets export URL from the environment or Streamlit secrets.
     
     Returns:
         Google Sheets export URL
     """
+    # Environment override (benchmarks, local stand-ins)
+    if os.environ.get('GDRIVE_XLSX_URL'):
+        return os.environ['GDRIVE_XLSX_URL']
+    
     # Try Streamlit secrets
-    if hasattr(st, 'secrets') and 'GDRIVE_XLSX_URL' in st.secrets:
-        return st.secrets["GDRIVE_XLSX_URL"]
+    try:
+        if hasattr(st, 'secrets') and 'GDRIVE_XLSX_URL' in st.secrets:
+            return st.secrets["GDRIVE_XLSX_URL"]
+    except Exception:
+        pass  # No secrets file
     
     # Fallback to hardcoded URL
     return "https://docs.google.com/spreadsheets/d/1alxeq1eGB6nbDXWhKh5O34FQkFcXkYOI/export?format=xlsx"
 
 
-@st.cache_data(ttl=300)  # Cache for 5 minutes
-def load_excel_bytes() -> tuple[bytes, datetime]:
+@dataclass(frozen=True)
+class ExcelPayload:
     """
-    Load Excel file bytes from Google Sheets.
+    A downloaded workbook version plus the validators used to revalidate it.
+    
+    Args:
+        content: Raw xlsx bytes
+        sha256: Content hash of the bytes (workbook version id)
+        fetched_at: When the payload was last fetched or revalidated
+        etag: ETag response header, if the server sent one
+        last_modified: Last-Modified response header, if the server sent one
+        changed: False when revalidation found the previous version unchanged
+        metrics: Size and timings of the download that fetched or revalidated it
+    """
+    content: bytes
+    sha256: str
+    fetched_at: datetime
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    changed: bool = True
+    metrics: Optional[FetchMetrics] = None
+
+
+class SourceUnavailable(RuntimeError):
+    """No workbook can be served: the download failed or the circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """
+    Stops calls to a failing dependency for a cooldown.
+    
+    Opens after `threshold` consecutive failures. While open, allow() is False
+    until cooldown_s has passed; then a single trial call is let through. A
+    success closes the breaker, a failed trial opens it again.
+    
+    Args:
+        threshold: Consecutive failures that open the breaker
+        cooldown_s: Seconds the breaker stays open
+    """
+    
+    def __init__(self, threshold: int, cooldown_s: float):
+        self.threshold = threshold
+        self.cooldown_s = cooldown_s
+        self.failures = 0
+        self.open_until: Optional[datetime] = None
+        self.last_error: Optional[str] = None
+        self._trial = False
+        self._lock = threading.Lock()
+    
+    @property
+    def is_open(self) -> bool:
+        open_until = self.open_until
+        return open_until is not None and datetime.now() < open_until
+    
+    def allow(self) -> bool:
+        """True if a call may go ahead now (closed, or the one trial after the cooldown)."""
+        with self._lock:
+            if self.open_until is None:
+                return True
+            if datetime.now() < self.open_until or self._trial:
+                return False
+            self._trial = True
+            return True
+    
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.open_until = None
+            self.last_error = None
+            self._trial = False
+    
+    def record_failure(self, error: Exception) -> bool:
+        """Count a failure; returns True if this opened the breaker."""
+        with self._lock:
+            self.failures += 1
+            self.last_error = str(error)
+            self._trial = False
+            if self.failures < self.threshold:
+                return False
+            opened = self.open_until is None
+            self.open_until = datetime.now() + timedelta(seconds=self.cooldown_s)
+            return opened
+
+
+@dataclass(frozen=True)
+class SourceStatus:
+    """
+    What the data source is currently serving.
+    
+    Args:
+        version: Content hash of the last fetched workbook (None before the first fetch)
+        fetched_at: When it was fetched or last revalidated
+        fresh: Whether it is within PAYLOAD_TTL_S
+        revalidating: Whether a background revalidation is running
+        breaker_open_until: When downloads resume (None while the breaker is closed)
+        last_error: Most recent download error (None after a success)
+        last_fetch: Size and timings of this source's most recent download
+    """
+    version: Optional[str]
+    fetched_at: Optional[datetime]
+    fresh: bool
+    revalidating: bool
+    breaker_open_until: Optional[datetime]
+    last_error: Optional[str]
+    last_fetch: Optional[FetchMetrics] = None
+
+
+def content_hash(excel_bytes: bytes) -> str:
+    """
+    Get the content hash identifying a workbook version.
     
     Returns:
-        Tuple of (excel_bytes, timestamp)
+        SHA-256 hex digest of the workbook bytes
+    """
+    return hashlib.sha256(excel_bytes).hexdigest()
+
+
+def fetch_excel_payload(
+    url: str,
+    previous: Optional[ExcelPayload] = None,
+    timeout: float | tuple[float, float] = (FETCH_CONNECT_TIMEOUT_S, FETCH_READ_TIMEOUT_S),
+    transport: Optional[HTTPTransport] = None,
+) -> ExcelPayload:
+    """
+    Fetch the workbook, revalidating against a previously fetched version.
+    
+    Sends If-None-Match / If-Modified-Since when the previous response carried
+    validators. A 304, or a 200 whose body hashes to the previous SHA-256,
+    returns the previous content with changed=False.
+    
+    Args:
+        url: Export URL to download
+        previous: Previously fetched payload, if any
+        timeout: Request timeout in seconds, or (connect, read) timeouts
+        transport: HTTP transport (default: the pooled process-wide one)
+    
+    Returns:
+        ExcelPayload for the current workbook version
     
     Raises:
         ImportError: If requests library not installed
-        requests.HTTPError: If Google Sheets download fails
+        requests.HTTPError: If the download fails
     """
     if not requests:
         raise ImportError("requests library required. Install with: pip install requests")
     
-    url = get_gdrive_url()
-    timestamp = datetime.now()
+    headers = {}
+    if previous is not None:
+        if previous.etag:
+            headers["If-None-Match"] = previous.etag
+        if previous.last_modified:
+            headers["If-Modified-Since"] = previous.last_modified
     
-    log_event("INFO", f"Loading data from Google Sheets")
+    download = (transport or get_transport()).get(url, headers=headers, timeout=timeout)
+    fetched_at = download.metrics.fetched_at
     
-    try:
-        response = requests.get(url, timeout=30)
-        response.raise_for_status()
-        excel_bytes = response.content
+    if download.status == 304 and previous is not None:
+        log_event("INFO", f"Workbook not modified (304), reusing version {previous.sha256[:12]}")
+        return replace(previous, fetched_at=fetched_at, changed=False, metrics=download.metrics)
+    
+    excel_bytes = download.content
+    etag = download.headers.get("ETag")
+    last_modified = download.headers.get("Last-Modified")
+    sha256 = download.sha256
+    
+    if previous is not None and sha256 == previous.sha256:
+        log_event("INFO", f"Workbook content unchanged, reusing version {sha256[:12]}")
+        return replace(
+            previous, fetched_at=fetched_at, etag=etag, last_modified=last_modified, changed=False,
+            metrics=download.metrics,
+        )
+    
+    log_event(
+        "INFO", f"Loaded {download.metrics.summary()} from Google Sheets (version {sha256[:12]})"
+    )
+    return ExcelPayload(
+        content=excel_bytes,
+        sha256=sha256,
+        fetched_at=fetched_at,
+        etag=etag,
+        last_modified=last_modified,
+        metrics=download.metrics,
+    )
+
+
+class WorkbookSource:
+    """
+    Payload cache, circuit breaker and background revalidation of one export URL.
+    
+    The last payload is shared by all sessions for revalidation. Readers check
+    fresh_until without locking; fetches are serialized per source, so
+    different properties download in parallel.
+    
+    Args:
+        url: Export URL of the workbook
+    """
+    
+    def __init__(self, url: str):
+        self.url = url
+        self.last_payload: Optional[ExcelPayload] = None
+        self.fresh_until: Optional[datetime] = None
+        self.last_fetch: Optional[FetchMetrics] = None
+        self.breaker = CircuitBreaker(BREAKER_FAILURES, BREAKER_COOLDOWN_S)
+        self.revalidation: Optional[threading.Thread] = None  # At most one in flight
+        self._fetch_lock = threading.Lock()
+        self._revalidation_lock = threading.Lock()
+    
+    def fresh_payload(self) -> Optional[ExcelPayload]:
+        """The last fetched workbook if fetched less than PAYLOAD_TTL_S ago, else None."""
+        payload, fresh_until = self.last_payload, self.fresh_until
+        if payload is not None and fresh_until is not None and datetime.now() < fresh_until:
+            return payload
+        return None
+    
+    def refresh_payload(self, only_if_stale: bool = False) -> ExcelPayload:
+        """See the module-level refresh_payload()."""
+        with self._fetch_lock:
+            if only_if_stale:
+                payload = self.fresh_payload()
+                if payload is not None:
+                    return payload
+            
+            breaker = self.breaker
+            if not breaker.allow():
+                raise SourceUnavailable(
+                    f"Google Sheets downloads paused until {breaker.open_until:%H:%M:%S} "
+                    f"after {breaker.failures} failures ({breaker.last_error})"
+                )
+            
+            log_event("INFO", f"Loading data from Google Sheets")
+            try:
+                payload = fetch_excel_payload(self.url, previous=self.last_payload)
+            except Exception as e:
+                error_msg = f"Failed to download from Google Sheets: {e}"
+                log_event("ERROR", error_msg)
+                if breaker.record_failure(e):
+                    log_event(
+                        "WARNING",
+                        f"Circuit breaker open for {breaker.cooldown_s}s "
+                        f"after {breaker.failures} failures",
+                    )
+                raise
+            breaker.record_success()
+            self.last_payload = payload
+            self.last_fetch = payload.metrics
+            self.fresh_until = payload.fetched_at + timedelta(seconds=PAYLOAD_TTL_S)
+        
+        return payload
+    
+    def _revalidate(self) -> None:
+        try:
+            self.refresh_payload(only_if_stale=True)
+        except Exception:
+            pass  # Logged by refresh_payload and counted by the breaker
+    
+    def revalidate_in_background(self) -> Optional[threading.Thread]:
+        """See the module-level revalidate_in_background()."""
+        with self._revalidation_lock:
+            if self.revalidation is not None and self.revalidation.is_alive():
+                return self.revalidation
+            if self.breaker.is_open:
+                return None
+            self.revalidation = threading.Thread(
+                target=self._revalidate, name="revalidate", daemon=True
+            )
+            self.revalidation.start()
+            return self.revalidation
+    
+    def load_excel_payload(
+        self, wait_s: float = REVALIDATE_WAIT_S, cold_wait_s: Optional[float] = None
+    ) -> ExcelPayload:
+        """See the module-level load_excel_payload()."""
+        payload = self.fresh_payload()
+        if payload is not None:
+            return payload
+        
+        pending = self.revalidate_in_background()
+        if pending is not None:
+            pending.join(wait_s if self.last_payload is not None else cold_wait_s)
         
-        log_event("INFO", f"Loaded {len(excel_bytes)} bytes from Google Sheets")
-        return excel_bytes, timestamp
+        payload = self.fresh_payload() or self.last_payload
+        if payload is None:
+            if pending is not None and pending.is_alive():
+                raise SourceUnavailable(f"Google Sheets did not answer within {cold_wait_s}s")
+            raise SourceUnavailable(
+                f"Failed to download from Google Sheets: {self.breaker.last_error}"
+            )
+        return payload
     
-    except requests.RequestException as e:
-        error_msg = f"Failed to download from Google Sheets: {e}"
-        log_event("ERROR", error_msg)
-        raise
+    def status(self) -> SourceStatus:
+        payload = self.last_payload
+        revalidation = self.revalidation
+        breaker = self.breaker
+        return SourceStatus(
+            version=payload.sha256 if payload is not None else None,
+            fetched_at=payload.fetched_at if payload is not None else None,
+            fresh=self.fresh_payload() is not None,
+            revalidating=revalidation is not None and revalidation.is_alive(),
+            breaker_open_until=breaker.open_until if breaker.is_open else None,
+            last_error=breaker.last_error,
+            last_fetch=self.last_fetch,
+        )
+    
+    def mark_stale(self) -> None:
+        self.fresh_until = None
 
 
-def get_excel_file() -> pd.ExcelFile:
+# One source per export URL, created on first use
+_sources: Dict[str, WorkbookSource] = {}
+_sources_lock = threading.Lock()
+
+
+def get_source(url: Optional[str] = None) -> WorkbookSource:
     """
-    Get pandas ExcelFile object from Google Sheets.
+    Get the shared state of one workbook source.
+    
+    Args:
+        url: Export URL (default: get_gdrive_url())
     
     Returns:
-        pd.ExcelFile object ready for sheet reading
+        The process-wide WorkbookSource for that URL
+    """
+    url = url or get_gdrive_url()
+    with _sources_lock:
+        source = _sources.get(url)
+        if source is None:
+            source = _sources[url] = WorkbookSource(url)
+        return source
+
+
+def fresh_payload(url: Optional[str] = None) -> Optional[ExcelPayload]:
+    """
+    Get the last fetched workbook while it is still fresh.
+    
+    Args:
+        url: Export URL (default: get_gdrive_url())
+    
+    Returns:
+        ExcelPayload fetched less than PAYLOAD_TTL_S ago, or None
+    """
+    return get_source(url).fresh_payload()
+
+
+def refresh_payload(only_if_stale: bool = False, url: Optional[str] = None) -> ExcelPayload:
+    """
+    Revalidate the workbook against Google Sheets now and serve it for PAYLOAD_TTL_S.
+    
+    Args:
+        only_if_stale: Return the fresh payload instead if another caller
+                       refreshed it while this one waited for the lock
+        url: Export URL (default: get_gdrive_url())
+    
+    Returns:
+        ExcelPayload (changed=False when the sheet has not been modified)
+    
+    Raises:
+        SourceUnavailable: If the circuit breaker is open
+        ImportError: If requests library not installed
+        requests.RequestException: If Google Sheets download fails
+    """
+    return get_source(url).refresh_payload(only_if_stale)
+
+
+def revalidate_in_background(url: Optional[str] = None) -> Optional[threading.Thread]:
+    """
+    Start a background revalidation unless one is already running.
+    
+    Args:
+        url: Export URL (default: get_gdrive_url())
+    
+    Returns:
+        The running revalidation thread, or None while the circuit breaker is open.
+    """
+    return get_source(url).revalidate_in_background()
+
+
+def load_excel_payload(
+    wait_s: float = REVALIDATE_WAIT_S,
+    url: Optional[str] = None,
+    cold_wait_s: Optional[float] = None,
+) -> ExcelPayload:
     """
-    excel_bytes, timestamp = load_excel_bytes()
+    Load the current workbook, stale-while-revalidate.
+    
+    A fresh workbook is returned immediately. Otherwise it is revalidated on a
+    background thread; if that does not finish within wait_s the stale workbook
+    is returned while the download carries on. A cold start (nothing fetched
+    yet) waits up to cold_wait_s for the download; callers with a fallback of
+    their own (e.g. a saved snapshot) pass a limit so a slow sheet cannot
+    block them.
+    
+    Args:
+        wait_s: Seconds to wait for a revalidation before serving stale data
+        url: Export URL (default: get_gdrive_url())
+        cold_wait_s: Seconds a cold start waits for the download (None: until it completes)
+    
+    Returns:
+        ExcelPayload (possibly stale; see source_status())
+    
+    Raises:
+        SourceUnavailable: If nothing has been fetched yet and the download
+                           failed or did not finish within cold_wait_s
+    """
+    return get_source(url).load_excel_payload(wait_s, cold_wait_s)
+
+
+def source_status(url: Optional[str] = None) -> SourceStatus:
+    """Current workbook version, its freshness and the download health of one source."""
+    return get_source(url).status()
+
+
+def load_excel_bytes() -> tuple[bytes, datetime]:
+    """
+    Load Excel file bytes from Google Sheets.
+    
+    Returns:
+        Tuple of (excel_bytes, timestamp)
+    """
+    payload = load_excel_payload()
+    return payload.content, payload.fetched_at
+
+
+def get_excel_payload(
+    url: Optional[str] = None, cold_wait_s: Optional[float] = None
+) -> tuple[bytes, str]:
+    """
+    Get the current workbook bytes together with their content hash.
+    
+    Args:
+        url: Export URL (default: get_gdrive_url())
+        cold_wait_s: Limit on a cold-start download wait (see load_excel_payload())
+    
+    Returns:
+        Tuple of (excel_bytes, content_hash)
+    """
+    payload = load_excel_payload(url=url, cold_wait_s=cold_wait_s)
     
     # Store timestamp in session state for display
-    st.session_state.last_data_update = timestamp
+    st.session_state.last_data_update = payload.fetched_at
     
+    return payload.content, payload.sha256
+
+
+def get_excel_file() -> pd.ExcelFile:
+    """
+    Get pandas ExcelFile object from Google Sheets.
+    
+    Returns:
+        pd.ExcelFile object ready for sheet reading
+    """
+    excel_bytes, _ = get_excel_payload()
     return pd.ExcelFile(BytesIO(excel_bytes))
 
 
 def clear_data_cache():
-    """Clear the cached Excel data to force reload."""
-    load_excel_bytes.clear()
+    """Mark every fetched workbook stale so the next read revalidates it."""
+    with _sources_lock:
+        sources = list(_sources.values())
+    for source in sources:
+        source.mark_stale()
     log_event("INFO", "Data cache cleared")
 
 
@@ -99,14 +540,17 @@ def get_last_updated() -> datetime:
     return st.session_state.get('last_data_update', datetime.now())
 
 
-def get_data_source_info() -> str:
+def get_data_source_info(url: Optional[str] = None) -> str:
     """
     Get human-readable info about current data source.
     
+    Args:
+        url: Export URL (default: get_gdrive_url())
+    
     Returns:
         String describing the data source
     """
-    url = get_gdrive_url()
+    url = url or get_gdrive_url()
     
     # Extract sheet ID if possible
     if 'spreadsheets/d/' in url:
@@ -1,4 +1,4 @@
 """Backward compatibility - logger moved to utils."""
-from utils.logger import log_event
+from utils.logger import flush_logs, log_event
 
-__all__ = ["log_event"]
+__all__ = ["log_event", "flush_logs"]
@@ -9,13 +9,40 @@ on canonical calculators from core.data_logic and helpers.
 
 from __future__ import annotations
 
+from collections import defaultdict
 from datetime import datetime, date
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List, Tuple
+import numpy as np
 import pandas as pd
 
-from utils.helpers import normalize_nvm_series, is_vacant, fmt_date, days_between
+from utils.helpers import fmt_dates, normalize_nvm_series
+from utils.profiler import profiled
 
 
+def _datetime_column(df: pd.DataFrame, col: str) -> pd.Series:
+    """Column coerced to datetime (NaT when missing or unparseable)."""
+    if col in df.columns:
+        if pd.api.types.is_datetime64_any_dtype(df[col]):
+            return df[col]  # Already parsed (snapshot frames); to_datetime would re-scan it
+        return pd.to_datetime(df[col], errors='coerce')
+    return pd.Series(pd.NaT, index=df.index, dtype='datetime64[ns]')
+
+
+def _days_or_dash(days: pd.Series) -> List[Any]:
+    """Whole-day counts as Python ints, '—' where unknown."""
+    known = days.notna().to_numpy()
+    values = days.fillna(0).astype('int64').tolist()
+    return [v if k else '—' for v, k in zip(values, known)]
+
+
+def _label_column(df: pd.DataFrame, col: str) -> pd.Series:
+    """Vectorized str(value).strip() for label columns ('' when missing)."""
+    if col in df.columns:
+        return df[col].map(str).astype(object).str.strip()  # object: map keeps int dtype when empty
+    return pd.Series('', index=df.index, dtype=object)
+
+
+@profiled()
 def build_phase_overview(units_df: pd.DataFrame, today: date | None = None) -> List[Dict[str, Any]]:
     """
     Construct Phase → Building overview with vacancy counts, move events,
@@ -24,87 +51,104 @@ def build_phase_overview(units_df: pd.DataFrame, today: date | None = None) -> L
     Expects columns: 'Phases','Building','Unit','Move-out','Move-in','lifecycle_label'.
     Note: 'nvm' is a computed column (lowercase) added by compute_all_unit_fields().
     Returns list of dicts: [{ 'phase_label', 'buildings': [...] }].
+    Built from one groupby(['Phases', 'Building']) pass; per-unit fields are
+    formatted column-wise and bucketed by group id.
     """
     if today is None:
         today = datetime.now().date()
+    now = datetime.now()
 
-    phase_data: List[Dict[str, Any]] = []
+    df = units_df[units_df['Phases'].notna() & units_df['Building'].notna()]
+    if df.empty:
+        return []
 
-    for phase in sorted(units_df['Phases'].dropna().unique(), key=str):
-        phase_units = units_df[units_df['Phases'] == phase].copy()
+    nvm_norm = (
+        normalize_nvm_series(df['nvm']) if 'nvm' in df.columns
+        else pd.Series('', index=df.index)
+    )
+    is_vacant = nvm_norm.isin(['vacant', 'smi'])
 
-        buildings: List[Dict[str, Any]] = []
-        for building in sorted(phase_units['Building'].dropna().unique(), key=str):
-            building_units = phase_units[phase_units['Building'] == building].copy()
-
-            nvm_norm = normalize_nvm_series(building_units['nvm']) if 'nvm' in building_units.columns else pd.Series(dtype=str)
-            
-            # Calculate NVM classification counts
-            notice_count = int(nvm_norm.str.contains('notice', na=False).sum())
-            vacant_count = int(nvm_norm.isin(['vacant', 'smi']).sum())
-            move_in_count = int((nvm_norm == 'move in').sum())
-            
-            total = len(building_units)
-            
-            # Keep old counts for backward compatibility (deprecated)
-            vacant = vacant_count
-            occupied = total - vacant_count
-            vacant_mask = nvm_norm.isin(['vacant', 'smi'])
-
-            vacant_units_list: List[Dict[str, Any]] = []
-            for _, row in building_units[vacant_mask].iterrows():
-                move_out_str = fmt_date(row.get('Move-out'))
-                move_in_str = fmt_date(row.get('Move-in'))
-
-                # Derive simple integers for days; keep '—' if unknown
-                dv = days_between(datetime.now(), row.get('Move-out'))
-                dr = days_between(row.get('Move-in'), datetime.now())
-                days_vacant = dv if dv is not None else '—'
-                days_to_be_ready = dr if dr is not None else '—'
-
-                vacant_units_list.append({
-                    'unit_num': str(row.get('Unit', '')).strip(),
-                    'status_emoji': '🟢',  # Green - vacant (available)
-                    'move_out_str': move_out_str,
-                    'days_vacant': days_vacant,
-                    'move_in_str': move_in_str,
-                    'days_to_be_ready': days_to_be_ready,
-                    'lifecycle_label': row.get('lifecycle_label', 'Not Ready'),
-                    'nvm': row.get('nvm', '—'),
-                })
-
-            move_events: List[str] = []
-
-            # Move-outs today
-            if 'Move-out' in building_units.columns:
-                move_out_dates = pd.to_datetime(building_units['Move-out'], errors='coerce')
-                same_day = building_units[move_out_dates.dt.date == today]
-                for _, r in same_day.iterrows():
-                    unit_label = str(r.get('Unit', '')).strip()
-                    move_date = fmt_date(r.get('Move-out'), '%Y-%m-%d')
-                    if unit_label and move_date != '—':
-                        move_events.append(f"🟥 Unit {unit_label} - Move Out {move_date}")
-
-            # Move-ins today
-            if 'Move-in' in building_units.columns:
-                move_in_dates = pd.to_datetime(building_units['Move-in'], errors='coerce')
-                same_day = building_units[move_in_dates.dt.date == today]
-                for _, r in same_day.iterrows():
-                    unit_label = str(r.get('Unit', '')).strip()
-                    move_date = fmt_date(r.get('Move-in'), '%Y-%m-%d')
-                    if unit_label and move_date != '—':
-                        move_events.append(f"🟩 Unit {unit_label} - Move In {move_date}")
+    # Calculate NVM classification counts per (phase, building) in one pass
+    flags = pd.DataFrame({
+        'total_units': np.ones(len(df), dtype='int64'),
+        'notice_count': nvm_norm.str.contains('notice', na=False),
+        'vacant_count': is_vacant,
+        'move_in_count': nvm_norm == 'move in',
+    }, index=df.index)
+    grouped = flags.groupby([df['Phases'], df['Building']], sort=False, observed=True)
+    counts = grouped.sum()
+    group_ids = grouped.ngroup().to_numpy()
+
+    move_out = _datetime_column(df, 'Move-out')
+    move_in = _datetime_column(df, 'Move-in')
+    unit_labels = _label_column(df, 'Unit')
+
+    # Vacant unit summaries, bucketed by group id (row order preserved)
+    vacant_units_by_group: Dict[int, List[Dict[str, Any]]] = defaultdict(list)
+    vac = is_vacant.to_numpy()
+    if vac.any():
+        vac_mo, vac_mi = move_out[vac], move_in[vac]
+        lifecycle = (
+            df['lifecycle_label'][vac] if 'lifecycle_label' in df.columns
+            else pd.Series('Not Ready', index=vac_mo.index)
+        )
+        nvm_vals = df['nvm'][vac] if 'nvm' in df.columns else pd.Series('—', index=vac_mo.index)
+        for gid, unit_num, mo_str, dv, mi_str, dr, label, nvm in zip(
+            group_ids[vac],
+            unit_labels[vac],
+            fmt_dates(vac_mo),
+            _days_or_dash((now - vac_mo).dt.days),
+            fmt_dates(vac_mi),
+            _days_or_dash((vac_mi - now).dt.days),
+            lifecycle,
+            nvm_vals,
+        ):
+            vacant_units_by_group[gid].append({
+                'unit_num': unit_num,
+                'status_emoji': '🟢',  # Green - vacant (available)
+                'move_out_str': mo_str,
+                'days_vacant': dv,
+                'move_in_str': mi_str,
+                'days_to_be_ready': dr,
+                'lifecycle_label': label,
+                'nvm': nvm,
+            })
 
+    # Today's move events: move-outs first, then move-ins (row order within each)
+    move_events_by_group: Dict[int, List[str]] = defaultdict(list)
+    today_ts = pd.Timestamp(today)
+    for dates, template in (
+        (move_out, "🟥 Unit {unit} - Move Out {date}"),
+        (move_in, "🟩 Unit {unit} - Move In {date}"),
+    ):
+        same_day = (dates.dt.normalize() == today_ts).to_numpy() & (unit_labels != '').to_numpy()
+        for gid, unit_label, move_date in zip(
+            group_ids[same_day], unit_labels[same_day], fmt_dates(dates[same_day], '%Y-%m-%d')
+        ):
+            move_events_by_group[gid].append(template.format(unit=unit_label, date=move_date))
+
+    # Assemble Phase → Building structure (both sorted by their string form)
+    buildings_by_phase: Dict[Any, List[Tuple[Any, int]]] = defaultdict(list)
+    for gid, (phase, building) in enumerate(counts.index):
+        buildings_by_phase[phase].append((building, gid))
+
+    phase_data: List[Dict[str, Any]] = []
+    for phase in sorted(buildings_by_phase, key=str):
+        buildings: List[Dict[str, Any]] = []
+        for building, gid in sorted(buildings_by_phase[phase], key=lambda item: str(item[0])):
+            row = counts.iloc[gid]
+            total = int(row['total_units'])
+            vacant_count = int(row['vacant_count'])
             buildings.append({
                 'label': f'B{building}',
                 'total_units': total,
-                'notice_count': notice_count,
+                'notice_count': int(row['notice_count']),
                 'vacant_count': vacant_count,
-                'move_in_count': move_in_count,
-                'vacant': vacant,  # Deprecated
-                'occupied': occupied,  # Deprecated
-                'move_events': move_events,
-                'vacant_units': vacant_units_list,
+                'move_in_count': int(row['move_in_count']),
+                'vacant': vacant_count,  # Deprecated
+                'occupied': total - vacant_count,  # Deprecated
+                'move_events': move_events_by_group.get(gid, []),
+                'vacant_units': vacant_units_by_group.get(gid, []),
             })
 
         # Safe phase label generation
@@ -118,42 +162,168 @@ def build_phase_overview(units_df: pd.DataFrame, today: date | None = None) -> L
     return phase_data
 
 
+# Columns of the flat unit list, in record key order
+ALL_UNITS_COLUMNS = [
+    'unit_num', 'status_emoji', 'move_out_str', 'days_vacant', 'days_vacant_sort',
+    'move_in_str', 'days_to_be_ready', 'nvm', 'lifecycle_label',
+]
+
+
+@profiled()
+def build_all_units_frame(units_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Columnar view model behind build_all_units: one row per listed unit,
+    sorted by days vacant (descending - oldest first, ties in row order).
+
+    Dates are formatted with dt.strftime and day counts taken from one
+    subtraction per column; units with neither 'Unit id' nor 'Unit' are dropped.
+    Columns are ALL_UNITS_COLUMNS.
+    """
+    now = datetime.now()
+
+    # Prefer the full Unit ID when available; fall back to Unit number
+    unit_ids = _label_column(units_df, 'Unit id')
+    unit_num = unit_ids.where(unit_ids != '', _label_column(units_df, 'Unit'))
+    df = units_df[(unit_num != '').to_numpy()]
+    unit_num = unit_num[df.index]
+
+    move_out = _datetime_column(df, 'Move-out')
+    move_in = _datetime_column(df, 'Move-in')
+    days_vacant = (now - move_out).dt.days
+    nvm_norm = (
+        normalize_nvm_series(df['nvm']) if 'nvm' in df.columns
+        else pd.Series('', index=df.index)
+    )
+    lifecycle = (
+        df['lifecycle_label'].astype(object) if 'lifecycle_label' in df.columns
+        else 'Not Ready'
+    )
+
+    frame = pd.DataFrame({
+        'unit_num': unit_num,
+        # Green = vacant, Red = occupied
+        'status_emoji': np.where(nvm_norm.isin(['vacant', 'smi']), '🟢', '🔴'),
+        'move_out_str': fmt_dates(move_out),
+        'days_vacant': _days_or_dash(days_vacant),
+        'days_vacant_sort': days_vacant.fillna(-1).astype('int64'),
+        'move_in_str': fmt_dates(move_in),
+        'days_to_be_ready': _days_or_dash((move_in - now).dt.days),
+        'nvm': df['nvm'].astype(object) if 'nvm' in df.columns else '—',
+        'lifecycle_label': lifecycle,
+    }, index=df.index, columns=ALL_UNITS_COLUMNS)
+
+    frame = frame.sort_values('days_vacant_sort', ascending=False, kind='stable')
+    return frame.reset_index(drop=True)
+
+
+def iter_unit_records(frame: pd.DataFrame) -> Iterator[Dict[str, Any]]:
+    """
+    Lazily yield the rows of a view-model frame as unit dicts (see render_unit_rows).
+    Columns are read as object arrays in one batch, so values are plain Python objects.
+    """
+    columns = list(frame.columns)
+    arrays = [frame[col].to_numpy(dtype=object) for col in columns]
+    for values in zip(*arrays):
+        yield dict(zip(columns, values))
+
+
 def build_all_units(units_df: pd.DataFrame) -> List[Dict[str, Any]]:
     """
     Build a flat list of units suitable for compact list views.
     Uses existing columns; attempts to avoid recomputation drift.
+    Materializes build_all_units_frame(); slice the frame and use
+    iter_unit_records() to build only the rows being shown.
     """
-    all_units: List[Dict[str, Any]] = []
-    now = datetime.now()
+    return list(iter_unit_records(build_all_units_frame(units_df)))
+
 
-    for _, row in units_df.iterrows():
-        # Prefer the full Unit ID when available; fall back to Unit number
-        unit_id_val = str(row.get('Unit id', '')).strip() if 'Unit id' in row else ''
-        unit_num_fallback = str(row.get('Unit', '')).strip()
-        unit_num = unit_id_val or unit_num_fallback
-        if not unit_num:
-            continue
-
-        move_out_str = fmt_date(row.get('Move-out'))
-        move_in_str = fmt_date(row.get('Move-in'))
-        dv = days_between(now, row.get('Move-out'))
-        dr = days_between(row.get('Move-in'), now)
-
-        nvm_val = row.get('nvm', '')
-        status_emoji = '🟢' if is_vacant(nvm_val) else '🔴'  # Green = vacant, Red = occupied
-
-        all_units.append({
-            'unit_num': unit_num,
-            'status_emoji': status_emoji,
-            'move_out_str': move_out_str,
-            'days_vacant': dv if dv is not None else '—',
-            'days_vacant_sort': dv if dv is not None else -1,
-            'move_in_str': move_in_str,
-            'days_to_be_ready': dr if dr is not None else '—',
-            'nvm': row.get('nvm', '—'),
-            'lifecycle_label': row.get('lifecycle_label', 'Not Ready'),
+def build_kpi_summary(units_df: pd.DataFrame, total_units: int) -> Dict[str, Any]:
+    """
+    Compute the page-level KPI aggregates for an enriched units frame.
+
+    Expects computed columns: 'nvm', 'lifecycle_label', 'days_vacant'.
+    total_units is the property's unit count (occupancy denominator).
+    Returns a dict of counts, percentages and the NVM × lifecycle breakdown
+    (in first-appearance order, blanks skipped) used by the Units page cards.
+    """
+    nvm_norm = (
+        normalize_nvm_series(units_df['nvm']) if 'nvm' in units_df.columns
+        else pd.Series(dtype=str)
+    )
+    lifecycle = (
+        units_df['lifecycle_label'].astype(object).fillna('Not Ready').astype(str)
+        if 'lifecycle_label' in units_df.columns else pd.Series(dtype=str)
+    )
+    has_days = 'days_vacant' in units_df.columns
+
+    vacant_units = int(nvm_norm.isin(['vacant', 'smi']).sum())
+    occupied_units = total_units - vacant_units
+    lifecycle_counts = lifecycle.value_counts()
+
+    nvm_breakdown: List[Dict[str, Any]] = []
+    for key in nvm_norm[nvm_norm != ''].unique():
+        mask = nvm_norm == key
+        nvm_breakdown.append({
+            'key': key,
+            'total': int(mask.sum()),
+            'ready': int(((lifecycle == 'Ready') & mask).sum()),
+            'in_turn': int(((lifecycle == 'In Turn') & mask).sum()),
+            'not_ready': int(((lifecycle == 'Not Ready') & mask).sum()),
         })
 
-    # Sort by days vacant (descending - oldest first)
-    all_units.sort(key=lambda x: x['days_vacant_sort'], reverse=True)
-    return all_units
+    days_vacant = (
+        pd.to_numeric(units_df['days_vacant'], errors='coerce') if has_days
+        else pd.Series(dtype=float)
+    )
+    avg_days_vacant = days_vacant.mean() if has_days else 0
+
+    return {
+        'total_units': total_units,
+        'units_in_data': len(units_df),
+        'vacant_units': vacant_units,
+        'occupied_units': occupied_units,
+        'occupancy_pct': (occupied_units / total_units * 100) if total_units else 0,
+        'vacancy_pct': (vacant_units / total_units * 100) if total_units else 0,
+        'avg_days_vacant': avg_days_vacant,
+        'active_turns': int(lifecycle_counts.get('In Turn', 0)),
+        'units_ready': int(lifecycle_counts.get('Ready', 0)),
+        'not_ready_units': int(lifecycle_counts.get('Not Ready', 0)),
+        'sla_compliant': int((days_vacant <= 8).sum()),
+        'units_at_risk': int(((days_vacant > 25) & (lifecycle != 'Ready')).sum()),
+        'nvm_breakdown': nvm_breakdown,
+    }
+
+
+def build_building_stats(
+    units_df: pd.DataFrame,
+    phase_col: str = 'Phases',
+    building_col: str = 'Building',
+) -> pd.DataFrame:
+    """
+    Per-building unit counts by NVM class and lifecycle label.
+
+    Returns a DataFrame indexed by (phase, building) with columns
+    total_units, notice_count, vacant_count, move_in_count, ready, in_turn, not_ready.
+    """
+    nvm_norm = (
+        normalize_nvm_series(units_df['nvm']) if 'nvm' in units_df.columns
+        else pd.Series('', index=units_df.index)
+    )
+    lifecycle = (
+        units_df['lifecycle_label'] if 'lifecycle_label' in units_df.columns
+        else pd.Series('', index=units_df.index)
+    )
+
+    flags = pd.DataFrame({
+        'total_units': np.ones(len(units_df), dtype='int64'),
+        'notice_count': nvm_norm.str.contains('notice', na=False),
+        'vacant_count': nvm_norm.isin(['vacant', 'smi']),
+        'move_in_count': nvm_norm == 'move in',
+        'ready': lifecycle == 'Ready',
+        'in_turn': lifecycle == 'In Turn',
+        'not_ready': lifecycle == 'Not Ready',
+    }, index=units_df.index)
+    groups = flags.groupby([units_df[phase_col], units_df[building_col]], observed=True)
+    stats = groups.sum().astype('int64')
+    stats.index = stats.index.set_names(['phase', 'building'])
+    return stats.sort_index(key=lambda idx: idx.map(str))
@@ -0,0 +1,134 @@
+"""
+core/properties.py
+---------------------------------------------------------
+Property registry for multi-community deployments.
+Maps each property to its workbook (Google Sheets export
+URL and/or local path) and its unit count. Configured under
+[properties.<key>] in Streamlit secrets or as JSON in the
+DMRB_PROPERTIES environment variable; without either, the
+single default property (GDRIVE_XLSX_URL, EXCEL_FILE_PATH,
+TOTAL_UNITS) is served as before.
+---------------------------------------------------------
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import dataclass
+from typing import Any, Mapping, Optional
+
+import streamlit as st
+
+from core.logger import log_event
+from utils.constants import EXCEL_FILE_PATH, TOTAL_UNITS
+
+# Environment override for the registry (JSON object keyed like the secrets table)
+PROPERTIES_ENV = "DMRB_PROPERTIES"
+
+# Key of the property used when no registry is configured
+DEFAULT_PROPERTY_KEY = "default"
+
+
+@dataclass(frozen=True)
+class Property:
+    """
+    One community and its workbook.
+
+    Args:
+        key: Stable identifier (registry key, session state, cache keys)
+        name: Display name
+        total_units: Units in the property (occupancy denominator)
+        url: Google Sheets export URL (None: local workbook only; the default
+             property downloads datasource.get_gdrive_url())
+        path: Local workbook, preferred when the file exists (development mode)
+    """
+    key: str
+    name: str
+    total_units: int
+    url: Optional[str] = None
+    path: Optional[str] = None
+
+
+def default_property() -> Property:
+    """The single property served when no registry is configured."""
+    return Property(
+        key=DEFAULT_PROPERTY_KEY,
+        name="Thousand Oaks",
+        total_units=TOTAL_UNITS,
+        path=EXCEL_FILE_PATH,
+    )
+
+
+def parse_properties(config: Mapping[str, Mapping[str, Any]]) -> list[Property]:
+    """
+    Build properties from a {key: {name, url, path, total_units}} mapping.
+
+    Raises:
+        ValueError: If an entry has neither url nor path, or no total_units
+    """
+    properties = []
+    for key, entry in config.items():
+        url, path = entry.get("url"), entry.get("path")
+        if not url and not path:
+            raise ValueError(f"Property {key} needs a url or a path")
+        if "total_units" not in entry:
+            raise ValueError(f"Property {key} needs total_units")
+        properties.append(Property(
+            key=str(key),
+            name=str(entry.get("name", key)),
+            total_units=int(entry["total_units"]),
+            url=url or None,
+            path=path or None,
+        ))
+    return properties
+
+
+def _registry_config() -> Optional[Mapping[str, Mapping[str, Any]]]:
+    # Environment override (benchmarks, local stand-ins)
+    if os.environ.get(PROPERTIES_ENV):
+        return json.loads(os.environ[PROPERTIES_ENV])
+    try:
+        if "properties" in st.secrets:
+            return {key: dict(entry) for key, entry in st.secrets["properties"].items()}
+    except Exception:
+        pass  # No secrets file
+    return None
+
+
+def load_properties() -> list[Property]:
+    """
+    Get the configured properties, in registry order.
+
+    Returns:
+        The registry entries, or [default_property()] when none are configured
+        (or the configuration is invalid, which is logged).
+    """
+    try:
+        config = _registry_config()
+        properties = parse_properties(config) if config else []
+    except (ValueError, TypeError) as e:
+        log_event("ERROR", f"Invalid property registry, using the default property: {e}")
+        properties = []
+    return properties or [default_property()]
+
+
+def get_property(key: Optional[str] = None) -> Property:
+    """
+    Look up a property by key.
+
+    Args:
+        key: Registry key (None or unknown: the first property)
+    """
+    properties = load_properties()
+    for prop in properties:
+        if prop.key == key:
+            return prop
+    return properties[0]
+
+
+def portfolio_total_units(properties: Optional[list[Property]] = None) -> int:
+    """Units across all properties."""
+    if properties is None:
+        properties = load_properties()
+    return sum(prop.total_units for prop in properties)
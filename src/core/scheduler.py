@@ -0,0 +1,146 @@
+"""
+core/scheduler.py
+---------------------------------------------------------
+Background prefetch scheduler.
+Runs a refresh callable on a daemon thread shortly before
+the served data goes stale, so page reruns find it warm.
+Failed refreshes are retried with exponential backoff and
+the last successful result is kept as a fallback.
+---------------------------------------------------------
+"""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable, Optional
+
+from core.logger import log_event
+
+
+@dataclass(frozen=True)
+class RefreshStatus:
+    """
+    Point-in-time view of a scheduler.
+
+    Args:
+        running: Whether the background thread is alive
+        last_success: When the last refresh succeeded
+        last_error: Message of the most recent failure (None after a success)
+        failures: Consecutive failed refreshes
+        next_run: When the next refresh is due
+    """
+    running: bool
+    last_success: Optional[datetime]
+    last_error: Optional[str]
+    failures: int
+    next_run: Optional[datetime]
+
+
+class PrefetchScheduler:
+    """
+    Calls refresh() every interval_s on a daemon thread.
+
+    After a failure the next attempt waits retry_s, doubling per consecutive
+    failure up to max_backoff_s; a success resets the schedule. The result of
+    the last successful call stays available as last_good.
+
+    Args:
+        refresh: Callable fetching and deriving the data; its result is kept
+        interval_s: Seconds between successful refreshes
+        retry_s: First retry delay after a failure
+        max_backoff_s: Cap on the retry delay
+        name: Thread name and log prefix
+    """
+
+    def __init__(
+        self,
+        refresh: Callable[[], Any],
+        interval_s: float,
+        retry_s: float,
+        max_backoff_s: float,
+        name: str = "prefetch",
+    ):
+        self.refresh = refresh
+        self.interval_s = interval_s
+        self.retry_s = retry_s
+        self.max_backoff_s = max_backoff_s
+        self.name = name
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._last_good: Any = None
+        self._last_success: Optional[datetime] = None
+        self._last_error: Optional[str] = None
+        self._failures = 0
+        self._next_run: Optional[datetime] = None
+
+    def next_delay(self) -> float:
+        """Seconds until the next refresh: the interval, or the backoff after failures."""
+        with self._lock:
+            failures = self._failures
+        if failures == 0:
+            return self.interval_s
+        return min(self.retry_s * 2 ** (failures - 1), self.max_backoff_s)
+
+    def run_once(self) -> bool:
+        """Run one refresh now; returns True on success."""
+        try:
+            result = self.refresh()
+        except Exception as e:
+            with self._lock:
+                self._failures += 1
+                self._last_error = str(e)
+                failures = self._failures
+            log_event("WARNING", f"[{self.name}] Refresh failed ({failures} in a row): {e}")
+            return False
+
+        with self._lock:
+            self._last_good = result
+            self._last_success = datetime.now()
+            self._last_error = None
+            self._failures = 0
+        return True
+
+    def _loop(self) -> None:
+        while True:
+            delay = self.next_delay()
+            with self._lock:
+                self._next_run = datetime.now() + timedelta(seconds=delay)
+            if self._stop.wait(delay):
+                return
+            self.run_once()
+
+    def start(self) -> None:
+        """Start the background thread (no-op if it is already running)."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name=self.name, daemon=True)
+            self._thread.start()
+        log_event("INFO", f"[{self.name}] Started (every {self.interval_s:.0f}s)")
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop the background thread and wait for it to exit."""
+        self._stop.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    @property
+    def last_good(self) -> Any:
+        """Result of the last successful refresh (None before the first one)."""
+        with self._lock:
+            return self._last_good
+
+    def status(self) -> RefreshStatus:
+        with self._lock:
+            return RefreshStatus(
+                running=self._thread is not None and self._thread.is_alive(),
+                last_success=self._last_success,
+                last_error=self._last_error,
+                failures=self._failures,
+                next_run=self._next_run,
+            )
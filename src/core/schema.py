@@ -0,0 +1,123 @@
+"""
+core/schema.py
+---------------------------------------------------------
+Compact dtypes for the enriched units frame.
+The snapshot frame is built once and shared by every page
+and session, so it is stored lean: labels as category,
+dates as datetime64[ns], day counts as nullable small ints.
+memory_report() breaks frames down by column for the
+debug panel and the benchmark logs.
+---------------------------------------------------------
+"""
+
+from __future__ import annotations
+
+from typing import Mapping
+
+import numpy as np
+import pandas as pd
+
+# Low-cardinality labels (canonical column names)
+UNIT_CATEGORY_COLUMNS = ('phase', 'building', 'status', 'nvm', 'lifecycle_label', 'turn_level')
+UNIT_DATE_COLUMNS = ('move_out', 'move_in')
+UNIT_DAY_COLUMNS = ('days_vacant', 'days_to_be_ready')
+
+# Smallest nullable integer dtype that holds a day count, in order of preference
+_DAY_DTYPES = ('Int16', 'Int32', 'Int64')
+
+
+def _as_category(series: pd.Series) -> pd.Series:
+    """Cast to category unless it already is (or is too unique to benefit)."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series
+    if series.nunique(dropna=True) > len(series) // 2:
+        return series
+    return series.astype('category')
+
+
+def _as_datetime(series: pd.Series) -> pd.Series:
+    return pd.to_datetime(series, errors='coerce').astype('datetime64[ns]')
+
+
+def _as_day_count(series: pd.Series) -> pd.Series:
+    """
+    Whole-day counts as the smallest nullable int that fits.
+    Left unchanged when values are fractional or not numeric. Wider
+    nullable ints (e.g. Int64 after a delta patch) are narrowed too.
+    """
+    if str(series.dtype) == _DAY_DTYPES[0]:
+        return series
+    days = pd.to_numeric(series, errors='coerce')
+    if days.isna().sum() > series.isna().sum():
+        return series  # non-numeric text would be lost
+    values = days.dropna().to_numpy(dtype='float64')
+    if not np.array_equal(values, np.round(values)):
+        return series
+    low, high = (values.min(), values.max()) if len(values) else (0, 0)
+    for dtype in _DAY_DTYPES:
+        info = np.iinfo(dtype.lower())
+        if info.min <= low and high <= info.max:
+            return days.astype(dtype)
+    return series
+
+
+def apply_unit_schema(units_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Return the enriched units frame with compact dtypes.
+
+    Columns that are missing are skipped; values are unchanged (missing day
+    counts become <NA>, unparseable dates NaT). The input is not modified.
+
+    Args:
+        units_df: Enriched units with canonical column names
+
+    Returns:
+        New DataFrame sharing unconverted columns with the input.
+    """
+    casts = {}
+    for col in UNIT_CATEGORY_COLUMNS:
+        if col in units_df.columns:
+            casts[col] = _as_category(units_df[col])
+    for col in UNIT_DATE_COLUMNS:
+        if col in units_df.columns:
+            casts[col] = _as_datetime(units_df[col])
+    for col in UNIT_DAY_COLUMNS:
+        if col in units_df.columns:
+            casts[col] = _as_day_count(units_df[col])
+    return units_df.assign(**casts)
+
+
+def frame_bytes(df: pd.DataFrame) -> int:
+    """Deep memory footprint of a frame (index included)."""
+    return int(df.memory_usage(deep=True).sum())
+
+
+def memory_report(frames: Mapping[str, pd.DataFrame]) -> pd.DataFrame:
+    """
+    Per-column memory of named frames, largest first.
+
+    Args:
+        frames: {name: DataFrame}, e.g. {'units': ..., 'tasks': ...}
+
+    Returns:
+        DataFrame with columns frame, column, dtype, kb.
+    """
+    rows = []
+    for name, df in frames.items():
+        usage = df.memory_usage(deep=True)
+        for col, nbytes in usage.items():
+            rows.append({
+                'frame': name,
+                'column': str(col),
+                'dtype': str(df.dtypes[col]) if col in df.columns else 'index',
+                'kb': round(nbytes / 1024, 1),
+            })
+    report = pd.DataFrame(rows, columns=['frame', 'column', 'dtype', 'kb'])
+    return report.sort_values('kb', ascending=False, kind='stable').reset_index(drop=True)
+
+
+def format_bytes(nbytes: int | float) -> str:
+    """Human-readable size (KB / MB)."""
+    if nbytes >= 1024 ** 2:
+        return f"{nbytes / 1024 ** 2:.1f} MB"
+    return f"{nbytes / 1024:.1f} KB"
@@ -0,0 +1,230 @@
+"""
+core/sheet_parser.py
+---------------------------------------------------------
+Parallel xlsx sheet parsing for large workbooks.
+openpyxl parsing holds the GIL, so each sheet of a big
+workbook is parsed in its own worker process and sent back
+as an Arrow IPC stream (pickle for columns Arrow cannot
+hold). Small workbooks, single-sheet reads, single-core
+hosts and platforms without fork stay in-process, where a
+pool would only add start-up and transfer cost. Sheets are
+read with pd.read_excel or, in the "streaming" reader mode,
+with core.sheet_reader.
+---------------------------------------------------------
+"""
+
+from __future__ import annotations
+
+import gc
+import multiprocessing
+import os
+import pickle
+import threading
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from typing import Optional
+from xml.etree import ElementTree
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+from core.logger import log_event
+from core.sheet_reader import STREAMING_READER, read_projected_sheets, workbook_reader
+from utils.constants import PARSE_MAX_WORKERS, PARSE_PROCESS_MIN_BYTES, PARSE_WORKER_TIMEOUT_S
+
+# Set DMRB_PARSE_PROCESSES=0 to always parse in-process
+PARSE_PROCESSES_ENV = "DMRB_PARSE_PROCESSES"
+
+# Encodings of a frame sent back by a worker
+ARROW_FRAME = "arrow"
+PICKLED_FRAME = "pickle"
+
+
+def workbook_sheet_names(excel_bytes: bytes) -> list[str]:
+    """Sheet names of an xlsx, read from xl/workbook.xml without loading the workbook."""
+    with zipfile.ZipFile(BytesIO(excel_bytes)) as archive:
+        root = ElementTree.fromstring(archive.read("xl/workbook.xml"))
+    return [el.get("name") for el in root.iter() if el.tag.endswith("}sheet") or el.tag == "sheet"]
+
+
+def read_sheet(
+    source: pd.ExcelFile | bytes, sheet_name: str, reader: Optional[str] = None
+) -> pd.DataFrame:
+    """Parse one sheet with stripped column names (reader: default workbook_reader())."""
+    if (reader or workbook_reader()) == STREAMING_READER and isinstance(source, (bytes, bytearray)):
+        return read_projected_sheets(source, [sheet_name])[sheet_name]
+    if isinstance(source, (bytes, bytearray)):
+        source = BytesIO(source)
+    df = pd.read_excel(source, sheet_name=sheet_name)
+    df.columns = df.columns.str.strip()
+    return df
+
+
+def encode_frame(df: pd.DataFrame) -> tuple[str, bytes]:
+    """Serialize a frame as an Arrow IPC stream, falling back to pickle for mixed-type columns."""
+    if pa is not None:
+        try:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+        except (pa.ArrowInvalid, pa.ArrowTypeError, ValueError, TypeError):
+            pass
+        else:
+            sink = pa.BufferOutputStream()
+            with pa.ipc.new_stream(sink, table.schema) as writer:
+                writer.write_table(table)
+            return ARROW_FRAME, sink.getvalue().to_pybytes()
+    return PICKLED_FRAME, pickle.dumps(df, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def decode_frame(kind: str, payload: bytes) -> pd.DataFrame:
+    if kind == ARROW_FRAME:
+        return pa.ipc.open_stream(payload).read_pandas()
+    return pickle.loads(payload)
+
+
+def _parse_in_worker(excel_bytes: bytes, sheet_name: str, reader: str) -> tuple[str, bytes]:
+    """Worker entry point: parse one sheet and return it encoded."""
+    return encode_frame(read_sheet(excel_bytes, sheet_name, reader))
+
+
+def _fork_context() -> Optional[multiprocessing.context.BaseContext]:
+    # Streamlit runs each page as sys.modules['__main__'], and spawn / forkserver
+    # children re-import __main__ - they would re-run the page. Forked workers
+    # inherit the loaded modules instead and only ever run _parse_in_worker.
+    #
+    # Fork-after-threads hazard: the Streamlit server is multi-threaded, and a
+    # fork copies only the calling thread. Locks other threads held at that
+    # moment (logging handlers, the scheduler, HTTP pools) stay locked in the
+    # child for good, so workers must not log or touch app state - they only
+    # parse bytes with pandas / openpyxl and return the encoded frame. Python
+    # 3.12+ warns about this fork (DeprecationWarning). A worker that dies
+    # breaks the pool, and one that deadlocks trips PARSE_WORKER_TIMEOUT_S;
+    # either way the pool is discarded and the parse falls back in-process.
+    if "fork" not in multiprocessing.get_all_start_methods():
+        return None
+    return multiprocessing.get_context("fork")
+
+
+def process_workers(n_sheets: int, n_bytes: int, min_bytes: int = PARSE_PROCESS_MIN_BYTES) -> int:
+    """
+    Number of worker processes to parse a workbook with (0: parse in-process).
+
+    Args:
+        n_sheets: Sheets to parse
+        n_bytes: Workbook size
+        min_bytes: Smaller workbooks are parsed in-process
+    """
+    disabled = os.environ.get(PARSE_PROCESSES_ENV, "1") == "0"
+    if disabled or n_bytes < min_bytes or _fork_context() is None:
+        return 0
+    workers = min(n_sheets, PARSE_MAX_WORKERS, os.cpu_count() or 1)
+    return workers if workers > 1 else 0
+
+
+# Worker pool shared by all parses in the process, created on first use
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers < workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+            # Long-lived workers inherit the whole server heap. Objects frozen at
+            # fork time are skipped by the children's GC, so their pages stay
+            # shared copy-on-write; the parent unfreezes once the workers exist.
+            gc.collect()
+            gc.freeze()
+            try:
+                _pool = ProcessPoolExecutor(max_workers=workers, mp_context=_fork_context())
+                _pool.submit(int)  # A fork pool starts all its workers on the first submit
+            finally:
+                gc.unfreeze()
+            _pool_workers = workers
+        return _pool
+
+
+def shutdown_pool() -> None:
+    """Stop the worker processes (a new pool is started on the next large parse)."""
+    global _pool, _pool_workers
+    with _pool_lock:
+        pool, _pool, _pool_workers = _pool, None, 0
+    if pool is not None:
+        pool.shutdown()
+
+
+def _discard_pool(pool: ProcessPoolExecutor, kill: bool = False) -> None:
+    """
+    Drop a failed pool, unless another thread has already replaced it.
+
+    Args:
+        pool: The pool that failed
+        kill: Also kill its workers (a hung worker never exits on shutdown)
+    """
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is pool:
+            _pool, _pool_workers = None, 0
+    if kill:
+        # ProcessPoolExecutor has no public way to stop a worker before 3.14
+        processes = getattr(pool, "_processes", None) or {}
+        for process in list(processes.values()):
+            process.kill()
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def parse_sheets(
+    excel_bytes: bytes,
+    sheet_names: list[str],
+    min_bytes: int = PARSE_PROCESS_MIN_BYTES,
+    reader: Optional[str] = None,
+) -> dict[str, pd.DataFrame]:
+    """
+    Parse several sheets of a workbook, in worker processes when it is large.
+
+    Args:
+        excel_bytes: Raw xlsx bytes
+        sheet_names: Sheets to parse (all must exist in the workbook)
+        min_bytes: Workbooks smaller than this are parsed in-process
+        reader: PANDAS_READER or STREAMING_READER (default: workbook_reader())
+
+    Returns:
+        Dictionary with sheet names as keys and DataFrames as values,
+        in the order of sheet_names.
+    """
+    reader = reader or workbook_reader()
+    workers = process_workers(len(sheet_names), len(excel_bytes), min_bytes)
+    if workers:
+        pool = None
+        try:
+            pool = _get_pool(workers)
+            futures = {
+                name: pool.submit(_parse_in_worker, excel_bytes, name, reader)
+                for name in sheet_names
+            }
+            deadline = time.monotonic() + PARSE_WORKER_TIMEOUT_S
+            return {
+                name: decode_frame(*future.result(timeout=max(deadline - time.monotonic(), 0)))
+                for name, future in futures.items()
+            }
+        except (RuntimeError, OSError, TimeoutError) as e:
+            # BrokenProcessPool (a worker died), a worker stuck past the timeout,
+            # RuntimeError from submitting to a pool another thread just replaced
+            # (concurrent property loads), OSError when fork fails: parse in-process;
+            # the next large parse starts a new pool
+            log_event("WARNING", f"Sheet parse workers failed ({e!r}); parsing in-process")
+            if pool is not None:
+                _discard_pool(pool, kill=isinstance(e, TimeoutError))
+
+    if reader == STREAMING_READER:
+        return read_projected_sheets(excel_bytes, sheet_names)
+    xls = pd.ExcelFile(BytesIO(excel_bytes))
+    return {name: read_sheet(xls, name) for name in sheet_names}
@@ -0,0 +1,151 @@
+"""
+core/sheet_reader.py
+---------------------------------------------------------
+Streaming reader for the DMRB workbook.
+Rows are streamed from openpyxl in read-only, values-only
+mode and only the columns the app consumes are kept (see
+SHEET_COLUMNS); cells are converted as they stream the way
+pd.read_excel converts them, and the projected columns are
+typed by pandas' own parser, so the frames match
+load_units_sheet / load_task_sheet for those columns.
+Enable with DMRB_WORKBOOK_READER=streaming.
+---------------------------------------------------------
+"""
+
+from __future__ import annotations
+
+import os
+from io import BytesIO
+from typing import Any, Optional
+
+import numpy as np
+import pandas as pd
+
+# pandas' own parser behind pd.read_excel (internal, so not in its type stubs)
+from pandas.io.parsers import TextParser  # type: ignore[attr-defined]
+
+try:
+    import openpyxl
+except ImportError:
+    openpyxl = None
+
+from core.task_logic import TASK_DATE_COLUMNS
+from utils.constants import WORKBOOK_READER
+
+# Reader modes (constants.WORKBOOK_READER, DMRB_WORKBOOK_READER overrides it)
+PANDAS_READER = "pandas"
+STREAMING_READER = "streaming"
+WORKBOOK_READER_ENV = "DMRB_WORKBOOK_READER"
+
+# Unit sheet columns read by core.snapshot_service (its UNIT_COLUMN_MAP keys)
+UNIT_SHEET_COLUMNS = [
+    'Move-out', 'Move-in', 'Unit', 'Unit id', 'Phases', 'Building', 'Status', 'DV', 'DTBR',
+]
+
+# Task sheet columns read by core.task_logic
+TASK_SHEET_COLUMNS = [
+    'Unit ID', 'Vendor / Employee', 'Task Status', *TASK_DATE_COLUMNS.values(),
+]
+
+# Projection per sheet (sheets not listed keep every column)
+SHEET_COLUMNS = {'Unit': UNIT_SHEET_COLUMNS, 'Task': TASK_SHEET_COLUMNS}
+
+# Error values openpyxl returns as text in values-only mode (pd.read_excel gives NaN)
+_CELL_ERRORS = frozenset({'#NULL!', '#DIV/0!', '#VALUE!', '#REF!', '#NAME?', '#NUM!', '#N/A'})
+
+
+def workbook_reader() -> str:
+    """The configured reader mode (PANDAS_READER or STREAMING_READER)."""
+    return os.environ.get(WORKBOOK_READER_ENV, WORKBOOK_READER)
+
+
+def open_workbook(excel_bytes: bytes) -> "openpyxl.Workbook":
+    """Open an xlsx for streaming (read-only, cached values, no external links)."""
+    if openpyxl is None:
+        raise ImportError("openpyxl required. Install with: pip install openpyxl")
+    return openpyxl.load_workbook(
+        BytesIO(excel_bytes), read_only=True, data_only=True, keep_links=False
+    )
+
+
+def _convert(value: Any) -> Any:
+    """One cell as pd.read_excel's openpyxl reader converts it."""
+    if value is None:
+        return ""
+    if isinstance(value, float):
+        as_int = int(value) if np.isfinite(value) else None
+        return as_int if as_int == value else value
+    if isinstance(value, str) and value in _CELL_ERRORS:
+        return np.nan
+    return value
+
+
+def stream_sheet(
+    workbook: "openpyxl.Workbook",
+    sheet_name: str,
+    columns: Optional[list[str]] = None,
+) -> pd.DataFrame:
+    """
+    Stream one sheet into a DataFrame, keeping only the given columns.
+
+    The first row is the header (names are stripped, as in data_loader).
+    Requested columns missing from the sheet are left out; with duplicate
+    header names the first column wins.
+
+    Args:
+        workbook: Workbook from open_workbook()
+        sheet_name: Sheet to read
+        columns: Columns to keep, in sheet order (None: all)
+
+    Returns:
+        DataFrame typed like pd.read_excel for the kept columns
+    """
+    sheet = workbook[sheet_name]
+    sheet.reset_dimensions()  # Saved dimensions are often wrong; read what is there
+    rows = sheet.iter_rows(values_only=True)
+
+    header = [str(name).strip() if name is not None else "" for name in next(rows, ())]
+    if columns is None:
+        positions = list(range(len(header)))
+    else:
+        wanted = set(columns)
+        positions, seen = [], set()
+        for i, name in enumerate(header):
+            if name in wanted and name not in seen:
+                positions.append(i)
+                seen.add(name)
+
+    width = len(header)
+    data: list[list[Any]] = [[header[i] for i in positions]]
+    last_row_with_data = 0
+    for row in rows:
+        # A row counts as data if any cell (projected or not) has a value
+        if any(value is not None for value in row):
+            last_row_with_data = len(data)
+        if len(row) < width:
+            row = row + (None,) * (width - len(row))
+        data.append([_convert(row[i]) for i in positions])
+    del data[last_row_with_data + 1:]  # Trailing empty rows, as pd.read_excel drops them
+
+    if not positions:
+        return pd.DataFrame(index=pd.RangeIndex(len(data) - 1))
+    frame: pd.DataFrame = TextParser(data, header=0, skip_blank_lines=False).read()
+    return frame
+
+
+def read_projected_sheets(excel_bytes: bytes, sheet_names: list[str]) -> dict[str, pd.DataFrame]:
+    """
+    Stream several sheets with their SHEET_COLUMNS projections.
+
+    Args:
+        excel_bytes: Raw xlsx bytes
+        sheet_names: Sheets to read (all must exist in the workbook)
+
+    Returns:
+        Dictionary with sheet names as keys and DataFrames as values.
+    """
+    workbook = open_workbook(excel_bytes)
+    try:
+        return {name: stream_sheet(workbook, name, SHEET_COLUMNS.get(name)) for name in sheet_names}
+    finally:
+        workbook.close()
@@ -0,0 +1,576 @@
+"""
+core/snapshot_service.py
+---------------------------------------------------------
+Enriched data snapshot shared by all pages.
+Loads the workbook, normalizes Unit column names and runs
+compute_all_unit_fields once per data version (workbook hash
++ day), then serves the result to every page and session.
+New versions are diffed against the previous snapshot so only
+changed units are recomputed (see core.unit_delta). The
+units frame is stored with compact dtypes (core.schema).
+For the remote workbook a background scheduler rebuilds the
+snapshot before the data goes stale (core.scheduler). If a
+load fails or the sheet is slow, the last good snapshot (in
+memory, or on disk after a cold start) is served instead;
+snapshot_freshness() tells pages when to show it as stale.
+Each property of the registry (core.properties) has its own
+snapshots, prefetcher and saved workbooks; load_portfolio()
+loads them concurrently and combines their units.
+---------------------------------------------------------
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Mapping, Optional
+
+import pandas as pd
+import streamlit as st
+
+try:
+    from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+except ImportError:
+    add_script_run_ctx = get_script_run_ctx = None
+
+from core.data_loader import local_workbook_path, parse_workbook, read_workbook_bytes
+from core.data_logic import compute_all_unit_fields
+from core.datasource import PAYLOAD_TTL_S, refresh_payload, revalidate_in_background, source_status
+from core.logger import log_event
+from core.phase_logic import build_building_stats, build_kpi_summary
+from core.properties import DEFAULT_PROPERTY_KEY, Property, default_property, load_properties
+from core.scheduler import PrefetchScheduler
+from core.schema import apply_unit_schema, format_bytes, frame_bytes, memory_report
+from core.snapshot_store import read_manifest
+from core.unit_delta import (
+    DeltaBase,
+    UnitDelta,
+    apply_unit_delta,
+    make_delta_base,
+    patch_building_stats,
+)
+from utils.constants import (
+    PREFETCH_LEAD_S,
+    PREFETCH_MAX_BACKOFF_MIN,
+    PREFETCH_RETRY_S,
+    PROPERTY_LOAD_WORKERS,
+    REVALIDATE_WAIT_S,
+    SNAPSHOT_DIR,
+    TOTAL_UNITS,
+    WORKBOOK_CACHE_ENTRIES,
+)
+from utils.profiler import profiled
+
+# Excel Unit sheet → canonical (Units page) column names
+UNIT_COLUMN_MAP = {
+    'Move-out': 'move_out',
+    'Move-in': 'move_in',
+    'Unit': 'unit_number',
+    'Unit id': 'unit_id',  # Full path like P-5 / Bld-1 / U-210
+    'Phases': 'phase',
+    'Building': 'building',
+    'Status': 'status',
+    'DV': 'days_vacant',        # Pull from Excel (not calculated)
+    'DTBR': 'days_to_be_ready'  # Pull from Excel (not calculated)
+}
+
+# Canonical → Dashboard column names (status / days / computed fields stay lowercase)
+DASHBOARD_COLUMN_MAP = {
+    'move_out': 'Move-out',
+    'move_in': 'Move-in',
+    'unit_number': 'Unit',
+    'unit_id': 'Unit id',
+    'phase': 'Phases',
+    'building': 'Building',
+}
+
+# Source key of the default property's Google Sheets workbook (local workbooks
+# use their path; other properties' sheets are "remote:<key>", see remote_source())
+REMOTE_SOURCE = "remote"
+
+
+def remote_source(property_key: Optional[str] = None) -> str:
+    """Source key of a property's Google Sheets workbook (REMOTE_SOURCE for the default)."""
+    if property_key is None or property_key == DEFAULT_PROPERTY_KEY:
+        return REMOTE_SOURCE
+    return f"{REMOTE_SOURCE}:{property_key}"
+
+
+def is_remote_source(source: str) -> bool:
+    return source == REMOTE_SOURCE or source.startswith(f"{REMOTE_SOURCE}:")
+
+
+def property_snapshot_dir(prop: Property) -> Optional[str]:
+    """Where a property's parsed workbooks are saved (None: SNAPSHOT_DIR, for the default)."""
+    return None if prop.key == DEFAULT_PROPERTY_KEY else str(Path(SNAPSHOT_DIR) / prop.key)
+
+
+@dataclass(frozen=True)
+class EnrichedSnapshot:
+    """
+    Immutable, enriched view of one workbook version.
+
+    Args:
+        version: Workbook content hash
+        today: Reference date used for derived fields
+        built_at: When the snapshot was computed
+        units_frame: Enriched units (canonical column names); read via .units
+        tasks_frame: Raw Task sheet; read via .tasks
+        kpis: Precomputed KPI aggregates (see phase_logic.build_kpi_summary)
+        building_stats: Per-building counts indexed by (phase, building)
+        changes: Delta against the previous snapshot (None for the first one)
+        delta_base: Row hashes the next version is diffed against
+        source: remote_source(property key) or the local workbook path
+        fetched_at: When the workbook was first fetched (saved, for disk fallbacks)
+        url: Export URL of a non-default remote workbook (None otherwise)
+    """
+    version: str
+    today: date
+    built_at: datetime
+    units_frame: pd.DataFrame = field(repr=False)
+    tasks_frame: pd.DataFrame = field(repr=False)
+    kpis: Mapping[str, Any] = field(repr=False)
+    building_stats: pd.DataFrame = field(repr=False)
+    changes: Optional[UnitDelta] = field(default=None, repr=False)
+    delta_base: Optional[DeltaBase] = field(default=None, repr=False)
+    source: str = REMOTE_SOURCE
+    fetched_at: Optional[datetime] = None
+    url: Optional[str] = None
+    _views: dict = field(default_factory=dict, repr=False, compare=False)
+    # Builders may read other views
+    _views_lock: Any = field(default_factory=threading.RLock, repr=False, compare=False)
+
+    @property
+    def units(self) -> pd.DataFrame:
+        """Enriched units with canonical (Units page) column names."""
+        return self.units_frame.copy(deep=False)
+
+    @property
+    def dashboard_units(self) -> pd.DataFrame:
+        """Enriched units with the Dashboard's Excel-style column names."""
+        return self.units_frame.rename(columns=DASHBOARD_COLUMN_MAP)
+
+    @property
+    def tasks(self) -> pd.DataFrame:
+        """Task sheet as loaded from the workbook."""
+        return self.tasks_frame.copy(deep=False)
+
+    @property
+    def transitions(self) -> list:
+        """Units whose nvm / lifecycle_label changed since the previous snapshot."""
+        return self.changes.transitions if self.changes is not None else []
+
+    def view(self, name: str, builder: Callable[["EnrichedSnapshot"], Any]) -> Any:
+        """
+        Return a derived view, building it once per snapshot.
+
+        Pages use this for structures that only depend on the data version
+        (phase overview, unit lists), so reruns reuse them instead of rebuilding.
+        """
+        with self._views_lock:
+            if name not in self._views:
+                self._views[name] = builder(self)
+            return self._views[name]
+
+    def memory_report(self) -> pd.DataFrame:
+        """Per-column memory of the units and tasks frames (see core.schema.memory_report)."""
+        return self.view(
+            "memory_report",
+            lambda s: memory_report({'units': s.units_frame, 'tasks': s.tasks_frame}),
+        )
+
+
+# Latest snapshot per data source, used as the diff base for the next version
+# and served as the last good snapshot when a load fails
+_latest_snapshots: Dict[str, EnrichedSnapshot] = {}
+
+
+@dataclass(frozen=True)
+class Freshness:
+    """
+    Whether a served snapshot reflects the current workbook.
+
+    Args:
+        stale: True when the workbook could not be revalidated in time
+        as_of: When the served data was fetched (None if unknown)
+        detail: Why the data is stale ('' when fresh)
+    """
+    stale: bool
+    as_of: Optional[datetime] = None
+    detail: str = ""
+
+
+# Background refresh of the remote snapshots, one per source key (set DMRB_PREFETCH=0 to disable)
+PREFETCH_ENV = "DMRB_PREFETCH"
+_prefetchers: Dict[str, PrefetchScheduler] = {}
+_prefetcher_lock = threading.Lock()
+
+
+def _building_stats(units: pd.DataFrame) -> pd.DataFrame:
+    if 'phase' not in units.columns or 'building' not in units.columns:
+        return pd.DataFrame()
+    return build_building_stats(units, phase_col='phase', building_col='building')
+
+
+@st.cache_resource(max_entries=WORKBOOK_CACHE_ENTRIES, show_spinner=False)
+def _build_snapshot(
+    version: str,
+    today: date,
+    source: str,
+    _excel_bytes: bytes,
+    _fetched_at: Optional[datetime] = None,
+    total_units: int = TOTAL_UNITS,
+    snapshot_dir: Optional[str] = None,
+    _url: Optional[str] = None,
+) -> EnrichedSnapshot:
+    """
+    Build (once per version, day and source) the enriched snapshot shared by all sessions.
+    The bytes are only parsed when no snapshot of the version is saved on disk.
+    """
+    sheets = parse_workbook(version, _excel_bytes, snapshot_dir)
+    if "Unit" not in sheets:
+        raise ValueError("Workbook is missing the Unit sheet")
+    units_raw = sheets["Unit"].rename(columns=UNIT_COLUMN_MAP)
+
+    previous = _latest_snapshots.get(source)
+    changes = None
+    if (
+        previous is not None
+        and previous.delta_base is not None
+        and not previous.building_stats.empty
+    ):
+        units, changes = apply_unit_delta(
+            previous.delta_base, previous.units_frame, units_raw, today
+        )
+        units = apply_unit_schema(units)
+        building_stats = patch_building_stats(
+            previous.building_stats, previous.units_frame, units, changes
+        )
+    else:
+        units = apply_unit_schema(compute_all_unit_fields(units_raw, today=today))
+        building_stats = _building_stats(units)
+
+    snapshot = EnrichedSnapshot(
+        version=version,
+        today=today,
+        built_at=datetime.now(),
+        units_frame=units,
+        tasks_frame=sheets.get("Task", pd.DataFrame()),
+        kpis=MappingProxyType(build_kpi_summary(units, total_units)),
+        building_stats=building_stats,
+        changes=changes,
+        delta_base=make_delta_base(units_raw, today),
+        source=source,
+        fetched_at=_fetched_at,
+        url=_url,
+    )
+    _latest_snapshots[source] = snapshot
+    log_event(
+        "INFO",
+        f"Built enriched snapshot {version[:12]} for {today} "
+        f"({len(units)} units, {format_bytes(frame_bytes(units))})",
+    )
+    return snapshot
+
+
+def _prefetch_remote(
+    url: Optional[str] = None,
+    total_units: int = TOTAL_UNITS,
+    snapshot_dir: Optional[str] = None,
+    source: str = REMOTE_SOURCE,
+) -> EnrichedSnapshot:
+    """Revalidate a remote workbook and build its snapshot ahead of page reruns."""
+    payload = refresh_payload(url=url)
+    return _build_snapshot(
+        payload.sha256, datetime.now().date(), source, payload.content, payload.fetched_at,
+        total_units, snapshot_dir, url,
+    )
+
+
+def _saved_snapshot(
+    today: date,
+    url: Optional[str] = None,
+    total_units: int = TOTAL_UNITS,
+    snapshot_dir: Optional[str] = None,
+    source: str = REMOTE_SOURCE,
+) -> Optional[EnrichedSnapshot]:
+    """
+    Cold-start fallback: the latest workbook saved on disk, if the sheet does
+    not answer within REVALIDATE_WAIT_S. None when nothing is saved or the
+    sheet answered (the caller then loads it normally).
+    """
+    manifest = read_manifest(snapshot_dir)
+    if not manifest or not manifest.get("hash"):
+        return None
+    pending = revalidate_in_background(url)
+    if pending is not None:
+        pending.join(REVALIDATE_WAIT_S)
+    if source_status(url).version is not None:
+        return None
+
+    saved_at = datetime.fromisoformat(manifest["saved_at"]) if manifest.get("saved_at") else None
+    try:
+        snapshot = _build_snapshot(
+            manifest["hash"], today, source, b"", saved_at, total_units, snapshot_dir, url,
+        )
+    except Exception as e:
+        log_event("INFO", f"Saved snapshot {manifest['hash'][:12]} unusable: {e}")
+        return None
+    log_event(
+        "INFO", f"Google Sheets not available yet; serving saved snapshot {snapshot.version[:12]}"
+    )
+    return snapshot
+
+
+def start_prefetch(
+    url: Optional[str] = None,
+    total_units: int = TOTAL_UNITS,
+    snapshot_dir: Optional[str] = None,
+    source: str = REMOTE_SOURCE,
+) -> Optional[PrefetchScheduler]:
+    """
+    Start (once per process and source) the background refresh of a remote snapshot.
+
+    It runs PREFETCH_LEAD_S before the fetched workbook goes stale, so reruns
+    find both the workbook and its snapshot warm.
+
+    Returns:
+        The running scheduler, or None when disabled via DMRB_PREFETCH=0.
+    """
+    if os.environ.get(PREFETCH_ENV, "1") == "0":
+        return None
+    with _prefetcher_lock:
+        prefetcher = _prefetchers.get(source)
+        if prefetcher is None:
+            prefetcher = _prefetchers[source] = PrefetchScheduler(
+                lambda: _prefetch_remote(url, total_units, snapshot_dir, source),
+                interval_s=max(PAYLOAD_TTL_S - PREFETCH_LEAD_S, 1),
+                retry_s=PREFETCH_RETRY_S,
+                max_backoff_s=PREFETCH_MAX_BACKOFF_MIN * 60,
+                name="prefetch",
+            )
+            prefetcher.start()
+        return prefetcher
+
+
+@profiled()
+def get_enriched_snapshot(
+    file_path: str = None,
+    url: str = None,
+    total_units: int = TOTAL_UNITS,
+    snapshot_dir: str = None,
+    property_key: str = None,
+) -> EnrichedSnapshot:
+    """
+    Get the enriched snapshot for the current workbook version.
+
+    Falls back to the last good snapshot of the same source when the workbook
+    cannot be loaded or enriched (the error is re-raised if there is none).
+    While there is one, a first download is waited for at most REVALIDATE_WAIT_S.
+
+    Args:
+        file_path: Optional local workbook path (used when it exists)
+        url: Export URL of the remote workbook (default: datasource.get_gdrive_url())
+        total_units: Units in the property (KPI denominator)
+        snapshot_dir: Where parsed workbooks are saved (default: SNAPSHOT_DIR)
+        property_key: Registry key; keeps each property's snapshots apart (default property: None)
+
+    Returns:
+        EnrichedSnapshot shared across pages, reruns and sessions.
+    """
+    local_path = local_workbook_path(file_path)
+    remote = local_path is None
+    source = remote_source(property_key) if remote else str(local_path)
+    today = datetime.now().date()
+    if remote and source not in _latest_snapshots and source_status(url).version is None:
+        saved = _saved_snapshot(today, url, total_units, snapshot_dir, source)
+        if saved is not None:
+            return saved
+
+    # With a last good snapshot to fall back on, a cold download is not waited for
+    cold_wait_s = REVALIDATE_WAIT_S if source in _latest_snapshots else None
+    try:
+        excel_bytes, version = read_workbook_bytes(file_path, url, cold_wait_s)
+        fetched_at = source_status(url).fetched_at if remote else None
+        snapshot = _build_snapshot(
+            version, today, source, excel_bytes, fetched_at, total_units, snapshot_dir,
+            url if remote else None,
+        )
+    except Exception as e:
+        last_good = _latest_snapshots.get(source)
+        if last_good is None:
+            raise
+        log_event("INFO", f"Serving last good snapshot {last_good.version[:12]} ({e})")
+        return last_good
+
+    if remote:
+        start_prefetch(url, total_units, snapshot_dir, source)
+    return snapshot
+
+
+def get_property_snapshot(prop: Property) -> EnrichedSnapshot:
+    """
+    Get the enriched snapshot of one registry property (see get_enriched_snapshot).
+
+    Raises:
+        FileNotFoundError: If the property has no url and its workbook does not
+                           exist (only the default property falls back to
+                           datasource.get_gdrive_url())
+    """
+    if prop.url is None and prop != default_property() and local_workbook_path(prop.path) is None:
+        raise FileNotFoundError(f"Workbook of property {prop.key} not found: {prop.path}")
+    return get_enriched_snapshot(
+        prop.path, prop.url, prop.total_units, property_snapshot_dir(prop), prop.key
+    )
+
+
+@dataclass(frozen=True)
+class Portfolio:
+    """
+    Snapshots of every property, loaded together.
+
+    Args:
+        properties: Registry properties, in order
+        snapshots: Snapshot per property key (properties that failed are missing)
+        errors: Load error per property key
+        load_s: Wall time of the concurrent load
+    """
+    properties: tuple
+    snapshots: Mapping[str, EnrichedSnapshot]
+    errors: Mapping[str, str]
+    load_s: float
+
+    @property
+    def units(self) -> pd.DataFrame:
+        """Units of all loaded properties with a 'property' key column."""
+        return build_portfolio_units(self.snapshots)
+
+    @property
+    def total_units(self) -> int:
+        return sum(prop.total_units for prop in self.properties)
+
+    def summary(self) -> pd.DataFrame:
+        """One row per property: unit counts, occupancy and load status."""
+        rows = []
+        for prop in self.properties:
+            snapshot = self.snapshots.get(prop.key)
+            kpis = snapshot.kpis if snapshot is not None else {}
+            rows.append({
+                'property': prop.key,
+                'name': prop.name,
+                'total_units': prop.total_units,
+                'units_in_data': kpis.get('units_in_data', 0),
+                'vacant_units': kpis.get('vacant_units', 0),
+                'occupancy_pct': round(kpis.get('occupancy_pct', 0), 1),
+                'version': snapshot.version[:12] if snapshot is not None else '',
+                'error': self.errors.get(prop.key, ''),
+            })
+        return pd.DataFrame(rows)
+
+
+def build_portfolio_units(snapshots: Mapping[str, EnrichedSnapshot]) -> pd.DataFrame:
+    """
+    Combine the units of several snapshots into one frame.
+
+    Args:
+        snapshots: Snapshot per property key, in display order
+
+    Returns:
+        Concatenated units (canonical column names) with a categorical
+        'property' column first.
+    """
+    keys = list(snapshots)
+    if not keys:
+        return pd.DataFrame(columns=['property'])
+    frames = [snapshots[key].units_frame.assign(property=key) for key in keys]
+    units = pd.concat(frames, ignore_index=True)
+    units['property'] = pd.Categorical(units['property'], categories=keys)
+    return units[['property'] + [c for c in units.columns if c != 'property']]
+
+
+def _load_property(prop: Property, ctx: Any) -> EnrichedSnapshot:
+    if ctx is not None:
+        add_script_run_ctx(threading.current_thread(), ctx)  # session_state access from the worker
+    return get_property_snapshot(prop)
+
+
+@profiled()
+def load_portfolio(
+    properties: Optional[list[Property]] = None,
+    workers: int = PROPERTY_LOAD_WORKERS,
+) -> Portfolio:
+    """
+    Load the snapshots of all properties concurrently.
+
+    Each property is downloaded, parsed and enriched on a bounded thread pool
+    (at most `workers` at once), so a refresh costs about the slowest property
+    rather than the sum of all of them. A property that fails is reported in
+    Portfolio.errors; the others are still served.
+
+    Args:
+        properties: Properties to load (default: core.properties.load_properties())
+        workers: Maximum concurrent loads
+
+    Returns:
+        Portfolio with the snapshot of each property that loaded
+    """
+    properties = list(properties if properties is not None else load_properties())
+    ctx = get_script_run_ctx(suppress_warning=True) if get_script_run_ctx else None
+    started = time.perf_counter()
+
+    snapshots: Dict[str, EnrichedSnapshot] = {}
+    errors: Dict[str, str] = {}
+    max_workers = max(1, min(workers, len(properties)))
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="property-load") as pool:
+        futures = {prop.key: pool.submit(_load_property, prop, ctx) for prop in properties}
+        for key, future in futures.items():
+            try:
+                snapshots[key] = future.result()
+            except Exception as e:
+                errors[key] = str(e)
+                log_event("ERROR", f"Failed to load property {key}: {e}")
+
+    portfolio = Portfolio(
+        properties=tuple(properties),
+        snapshots=MappingProxyType(snapshots),
+        errors=MappingProxyType(errors),
+        load_s=time.perf_counter() - started,
+    )
+    log_event(
+        "INFO", f"Loaded {len(snapshots)}/{len(properties)} properties in {portfolio.load_s:.2f}s"
+    )
+    return portfolio
+
+
+def snapshot_freshness(snapshot: EnrichedSnapshot) -> Freshness:
+    """
+    Check whether a snapshot is the current, fresh remote workbook.
+
+    Local workbooks are always fresh. Remote snapshots are stale when the
+    workbook is past its TTL (revalidation failed or still running) or when
+    a fallback snapshot is served instead of the last fetched version.
+    """
+    if not is_remote_source(snapshot.source):
+        return Freshness(stale=False, as_of=snapshot.fetched_at or snapshot.built_at)
+
+    status = source_status(snapshot.url)
+    current = status.version == snapshot.version
+    as_of = status.fetched_at if current else snapshot.fetched_at
+    if current and status.fresh:
+        return Freshness(stale=False, as_of=as_of)
+
+    if status.breaker_open_until is not None:
+        detail = f"Google Sheets unavailable, retrying after {status.breaker_open_until:%H:%M}"
+    elif status.revalidating:
+        detail = "Refreshing from Google Sheets in the background"
+    elif status.last_error:
+        detail = "Google Sheets download failed, retrying"
+    else:
+        detail = "Refreshing from Google Sheets"
+    return Freshness(stale=True, as_of=as_of, detail=detail)
@@ -0,0 +1,179 @@
+"""
+core/snapshot_store.py
+---------------------------------------------------------
+Disk-backed snapshots of the parsed Unit and Task sheets.
+Frames are written as Feather files keyed by workbook hash,
+so cold starts and new workers skip the xlsx parse.
+---------------------------------------------------------
+"""
+
+import json
+import re
+import shutil
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401  (Feather backend)
+except ImportError:
+    pyarrow = None
+
+from core.logger import log_event
+from utils.constants import SNAPSHOT_DIR, SNAPSHOT_KEEP
+
+MANIFEST_NAME = "latest.json"
+
+# Snapshot folders are named by workbook hash (SHA-256 hex); anything else in
+# the root (e.g. per-property snapshot folders) is left alone by pruning
+_SNAPSHOT_FOLDER = re.compile(r"[0-9a-f]{64}")
+
+
+def _root(snapshot_dir: Optional[Path]) -> Path:
+    return Path(snapshot_dir) if snapshot_dir is not None else Path(SNAPSHOT_DIR)
+
+
+def _write_sheet(df: pd.DataFrame, folder: Path, sheet_name: str) -> None:
+    """Write one sheet as Feather, falling back to pickle for mixed-type columns."""
+    if pyarrow is not None:
+        feather_path = folder / f"{sheet_name}.feather"
+        try:
+            df.reset_index(drop=True).to_feather(feather_path)
+            return
+        except (ValueError, TypeError) as e:
+            feather_path.unlink(missing_ok=True)
+            log_event("INFO", f"[snapshot] {sheet_name} not Arrow-compatible ({e}); using pickle")
+    df.to_pickle(folder / f"{sheet_name}.pkl")
+
+
+def _read_sheet(folder: Path, sheet_name: str) -> Optional[pd.DataFrame]:
+    feather_path = folder / f"{sheet_name}.feather"
+    if feather_path.exists() and pyarrow is not None:
+        return pd.read_feather(feather_path)
+    pickle_path = folder / f"{sheet_name}.pkl"
+    if pickle_path.exists():
+        return pd.read_pickle(pickle_path)
+    return None
+
+
+def load_snapshot(
+    workbook_hash: str,
+    sheet_names: list[str],
+    snapshot_dir: Optional[Path] = None,
+) -> Optional[dict[str, pd.DataFrame]]:
+    """
+    Load parsed sheets for a workbook version from disk.
+
+    Args:
+        workbook_hash: Content hash of the workbook
+        sheet_names: Sheets that must all be present
+        snapshot_dir: Override for SNAPSHOT_DIR
+
+    Returns:
+        Dictionary of DataFrames, or None if no complete snapshot exists.
+    """
+    folder = _root(snapshot_dir) / workbook_hash
+    if not folder.is_dir():
+        return None
+
+    try:
+        sheets = {}
+        for sheet_name in sheet_names:
+            df = _read_sheet(folder, sheet_name)
+            if df is None:
+                return None
+            sheets[sheet_name] = df
+    except Exception as e:
+        log_event("WARNING", f"[snapshot] Ignoring unreadable snapshot {workbook_hash[:12]}: {e}")
+        return None
+
+    log_event("INFO", f"[snapshot] Loaded workbook {workbook_hash[:12]} from disk")
+    return sheets
+
+
+def save_snapshot(
+    workbook_hash: str,
+    sheets: dict[str, pd.DataFrame],
+    snapshot_dir: Optional[Path] = None,
+    keep: int = SNAPSHOT_KEEP,
+) -> bool:
+    """
+    Persist parsed sheets for a workbook version and mark it as latest.
+
+    The snapshot is written to a temporary folder and renamed into place,
+    so concurrent readers never see a partial snapshot.
+
+    Returns:
+        True if the snapshot was written.
+    """
+    root = _root(snapshot_dir)
+    folder = root / workbook_hash
+    tmp_folder: Optional[Path] = None
+
+    try:
+        root.mkdir(parents=True, exist_ok=True)
+        if not folder.exists():
+            # Each writer gets its own temp folder; when two save the same
+            # version at once, the first rename wins and the other is discarded
+            tmp_folder = Path(tempfile.mkdtemp(dir=root, prefix=f".{workbook_hash}."))
+            for sheet_name, df in sheets.items():
+                _write_sheet(df, tmp_folder, sheet_name)
+            try:
+                tmp_folder.rename(folder)
+            except OSError:
+                if not folder.is_dir():
+                    raise
+
+        manifest = {"hash": workbook_hash, "saved_at": datetime.now().isoformat()}
+        (root / MANIFEST_NAME).write_text(json.dumps(manifest), encoding="utf-8")
+    except Exception as e:
+        log_event("WARNING", f"[snapshot] Could not save snapshot {workbook_hash[:12]}: {e}")
+        return False
+    finally:
+        if tmp_folder is not None:
+            shutil.rmtree(tmp_folder, ignore_errors=True)
+
+    prune_snapshots(keep=keep, snapshot_dir=root)
+    log_event("INFO", f"[snapshot] Saved workbook {workbook_hash[:12]} to {folder}")
+    return True
+
+
+def read_manifest(snapshot_dir: Optional[Path] = None) -> Optional[dict]:
+    """Return the latest-snapshot manifest ({hash, saved_at}), if any."""
+    manifest_path = _root(snapshot_dir) / MANIFEST_NAME
+    try:
+        return json.loads(manifest_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def latest_snapshot_hash(snapshot_dir: Optional[Path] = None) -> Optional[str]:
+    """Return the hash of the most recently saved snapshot, if any."""
+    manifest = read_manifest(snapshot_dir)
+    return manifest.get("hash") if manifest else None
+
+
+def prune_snapshots(keep: int = SNAPSHOT_KEEP, snapshot_dir: Optional[Path] = None) -> None:
+    """
+    Delete all but the `keep` most recent snapshots (the latest is always kept).
+
+    Only workbook-hash folders are considered, so property folders nested in
+    the root are never pruned.
+    """
+    root = _root(snapshot_dir)
+    if not root.is_dir():
+        return
+
+    latest = latest_snapshot_hash(root)
+    folders = [p for p in root.iterdir() if p.is_dir() and _SNAPSHOT_FOLDER.fullmatch(p.name)]
+    folders.sort(key=lambda p: p.stat().st_mtime, reverse=True)
+
+    kept = 0
+    for folder in folders:
+        if folder.name == latest or kept < keep:
+            kept += 1
+            continue
+        shutil.rmtree(folder, ignore_errors=True)
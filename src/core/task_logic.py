@@ -3,14 +3,48 @@ task_logic.py
 ---------------------------------------------------------
 Task processing logic for DMRB Dashboard.
 Handles task filtering, parsing Unit IDs, and grouping.
+Date lookups go through a TaskIndex built once per data version.
 Used by: Dashboard page (Walk of the Day) and task UI components.
 ---------------------------------------------------------
 """
 
-import pandas as pd
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from typing import Dict, List, Tuple
 
+import numpy as np
+import pandas as pd
+
+from utils.helpers import fmt_dates
+from utils.profiler import profiled
+
+# Task types and their date columns (display order)
+TASK_DATE_COLUMNS = {
+    'Inspections': 'Inspection Date',
+    'Bids': 'Bids Date',
+    'Paint': 'Paint Date',
+    'Make Ready': 'MR date',
+    'Housekeeping': 'HK Date',
+    'Flooring/Carpet': 'F/C Date',
+    'Other Task': 'Other Task Date',
+    'Other Task 2': 'O/T Date',
+    'Final Walk': 'Final walk Date'
+}
+
+# "P-5 / Bld-1 / U-210" → first three '/'-separated parts (see parse_unit_id)
+UNIT_ID_PATTERN = r'^([^/]*)/([^/]*)/([^/]*)'
+
+# Columns carried into the task calendar (TaskIndex.entries), when present
+TASK_DETAIL_COLUMNS = ['Unit ID', 'Phase', 'Building', 'Unit', 'Vendor / Employee', 'Task Status']
+
+# Calendar grouping keys → entries columns
+CALENDAR_GROUPS = {
+    'task_type': 'Task Type',
+    'phase': 'Phase',
+    'building': 'Building',
+    'vendor': 'Vendor / Employee',
+}
+
 
 def parse_unit_id(unit_id: str) -> Tuple[str, str, str]:
     """
@@ -18,7 +52,7 @@ def parse_unit_id(unit_id: str) -> Tuple[str, str, str]:
 
     Inputs: unit_id like "P-5 / Bld-1 / U-210".
     Outputs: (phase, building, unit) as strings.
-    Used by: get_tasks_for_date() to enrich task rows for UI grouping.
+    Used by: tests as the scalar reference for parse_unit_ids().
     """
     try:
         parts = unit_id.split('/')
@@ -30,45 +64,242 @@ def parse_unit_id(unit_id: str) -> Tuple[str, str, str]:
         return '', '', ''
 
 
+def parse_unit_ids(unit_ids: pd.Series) -> pd.DataFrame:
+    """
+    Vectorized parse_unit_id for a whole column.
+
+    Inputs: Series of Unit ID strings.
+    Outputs: DataFrame with Phase, Building, Unit string columns ('' where unparseable),
+             aligned to the input index.
+    Used by: build_task_index().
+    """
+    texts = unit_ids.where(unit_ids.map(lambda v: isinstance(v, str))).astype('string')
+    parts = texts.str.extract(UNIT_ID_PATTERN)
+    parsed = pd.DataFrame({
+        'Phase': parts[0].str.replace('P-', '', regex=False).str.strip(),
+        'Building': parts[1].str.replace('Bld-', '', regex=False).str.strip(),
+        'Unit': parts[2].str.replace('U-', '', regex=False).str.strip(),
+    }, index=unit_ids.index)
+    return parsed.fillna('').astype(str)
+
+
+@dataclass(frozen=True)
+class TaskIndex:
+    """
+    Task sheet melted into (task type, day, row) entries, stored per task type
+    and sorted by day (ties keep sheet order), so a day is a contiguous slice.
+
+    Args:
+        tasks: Task sheet with Phase/Building/Unit columns added
+        days: Task type → task days (datetime64[D], ascending)
+        frames: Task type → task rows in `days` order
+        entries: Long calendar table (Date, Task Type, TASK_DETAIL_COLUMNS) sorted by Date
+        entry_days: entries' days (datetime64[D]) for range searches
+    """
+    tasks: pd.DataFrame = field(repr=False)
+    days: Dict[str, np.ndarray] = field(repr=False)
+    frames: Dict[str, pd.DataFrame] = field(repr=False)
+    entries: pd.DataFrame = field(repr=False)
+    entry_days: np.ndarray = field(repr=False)
+    _by_day: dict = field(default_factory=dict, repr=False, compare=False)
+    _hierarchies: dict = field(default_factory=dict, repr=False, compare=False)
+
+    def __len__(self) -> int:
+        return sum(len(days) for days in self.days.values())
+
+    @property
+    def task_types(self) -> List[str]:
+        """Task types present in the sheet (TASK_DATE_COLUMNS order)."""
+        return list(self.frames)
+
+    def tasks_for(self, target_date: datetime.date) -> Dict[str, pd.DataFrame]:
+        """
+        Get all tasks dated target_date, grouped by task type (same output as get_tasks_for_date).
+        Results are memoized per day and shared between callers; treat them as read-only.
+        """
+        day = np.datetime64(target_date, 'D')
+        if day in self._by_day:
+            return self._by_day[day]
+
+        results = {}
+        for task_name, days in self.days.items():
+            lo = np.searchsorted(days, day, side='left')
+            hi = np.searchsorted(days, day, side='right')
+            if hi > lo:
+                results[task_name] = self.frames[task_name].iloc[lo:hi]
+        self._by_day[day] = results
+        return results
+
+    def hierarchy_for(self, target_date: datetime.date, task_name: str) -> "TaskHierarchy":
+        """
+        Phase → Building → Unit hierarchy of one task type on target_date, memoized
+        per (date, task type) for this data version.
+        """
+        key = (np.datetime64(target_date, 'D'), task_name)
+        if key not in self._hierarchies:
+            tasks = self.tasks_for(target_date).get(task_name)
+            if tasks is None:
+                tasks = self.tasks.iloc[0:0]
+            self._hierarchies[key] = build_task_hierarchy(tasks)
+        return self._hierarchies[key]
+
+    def hierarchies_for(self, target_date: datetime.date) -> Dict[str, "TaskHierarchy"]:
+        """Hierarchies of every task type with tasks on target_date (TASK_DATE_COLUMNS order)."""
+        return {
+            task_name: self.hierarchy_for(target_date, task_name)
+            for task_name in self.tasks_for(target_date)
+        }
+
+    def tasks_between(self, start: datetime.date, end: datetime.date) -> pd.DataFrame:
+        """
+        Get calendar entries dated start..end (inclusive), ordered by date then task type.
+
+        Outputs: DataFrame with Date, Task Type and TASK_DETAIL_COLUMNS (one row per task date).
+        """
+        lo = np.searchsorted(self.entry_days, np.datetime64(start, 'D'), side='left')
+        hi = np.searchsorted(self.entry_days, np.datetime64(end, 'D'), side='right')
+        return self.entries.iloc[lo:max(lo, hi)]
+
+    def task_counts(
+        self,
+        start: datetime.date,
+        end: datetime.date,
+        by: Tuple[str, ...] = ('task_type',),
+        per_day: bool = True,
+    ) -> pd.DataFrame:
+        """
+        Count tasks dated start..end (inclusive).
+
+        Inputs: by — keys of CALENDAR_GROUPS (task_type, phase, building, vendor);
+                per_day — also group by Date.
+        Outputs: DataFrame with the group columns and a Tasks count, sorted by group.
+        """
+        unknown = [key for key in by if key not in CALENDAR_GROUPS]
+        if unknown:
+            raise ValueError(
+                f"Unknown calendar grouping {unknown}; expected {list(CALENDAR_GROUPS)}"
+            )
+
+        entries = self.tasks_between(start, end)
+        keys = (['Date'] if per_day else []) + [CALENDAR_GROUPS[key] for key in by]
+        keys = [key for key in keys if key in entries.columns]
+        if not keys:
+            return pd.DataFrame({'Tasks': [len(entries)]})
+        return (
+            entries.groupby(keys, sort=True, dropna=False, observed=True)
+            .size()
+            .reset_index(name='Tasks')
+        )
+
+
+@profiled()
+def build_task_index(tasks_df: pd.DataFrame) -> TaskIndex:
+    """
+    Parse every task date column and Unit ID once and index the tasks by day.
+
+    Inputs: tasks_df (raw Task sheet).
+    Outputs: TaskIndex; build once per data version and query with tasks_for().
+    Used by: get_tasks_for_date, Dashboard page (via the enriched snapshot).
+    """
+    tasks = tasks_df.copy(deep=False)
+    if 'Unit ID' in tasks.columns:
+        tasks[['Phase', 'Building', 'Unit']] = parse_unit_ids(tasks['Unit ID'])
+
+    days_by_type, frames = {}, {}
+    for task_name, date_col in TASK_DATE_COLUMNS.items():
+        if date_col not in tasks_df.columns:
+            continue
+        dates = pd.to_datetime(tasks_df[date_col], errors='coerce')
+        days = dates.to_numpy().astype('datetime64[D]')
+        rows = np.flatnonzero(~np.isnat(days))
+        rows = rows[np.argsort(days[rows], kind='stable')]
+        days_by_type[task_name] = days[rows]
+        frames[task_name] = tasks.iloc[rows]
+
+    # Melt into one long calendar table: task types in TASK_DATE_COLUMNS order, then by date
+    detail_cols = [col for col in TASK_DETAIL_COLUMNS if col in tasks.columns]
+    parts = [
+        frames[task_name][detail_cols].assign(**{'Task Type': task_name}).reset_index(drop=True)
+        for task_name in frames
+    ]
+    if parts:
+        entry_days = np.concatenate(list(days_by_type.values()))
+        order = np.argsort(entry_days, kind='stable')
+        entry_days = entry_days[order]
+        entries = pd.concat(parts, ignore_index=True).iloc[order].reset_index(drop=True)
+    else:
+        entry_days = np.array([], dtype='datetime64[D]')
+        entries = pd.DataFrame(columns=['Task Type'] + detail_cols)
+    entries.insert(0, 'Date', pd.to_datetime(entry_days))
+    entries['Task Type'] = pd.Categorical(entries['Task Type'], categories=list(frames))
+    entries = entries[['Date', 'Task Type'] + detail_cols]
+
+    return TaskIndex(
+        tasks=tasks, days=days_by_type, frames=frames, entries=entries, entry_days=entry_days
+    )
+
+
+# Columns of build_task_summaries()
+TASK_SUMMARY_COLUMNS = ['tasks_scheduled', 'next_task', 'task_status', 'task_vendor']
+
+
+def build_task_summaries(task_index: TaskIndex, today: datetime.date) -> pd.DataFrame:
+    """
+    Summarize each unit's tasks from the indexed Task sheet.
+
+    Inputs: TaskIndex (build_task_index), today for the next upcoming task.
+    Outputs: DataFrame indexed by stripped Unit ID with TASK_SUMMARY_COLUMNS:
+             tasks_scheduled (dated tasks), next_task ('Paint 10/21', '' when none
+             upcoming), task_status and task_vendor (first sheet row of the unit).
+    Used by: ui.unit_viewmodels.build_unit_viewmodels (joined on unit_id).
+    """
+    entries, tasks = task_index.entries, task_index.tasks
+    if 'Unit ID' not in tasks.columns:
+        return pd.DataFrame(columns=TASK_SUMMARY_COLUMNS, index=pd.Index([], name='unit_key'))
+
+    def _keys(frame: pd.DataFrame) -> pd.Series:
+        ids = frame['Unit ID']
+        return ids.where(ids.notna(), '').map(str).astype(object).str.strip()
+
+    def _text(frame: pd.DataFrame, col: str) -> np.ndarray:
+        if col not in frame.columns:
+            return np.full(len(frame), '', dtype=object)
+        return frame[col].where(frame[col].notna(), '').map(str).to_numpy(dtype=object)
+
+    # One row per unit: the unit's first row in the sheet
+    task_keys = _keys(tasks).to_numpy()
+    first = np.flatnonzero((task_keys != '') & ~pd.Series(task_keys).duplicated().to_numpy())
+    first_rows = tasks.iloc[first]
+    summaries = pd.DataFrame({
+        'task_status': _text(first_rows, 'Task Status'),
+        'task_vendor': _text(first_rows, 'Vendor / Employee'),
+    }, index=pd.Index(task_keys[first], name='unit_key'))
+
+    # Dated tasks per unit, and the earliest upcoming one (entries are in date order)
+    entry_keys = _keys(entries)
+    scheduled = entry_keys.value_counts(sort=False).reindex(summaries.index, fill_value=0)
+    summaries['tasks_scheduled'] = scheduled.to_numpy()
+    upcoming = (entries['Date'] >= pd.Timestamp(today)).to_numpy()
+    upcoming = upcoming & ~entry_keys.where(upcoming).duplicated().to_numpy()
+    task_types = entries['Task Type'][upcoming].astype(str).to_numpy(dtype=object)
+    labels = task_types + ' ' + fmt_dates(entries['Date'][upcoming], '%m/%d').to_numpy()
+    next_task = pd.Series(labels, index=entry_keys[upcoming].to_numpy())
+    summaries['next_task'] = next_task.reindex(summaries.index).fillna('').to_numpy(dtype=object)
+    return summaries[TASK_SUMMARY_COLUMNS]
+
+
 def get_tasks_for_date(tasks_df: pd.DataFrame, target_date: datetime.date) -> Dict[str, pd.DataFrame]:
     """
     Get all tasks with dates matching target_date, grouped by task type.
 
     Inputs: tasks_df (raw Task sheet), target_date (python date).
     Outputs: Dict[str, DataFrame] keyed by task type, with Phase/Building/Unit columns added.
-    Used by: get_yesterday_tasks, Dashboard page.
-    """
-    # Define task types and their date columns
-    task_types = {
-        'Inspections': 'Inspection Date',
-        'Bids': 'Bids Date',
-        'Paint': 'Paint Date',
-        'Make Ready': 'MR date',
-        'Housekeeping': 'HK Date',
-        'Flooring/Carpet': 'F/C Date',
-        'Other Task': 'Other Task Date',
-        'Other Task 2': 'O/T Date',
-        'Final Walk': 'Final walk Date'
+    Used by: get_yesterday_tasks. For repeated lookups, build a TaskIndex once instead.
+    """
+    return {
+        task_name: tasks.copy()
+        for task_name, tasks in build_task_index(tasks_df).tasks_for(target_date).items()
     }
-    
-    results = {}
-    
-    for task_name, date_col in task_types.items():
-        if date_col not in tasks_df.columns:
-            continue
-        
-        # Filter tasks where date matches target_date
-        task_dates = pd.to_datetime(tasks_df[date_col], errors='coerce')
-        matching_tasks = tasks_df[task_dates.dt.date == target_date].copy()
-        
-        if len(matching_tasks) > 0:
-            # Parse Unit ID into components
-            matching_tasks[['Phase', 'Building', 'Unit']] = matching_tasks['Unit ID'].apply(
-                lambda x: pd.Series(parse_unit_id(x))
-            )
-            results[task_name] = matching_tasks
-    
-    return results
 
 
 def get_yesterday_tasks(tasks_df: pd.DataFrame) -> Dict[str, pd.DataFrame]:
@@ -83,35 +314,96 @@ def get_yesterday_tasks(tasks_df: pd.DataFrame) -> Dict[str, pd.DataFrame]:
     return get_tasks_for_date(tasks_df, yesterday)
 
 
+@dataclass(frozen=True)
+class BuildingTasks:
+    """Units of one building with a task: dicts with keys unit, unit_id, vendor, status."""
+    building: str
+    units: List[Dict]
+
+    @property
+    def total(self) -> int:
+        return len(self.units)
+
+
+@dataclass(frozen=True)
+class PhaseTasks:
+    """Buildings of one phase (sorted), with the phase's unit total."""
+    phase: str
+    total: int
+    buildings: List[BuildingTasks]
+
+
+@dataclass(frozen=True)
+class TaskHierarchy:
+    """
+    Phase → Building → Unit hierarchy for one task type, with totals precomputed.
+
+    Args:
+        phases: Phases sorted by label (string order), buildings likewise
+        total: Units across all phases
+        task_rows: Task rows the hierarchy was built from (including unparseable Unit IDs)
+    """
+    phases: List[PhaseTasks]
+    total: int
+    task_rows: int
+
+    def __bool__(self) -> bool:
+        return bool(self.phases)
+
+
+def _text_column(tasks: pd.DataFrame, col: str, default: str) -> pd.Series:
+    """Column as str(value) per row (like str(row.get(col, default)))."""
+    if col not in tasks.columns:
+        return pd.Series(default, index=tasks.index, dtype=object)
+    return tasks[col].map(str)
+
+
+def build_task_hierarchy(tasks: pd.DataFrame) -> TaskHierarchy:
+    """
+    Group tasks by Phase → Building → Unit with a sort and one groupby.
+
+    Inputs: DataFrame with Phase, Building, Unit columns present.
+    Outputs: TaskHierarchy; rows missing phase, building or unit are skipped.
+    Used by: TaskIndex.hierarchy_for, group_tasks_by_hierarchy.
+    """
+    records = pd.DataFrame({
+        'phase': _text_column(tasks, 'Phase', ''),
+        'building': _text_column(tasks, 'Building', ''),
+        'unit': _text_column(tasks, 'Unit', ''),
+        'unit_id': tasks['Unit ID'] if 'Unit ID' in tasks.columns else '',
+        'vendor': tasks['Vendor / Employee'] if 'Vendor / Employee' in tasks.columns else '—',
+        'status': tasks['Task Status'] if 'Task Status' in tasks.columns else '—',
+    }, index=tasks.index)
+    located = (records['phase'] != '') & (records['building'] != '') & (records['unit'] != '')
+    records = records[located]
+    if records.empty:
+        return TaskHierarchy(phases=[], total=0, task_rows=len(tasks))
+
+    # Stable sort keeps sheet order for units within a building
+    records = records.sort_values(['phase', 'building'], kind='stable')
+    sizes = records.groupby(['phase', 'building'], sort=False).size()
+    units = records[['unit', 'unit_id', 'vendor', 'status']].to_dict('records')
+
+    phases: List[PhaseTasks] = []
+    offset = 0
+    for phase, phase_sizes in sizes.groupby(level='phase', sort=False):
+        buildings = []
+        for (_, building), size in phase_sizes.items():
+            buildings.append(BuildingTasks(building=building, units=units[offset:offset + size]))
+            offset += size
+        phases.append(PhaseTasks(phase=phase, total=int(phase_sizes.sum()), buildings=buildings))
+    return TaskHierarchy(phases=phases, total=len(units), task_rows=len(tasks))
+
+
 def group_tasks_by_hierarchy(tasks: pd.DataFrame) -> Dict[str, Dict[str, List[Dict]]]:
     """
     Group tasks by Phase → Building → Unit hierarchy.
 
     Inputs: DataFrame with Phase, Building, Unit columns present.
-    Outputs: Nested dict {phase: {building: [units]}} for UI rendering.
-    Used by: ui.task_cards.render_all_tasks.
-    """
-    hierarchy = {}
-    
-    for _, row in tasks.iterrows():
-        phase = str(row.get('Phase', ''))
-        building = str(row.get('Building', ''))
-        unit = str(row.get('Unit', ''))
-        
-        if not phase or not building or not unit:
-            continue
-        
-        if phase not in hierarchy:
-            hierarchy[phase] = {}
-        
-        if building not in hierarchy[phase]:
-            hierarchy[phase][building] = []
-        
-        hierarchy[phase][building].append({
-            'unit': unit,
-            'unit_id': row.get('Unit ID', ''),
-            'vendor': row.get('Vendor / Employee', '—'),
-            'status': row.get('Task Status', '—')
-        })
-    
-    return hierarchy
+    Outputs: Nested dict {phase: {building: [units]}} (sorted keys).
+    Used by: callers that need plain dicts; the UI renders build_task_hierarchy() output.
+    """
+    return {
+        phase.phase: {building.building: building.units for building in phase.buildings}
+        for phase in build_task_hierarchy(tasks).phases
+    }
@@ -0,0 +1,221 @@
+"""
+core/transport.py
+---------------------------------------------------------
+HTTP transport for the Google Sheets download.
+One pooled requests.Session per process keeps the
+connection alive between refreshes (on both hops of the
+export redirect), asks for gzip, and streams the body,
+hashing it as it arrives and copying it once into a body of
+its final size. Every download records its size,
+time to first byte, transfer time and throughput.
+---------------------------------------------------------
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Mapping, Optional
+
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+except ImportError:
+    requests = None
+
+from utils.constants import FETCH_CHUNK_BYTES, FETCH_METRICS_HISTORY, FETCH_POOL_SIZE
+
+
+@dataclass(frozen=True)
+class FetchMetrics:
+    """
+    Timings of one download.
+
+    Args:
+        url: Requested URL
+        status: HTTP status code
+        wire_bytes: Bytes received on the connection (compressed size)
+        body_bytes: Bytes of the decoded body (0 for a 304)
+        encoding: Content-Encoding of the response ('' when identity)
+        ttfb_s: Request start until response headers (connect + server time)
+        transfer_s: Time spent streaming the body
+        fetched_at: When the download finished
+    """
+    url: str
+    status: int
+    wire_bytes: int
+    body_bytes: int
+    encoding: str
+    ttfb_s: float
+    transfer_s: float
+    fetched_at: datetime
+
+    @property
+    def total_s(self) -> float:
+        return self.ttfb_s + self.transfer_s
+
+    @property
+    def throughput_bps(self) -> float:
+        """Wire bytes per second while streaming the body (0 when nothing was streamed)."""
+        return self.wire_bytes / self.transfer_s if self.transfer_s > 0 else 0.0
+
+    def summary(self) -> str:
+        size = f"{self.body_bytes / 1024 ** 2:.2f} MB"
+        if self.encoding:
+            size += f" ({self.encoding} {self.wire_bytes / 1024 ** 2:.2f} MB)"
+        return (
+            f"{size} in {self.total_s:.2f}s "
+            f"(ttfb {self.ttfb_s * 1000:.0f} ms, transfer {self.transfer_s * 1000:.0f} ms, "
+            f"{self.throughput_bps / 1024 ** 2:.1f} MB/s)"
+        )
+
+
+@dataclass(frozen=True)
+class Download:
+    """
+    A completed GET.
+
+    Args:
+        status: HTTP status code (200 or 304)
+        headers: Response headers
+        content: Decoded body (None for a 304)
+        sha256: Hex digest of the body, computed while streaming (None for a 304)
+        metrics: Size and timings of the download
+    """
+    status: int
+    headers: Mapping[str, str]
+    content: Optional[bytes]
+    sha256: Optional[str]
+    metrics: FetchMetrics
+
+
+class HTTPTransport:
+    """
+    Pooled, keep-alive HTTP GETs with streamed bodies and per-download metrics.
+
+    The session is created on first use and shared by every thread (the
+    prefetch scheduler, background revalidation and script runs); requests
+    sessions are safe for concurrent GETs. The pool manager keeps up to
+    pool_size hosts, so the export URL and the host it redirects to
+    (docs.google.com -> *.googleusercontent.com) both stay alive, each with
+    pool_size connections.
+
+    Args:
+        pool_size: Connections kept alive per host
+        chunk_bytes: Streaming chunk size
+        history: Number of recent downloads kept for recent()
+    """
+
+    def __init__(
+        self,
+        pool_size: int = FETCH_POOL_SIZE,
+        chunk_bytes: int = FETCH_CHUNK_BYTES,
+        history: int = FETCH_METRICS_HISTORY,
+    ):
+        self.pool_size = pool_size
+        self.chunk_bytes = chunk_bytes
+        self._session = None
+        self._lock = threading.Lock()
+        self._recent: deque[FetchMetrics] = deque(maxlen=history)
+
+    @property
+    def session(self) -> "requests.Session":
+        with self._lock:
+            if self._session is None:
+                self._session = self._new_session()
+            return self._session
+
+    def _new_session(self) -> "requests.Session":
+        if not requests:
+            raise ImportError("requests library required. Install with: pip install requests")
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_size, pool_maxsize=self.pool_size, max_retries=0
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers.update({"Accept-Encoding": "gzip, deflate", "Connection": "keep-alive"})
+        return session
+
+    def get(
+        self,
+        url: str,
+        headers: Optional[Mapping[str, str]] = None,
+        timeout: float | tuple[float, float] | None = None,
+    ) -> Download:
+        """
+        GET url, streaming a 200 body into memory.
+
+        Args:
+            url: URL to download
+            headers: Extra request headers (e.g. validators)
+            timeout: Seconds, or (connect, read) timeouts
+
+        Returns:
+            Download with the body (None for a 304) and its metrics
+
+        Raises:
+            requests.HTTPError: For 4xx/5xx responses (the body is not read)
+        """
+        started = time.perf_counter()
+        with self.session.get(url, headers=headers, timeout=timeout, stream=True) as response:
+            ttfb_s = time.perf_counter() - started
+            response.raise_for_status()
+
+            content = sha256 = None
+            if response.status_code != 304:
+                content, sha256 = self._read_body(response)
+            transfer_s = time.perf_counter() - started - ttfb_s
+
+            metrics = FetchMetrics(
+                url=url,
+                status=response.status_code,
+                wire_bytes=response.raw.tell(),
+                body_bytes=len(content) if content is not None else 0,
+                encoding=response.headers.get("Content-Encoding", ""),
+                ttfb_s=ttfb_s,
+                transfer_s=transfer_s,
+                fetched_at=datetime.now(),
+            )
+        with self._lock:
+            self._recent.append(metrics)
+        return Download(response.status_code, response.headers, content, sha256, metrics)
+
+    def _read_body(self, response: "requests.Response") -> tuple[bytes, str]:
+        """Stream the (decoded) body, hashing each chunk, and join it once."""
+        chunks = []
+        hasher = hashlib.sha256()
+        for chunk in response.iter_content(self.chunk_bytes):
+            chunks.append(chunk)
+            hasher.update(chunk)
+        # join() sizes the body from the chunk lengths: one allocation, one copy
+        return b"".join(chunks), hasher.hexdigest()
+
+    def recent(self) -> list[FetchMetrics]:
+        """Metrics of the recent downloads, oldest first."""
+        with self._lock:
+            return list(self._recent)
+
+    def last(self) -> Optional[FetchMetrics]:
+        with self._lock:
+            return self._recent[-1] if self._recent else None
+
+    def close(self) -> None:
+        """Close the pooled connections (a new session is opened on next use)."""
+        with self._lock:
+            session, self._session = self._session, None
+        if session is not None:
+            session.close()
+
+
+# Shared by every fetch in the process
+_transport = HTTPTransport()
+
+
+def get_transport() -> HTTPTransport:
+    """The process-wide transport used for Google Sheets downloads."""
+    return _transport
@@ -0,0 +1,227 @@
+"""
+core/unit_delta.py
+---------------------------------------------------------
+Incremental recomputation of derived unit fields.
+Row-hashes the Unit sheet by unit id, recomputes only added
+or changed units, patches the previous enriched frame and
+per-building aggregates, and reports NVM / lifecycle
+transitions for the UI to highlight.
+---------------------------------------------------------
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+from core.data_logic import compute_all_unit_fields
+from core.logger import log_event
+from core.phase_logic import build_building_stats
+
+UNIT_KEY = 'unit_id'
+TRACKED_FIELDS = ['nvm', 'lifecycle_label']
+
+
+@dataclass(frozen=True)
+class UnitDelta:
+    """
+    Result of diffing two versions of the Unit sheet.
+
+    Args:
+        added / changed / removed: Unit ids per kind of row change
+        transitions: [{unit_id, field, before, after}] for nvm / lifecycle_label
+        full_recompute: True when all rows had to be recomputed
+        reason: Why a full recompute was needed (empty for incremental updates)
+    """
+    added: List[Any] = field(default_factory=list)
+    changed: List[Any] = field(default_factory=list)
+    removed: List[Any] = field(default_factory=list)
+    transitions: List[Dict[str, Any]] = field(default_factory=list)
+    full_recompute: bool = False
+    reason: str = ""
+
+    @property
+    def recomputed(self) -> int:
+        return len(self.added) + len(self.changed)
+
+
+@dataclass(frozen=True)
+class DeltaBase:
+    """
+    What the next version is diffed against: row hashes of the raw (renamed)
+    Unit sheet, the frame-level days decisions and the reference day used.
+    """
+    hashes: pd.Series
+    decisions: tuple
+    today: date
+
+
+def row_hashes(units_df: pd.DataFrame, key: str = UNIT_KEY) -> pd.Series:
+    """One uint64 hash per unit row (all columns), indexed by unit id."""
+    hashes = pd.util.hash_pandas_object(units_df, index=False)
+    return pd.Series(hashes.to_numpy(), index=units_df[key].to_numpy())
+
+
+def _keyed(units_df: pd.DataFrame, key: str) -> bool:
+    """True if the frame has a complete, unique unit key."""
+    return key in units_df.columns and units_df[key].notna().all() and units_df[key].is_unique
+
+
+def _frame_decisions(units_df: pd.DataFrame) -> tuple:
+    """
+    Frame-level choices compute_all_unit_fields makes for days_vacant / days_to_be_ready:
+    take them from the sheet (DV / DTBR), or compute them from dates that are all missing.
+    A recomputed subset must make the same choices as the full frame.
+    """
+    decisions = []
+    for days_col, date_col in (('days_vacant', 'move_out'), ('days_to_be_ready', 'move_in')):
+        from_sheet = days_col in units_df.columns and not units_df[days_col].isna().all()
+        dates_missing = (
+            date_col not in units_df.columns
+            or pd.to_datetime(units_df[date_col], errors='coerce').isna().all()
+        )
+        decisions.append((from_sheet, from_sheet or dates_missing))
+    return tuple(decisions)
+
+
+def make_delta_base(
+    units_raw: pd.DataFrame, today: date, key: str = UNIT_KEY
+) -> Optional[DeltaBase]:
+    """Capture the diff base for a raw Unit frame (None if it has no usable key)."""
+    if not _keyed(units_raw, key):
+        return None
+    return DeltaBase(
+        hashes=row_hashes(units_raw, key), decisions=_frame_decisions(units_raw), today=today
+    )
+
+
+def diff_transitions(
+    previous: pd.DataFrame,
+    current: pd.DataFrame,
+    key: str = UNIT_KEY,
+    fields: Optional[List[str]] = None,
+) -> List[Dict[str, Any]]:
+    """List units whose tracked fields differ between two enriched frames."""
+    fields = fields or TRACKED_FIELDS
+    if not (_keyed(previous, key) and _keyed(current, key)):
+        return []
+
+    cols = [c for c in fields if c in previous.columns and c in current.columns]
+    joined = previous[[key] + cols].merge(
+        current[[key] + cols], on=key, suffixes=('_before', '_after')
+    )
+
+    transitions: List[Dict[str, Any]] = []
+    for col in cols:
+        before, after = joined[f'{col}_before'], joined[f'{col}_after']
+        moved = before.ne(after) & ~(before.isna() & after.isna())
+        for unit_id, b, a in zip(joined.loc[moved, key], before[moved], after[moved]):
+            transitions.append({'unit_id': unit_id, 'field': col, 'before': b, 'after': a})
+    return transitions
+
+
+def patch_building_stats(
+    previous_stats: pd.DataFrame,
+    previous_enriched: pd.DataFrame,
+    enriched: pd.DataFrame,
+    delta: UnitDelta,
+    key: str = UNIT_KEY,
+) -> pd.DataFrame:
+    """
+    Recompute per-building aggregates only for buildings touched by the delta.
+
+    Touched buildings are those holding added or changed units in the new frame,
+    and changed or removed units in the previous one (units can move buildings).
+    """
+    if delta.full_recompute:
+        return build_building_stats(enriched, phase_col='phase', building_col='building')
+
+    def locations(frame: pd.DataFrame, ids: List[Any]) -> pd.DataFrame:
+        return frame.loc[frame[key].isin(ids), ['phase', 'building']]
+
+    touched = pd.concat([
+        locations(enriched, delta.added + delta.changed),
+        locations(previous_enriched, delta.changed + delta.removed),
+    ]).dropna().drop_duplicates()
+    if touched.empty:
+        return previous_stats
+
+    touched_keys = pd.MultiIndex.from_frame(touched)
+    in_touched = pd.MultiIndex.from_frame(enriched[['phase', 'building']]).isin(touched_keys)
+    refreshed = build_building_stats(
+        enriched[in_touched], phase_col='phase', building_col='building'
+    )
+    kept = previous_stats[~previous_stats.index.isin(touched_keys)]
+    return pd.concat([kept, refreshed]).sort_index(key=lambda idx: idx.map(str))
+
+
+def apply_unit_delta(
+    base: DeltaBase,
+    previous_enriched: pd.DataFrame,
+    new_raw: pd.DataFrame,
+    today: date,
+    key: str = UNIT_KEY,
+) -> tuple[pd.DataFrame, UnitDelta]:
+    """
+    Enrich new_raw by recomputing only rows that changed since the diff base.
+
+    Falls back to a full compute_all_unit_fields when the day changed, the key is
+    not usable, or the DV / DTBR decisions differ between the two versions or for
+    the recomputed subset (see _frame_decisions).
+
+    Returns:
+        (enriched frame in new_raw row order, UnitDelta)
+    """
+    def full(reason: str) -> tuple[pd.DataFrame, UnitDelta]:
+        enriched = compute_all_unit_fields(new_raw, today=today)
+        delta = UnitDelta(
+            added=list(new_raw[key]) if key in new_raw.columns else [],
+            transitions=diff_transitions(previous_enriched, enriched, key),
+            full_recompute=True,
+            reason=reason,
+        )
+        log_event("INFO", f"Full unit recompute ({reason}): {len(delta.transitions)} transitions")
+        return enriched, delta
+
+    if today != base.today:
+        return full("reference day changed")
+    if not (_keyed(new_raw, key) and _keyed(previous_enriched, key)):
+        return full(f"'{key}' missing or not unique")
+    decisions = _frame_decisions(new_raw)
+    if decisions != base.decisions:
+        return full("days source changed")
+
+    new_hashes = row_hashes(new_raw, key)
+    old_hashes = base.hashes
+    common = new_hashes.index.intersection(old_hashes.index)
+    changed = common[new_hashes[common].to_numpy() != old_hashes[common].to_numpy()]
+    added = new_hashes.index.difference(old_hashes.index)
+    removed = old_hashes.index.difference(new_hashes.index)
+    recompute_ids = changed.append(added)
+
+    new_by_key = new_raw.set_index(key, drop=False).rename_axis(None)
+    to_recompute = new_by_key.loc[recompute_ids]
+    if len(recompute_ids) and _frame_decisions(to_recompute) != decisions:
+        return full("days source differs for the changed rows")
+
+    prev_by_key = previous_enriched.set_index(key, drop=False).rename_axis(None)
+    parts = [prev_by_key.loc[new_hashes.index.difference(recompute_ids)]]
+    if len(recompute_ids):
+        parts.append(compute_all_unit_fields(to_recompute, today=today))
+    enriched = pd.concat(parts).loc[new_raw[key].to_numpy()].reset_index(drop=True)
+
+    delta = UnitDelta(
+        added=list(added),
+        changed=list(changed),
+        removed=list(removed),
+        transitions=diff_transitions(previous_enriched, enriched, key),
+    )
+    log_event(
+        "INFO",
+        f"Incremental unit update: {len(added)} added, {len(changed)} changed, "
+        f"{len(removed)} removed, {len(delta.transitions)} transitions",
+    )
+    return enriched, delta
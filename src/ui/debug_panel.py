@@ -0,0 +1,78 @@
+"""
+ui/debug_panel.py
+---------------------------------------------------------
+Optional sidebar debug panel with per-rerun stage timings,
+the shared snapshot's memory by column and recent
+Google Sheets downloads (network time vs. the rest).
+Enabled with DMRB_PROFILE=1 or the ?profile=1 query param;
+the summary is also written to the log when enabled.
+---------------------------------------------------------
+"""
+
+import os
+from typing import Optional
+
+import streamlit as st
+
+from core.logger import log_event
+from core.schema import format_bytes
+from core.transport import get_transport
+from utils.profiler import RerunProfile
+
+PROFILE_ENV = "DMRB_PROFILE"
+
+
+def profiling_enabled() -> bool:
+    """True when the debug panel was requested via environment or query param."""
+    if os.environ.get(PROFILE_ENV, "").lower() in ("1", "true", "yes"):
+        return True
+    try:
+        return st.query_params.get("profile") == "1"
+    except Exception:
+        return False
+
+
+def render_profiler_panel(profile: Optional[RerunProfile], snapshot=None) -> None:
+    """
+    Log the rerun profile and show it in a sidebar expander (when enabled).
+    
+    Args:
+        profile: Finished profile from utils.profiler.end_rerun()
+        snapshot: Optional EnrichedSnapshot whose memory report is shown
+    """
+    if profile is None or not profiling_enabled():
+        return
+    
+    log_event("INFO", profile.summary())
+    
+    with st.sidebar:
+        with st.expander("🐞 Rerun Timings", expanded=False):
+            st.caption(f"**{profile.page}** rerun: {profile.total_s * 1000:.0f} ms")
+            st.dataframe(profile.rows(), hide_index=True, width='stretch')
+            st.caption("Cached calls don't appear; ms include nested stages.")
+        
+        if snapshot is not None:
+            report = snapshot.memory_report()
+            with st.expander("🧠 Snapshot Memory", expanded=False):
+                st.caption(f"Shared by all sessions: {format_bytes(report['kb'].sum() * 1024)}")
+                st.dataframe(report, hide_index=True, width='stretch')
+        
+        downloads = get_transport().recent()
+        if downloads:
+            with st.expander("🌐 Downloads", expanded=False):
+                st.caption(f"Last: {downloads[-1].summary()}")
+                st.dataframe(
+                    [
+                        {
+                            "at": m.fetched_at.strftime("%H:%M:%S"),
+                            "status": m.status,
+                            "size": format_bytes(m.body_bytes),
+                            "ttfb ms": round(m.ttfb_s * 1000),
+                            "transfer ms": round(m.transfer_s * 1000),
+                            "MB/s": round(m.throughput_bps / 1024 ** 2, 1),
+                        }
+                        for m in reversed(downloads)
+                    ],
+                    hide_index=True,
+                    width='stretch',
+                )
@@ -7,50 +7,42 @@ Renders nested collapsible sections for data exploration.
 """
 
 import streamlit as st
-from utils.constants import NVM_EMOJI_MAP
+from utils.constants import NVM_EMOJI_MAP, UNITS_PAGE_SIZE
+from utils.profiler import profiled
 
-def render_unit_row(unit: dict) -> None:
-    """
-    Render a single, compact unit row with Nvm and Lifecycle Status.
+# Lifecycle status emoji mapping
+LIFECYCLE_EMOJI_MAP = {
+    'Ready': '✅',
+    'In Turn': '🔧',
+    'Not Ready': '⚠️'
+}
 
-    Args:
-        unit: Dictionary with keys: unit_num, status_emoji, move_out_str, days_vacant,
-              move_in_str, days_to_be_ready, nvm, lifecycle_label
-    """
-    nvm_text = unit.get('nvm', '—')
-    nvm_normalized = str(nvm_text).lower().strip()
-    nvm_emoji = NVM_EMOJI_MAP.get(nvm_normalized, '🟢')
+# Separators placed between rows by render_unit_rows
+HAIRLINE_HTML = '<div class="hairline"></div>'
+RULE_HTML = '<hr>'
 
-    # Lifecycle status emoji mapping
-    lifecycle_label = unit.get('lifecycle_label', 'Not Ready')
-    lifecycle_emoji_map = {
-        'Ready': '✅',
-        'In Turn': '🔧',
-        'Not Ready': '⚠️'
-    }
-    lifecycle_emoji = lifecycle_emoji_map.get(lifecycle_label, '⚠️')
-
-    st.markdown(f"""
+# Unit row markup, compiled once (str.format bound method)
+_UNIT_ROW_HTML = """
 <div class='unit-card'>
   <div class='row-grid' style='grid-template-columns: 1.1fr 1fr 0.9fr 1fr 0.9fr 1fr 1fr;'>
     <div>
-      <div class='meta-value'>{unit['unit_num']}</div>
+      <div class='meta-value'>{unit_num}</div>{task_line}
     </div>
     <div style='text-align:center;'>
       <div class='meta-label'>Move Out</div>
-      <div class='meta-value' style='font-weight:600;'>{unit['move_out_str']}</div>
+      <div class='meta-value' style='font-weight:600;'>{move_out_str}</div>
     </div>
     <div style='text-align:center;'>
       <div class='meta-label'>Days Vac</div>
-      <div class='meta-value'>{unit['days_vacant']}</div>
+      <div class='meta-value'>{days_vacant}</div>
     </div>
     <div style='text-align:center;'>
       <div class='meta-label'>Move In</div>
-      <div class='meta-value' style='font-weight:600;'>{unit['move_in_str']}</div>
+      <div class='meta-value' style='font-weight:600;'>{move_in_str}</div>
     </div>
     <div style='text-align:center;'>
       <div class='meta-label'>Days to be Rented</div>
-      <div class='meta-value'>{unit['days_to_be_ready']}</div>
+      <div class='meta-value'>{days_to_be_ready}</div>
     </div>
     <div style='text-align:center;'>
       <div class='meta-label'>Nvm</div>
@@ -62,7 +54,86 @@ def render_unit_row(unit: dict) -> None:
     </div>
   </div>
 </div>
-""", unsafe_allow_html=True)
+""".format
+
+
+def unit_row_html(unit: dict) -> str:
+    """
+    Build the HTML for one compact unit row with Nvm and Lifecycle Status.
+
+    Args:
+        unit: Dictionary with keys: unit_num, status_emoji, move_out_str, days_vacant,
+              move_in_str, days_to_be_ready, nvm, lifecycle_label
+              (optional task_summary is shown under the unit number)
+    """
+    task_summary = unit.get('task_summary')
+    nvm_text = unit.get('nvm', '—')
+    lifecycle_label = unit.get('lifecycle_label', 'Not Ready')
+    return _UNIT_ROW_HTML(
+        unit_num=unit['unit_num'],
+        task_line=f"<div class='meta-label'>{task_summary}</div>" if task_summary else '',
+        move_out_str=unit['move_out_str'],
+        days_vacant=unit['days_vacant'],
+        move_in_str=unit['move_in_str'],
+        days_to_be_ready=unit['days_to_be_ready'],
+        nvm_emoji=NVM_EMOJI_MAP.get(str(nvm_text).lower().strip(), '🟢'),
+        nvm_text=nvm_text,
+        lifecycle_emoji=LIFECYCLE_EMOJI_MAP.get(lifecycle_label, '⚠️'),
+        lifecycle_label=lifecycle_label,
+    )
+
+
+def render_unit_row(unit: dict) -> None:
+    """
+    Render a single, compact unit row with Nvm and Lifecycle Status.
+
+    Args:
+        unit: Dictionary with keys: unit_num, status_emoji, move_out_str, days_vacant,
+              move_in_str, days_to_be_ready, nvm, lifecycle_label
+    """
+    st.markdown(unit_row_html(unit), unsafe_allow_html=True)
+
+
+@profiled()
+def render_unit_rows(units: list, separator: str = HAIRLINE_HTML) -> None:
+    """
+    Render a list of unit rows as a single Streamlit element.
+
+    Args:
+        units: Unit dictionaries (see render_unit_row)
+        separator: HTML placed between rows (HAIRLINE_HTML, RULE_HTML or "")
+    """
+    if not units:
+        return
+    rows = f"\n{separator}\n".join(unit_row_html(unit) for unit in units)
+    st.markdown(rows, unsafe_allow_html=True)
+
+
+def render_pager(total: int, key: str, page_size: int = UNITS_PAGE_SIZE) -> slice:
+    """
+    Render a page selector when a list is longer than one page.
+
+    Args:
+        total: Number of rows in the list
+        key: Unique widget key for the page selector
+        page_size: Rows per page (default: UNITS_PAGE_SIZE)
+
+    Returns:
+        Slice of the rows to render on the selected page.
+    """
+    if page_size <= 0 or total <= page_size:
+        return slice(0, total)
+
+    pages = (total + page_size - 1) // page_size
+    # Data refreshes can shrink the list below the remembered page
+    if st.session_state.get(key, 1) > pages:
+        st.session_state[key] = pages
+    page = st.number_input("Page", min_value=1, max_value=pages, value=1, step=1, key=key)
+
+    start = (int(page) - 1) * page_size
+    stop = min(start + page_size, total)
+    st.caption(f"Showing {start + 1}–{stop} of {total} units (page {int(page)} of {pages})")
+    return slice(start, stop)
 
 def render_building_expander(building: dict, expanded: bool = False) -> None:
     """
@@ -81,8 +152,7 @@ def render_building_expander(building: dict, expanded: bool = False) -> None:
         # Vacant units section
         if building.get('vacant_units'):
             with st.expander(f"🟢 Vacant Units ({len(building['vacant_units'])})", expanded=False):
-                for unit in building['vacant_units']:
-                    render_unit_row(unit)
+                render_unit_rows(building['vacant_units'], separator="")
         else:
             st.markdown("---")
 
@@ -95,6 +165,7 @@ def render_building_expander(building: dict, expanded: bool = False) -> None:
             else:
                 st.markdown("---")
 
+@profiled()
 def render_phase_expander(phase: dict, expanded: bool = False) -> None:
     """
     Render a phase expander with buildings.
@@ -110,6 +181,6 @@ def render_phase_expander(phase: dict, expanded: bool = False) -> None:
 
                 # Divider between buildings (not after last)
                 if idx < len(phase['buildings']) - 1:
-                    st.markdown('<div class="hairline"></div>', unsafe_allow_html=True)
+                    st.markdown(HAIRLINE_HTML, unsafe_allow_html=True)
         else:
             st.markdown("---")
@@ -16,6 +16,8 @@ except ImportError:
 
 from core.datasource import clear_data_cache, get_last_updated, get_data_source_info
 from core.logger import log_event
+from core.properties import Property, get_property, load_properties
+from core.snapshot_service import Freshness
 
 
 def render_refresh_controls(key_prefix: str = "main", auto_refresh: bool = True):
@@ -54,6 +56,33 @@ def render_refresh_controls(key_prefix: str = "main", auto_refresh: bool = True)
         st.caption("⚠️ Install streamlit-autorefresh for auto-refresh")
 
 
+def render_property_selector(key_prefix: str = "main") -> Property:
+    """
+    Render the property picker (only when several properties are configured).
+    
+    The choice is kept in session state, so every page shows the same property.
+    
+    Args:
+        key_prefix: Unique key prefix for this instance
+    
+    Returns:
+        The selected property (the only one for single-property deployments)
+    """
+    properties = load_properties()
+    if len(properties) > 1:
+        keys = [prop.key for prop in properties]
+        names = {prop.key: prop.name for prop in properties}
+        current = st.session_state.get("property_key")
+        st.session_state.property_key = st.selectbox(
+            "🏘️ Property",
+            keys,
+            index=keys.index(current) if current in keys else 0,
+            format_func=names.get,
+            key=f"{key_prefix}_property",
+        )
+    return get_property(st.session_state.get("property_key"))
+
+
 def render_compact_refresh(key_prefix: str = "compact"):
     """
     Render compact refresh controls (button only).
@@ -68,6 +97,24 @@ def render_compact_refresh(key_prefix: str = "compact"):
         st.rerun()
 
 
+def render_staleness_badge(freshness: Freshness):
+    """
+    Render a small badge when the page shows stale data (nothing when fresh).
+    
+    Args:
+        freshness: Result of core.snapshot_service.snapshot_freshness()
+    """
+    if not freshness.stale:
+        return
+    as_of = (
+        f"from {freshness.as_of.strftime('%m/%d %H:%M')}" if freshness.as_of else "saved earlier"
+    )
+    st.markdown(
+        f"<div class='stale-badge'>⏳ Showing data {as_of} — {freshness.detail}</div>",
+        unsafe_allow_html=True,
+    )
+
+
 def render_last_updated_banner():
     """Render a banner showing last update time at top of page."""
     last_updated = get_last_updated()
@@ -10,6 +10,8 @@ import streamlit as st
 from typing import Callable, Any
 from dataclasses import dataclass
 
+from utils.profiler import profiled, stage
+
 
 @dataclass
 class Tab:
@@ -41,9 +43,12 @@ class TabRow:
     Args:
         tabs: List of Tab objects
         key: Unique key for this tab row
+        lazy: Only run the selected tab's render function; the selection
+              is kept in session state under `key` and switching tabs reruns
     """
     tabs: list[Tab]
     key: str
+    lazy: bool = False
 
 
 @dataclass
@@ -76,17 +81,23 @@ def render_tab_row(tab_row: TabRow, context: dict, section_id: str = "") -> None
     """
     # Create tabs
     tab_labels = [tab.display_label for tab in tab_row.tabs]
-    streamlit_tabs = st.tabs(tab_labels)
+    if tab_row.lazy:
+        streamlit_tabs = st.tabs(tab_labels, key=tab_row.key, on_change="rerun")
+    else:
+        streamlit_tabs = st.tabs(tab_labels)
     
-    # Render each tab
+    # Render each tab (lazy rows: only the selected one)
     for tab, streamlit_tab in zip(tab_row.tabs, streamlit_tabs):
-        with streamlit_tab:
+        if tab_row.lazy and not streamlit_tab.open:
+            continue
+        with streamlit_tab, stage(f"tab: {tab.label}"):
             try:
                 tab.render(context)
             except Exception as e:
                 st.error(f"Error rendering tab '{tab.label}': {e}")
 
 
+@profiled()
 def render_section(section: Section, context: dict) -> None:
     """
     Render a complete section with all its tab rows.
@@ -133,7 +144,8 @@ def create_simple_section(
     title: str,
     icon: str,
     tabs: list[tuple[str, Callable]],
-    section_id: str = None
+    section_id: str = None,
+    lazy: bool = False
 ) -> Section:
     """
     Create a simple section with one row of tabs.
@@ -143,6 +155,7 @@ def create_simple_section(
         icon: Section icon/emoji
         tabs: List of (label, render_function) tuples
         section_id: Optional section ID (auto-generated if None)
+        lazy: Render only the selected tab (see TabRow)
     
     Returns:
         Section object ready to render
@@ -165,7 +178,7 @@ def create_simple_section(
         for label, render_fn in tabs
     ]
     
-    tab_row = TabRow(tabs=tab_objects, key=f"{section_id}_row")
+    tab_row = TabRow(tabs=tab_objects, key=f"{section_id}_row", lazy=lazy)
     
     return Section(
         id=section_id,
@@ -179,7 +192,8 @@ def create_multi_row_section(
     title: str,
     icon: str,
     rows: list[list[tuple[str, Callable]]],
-    section_id: str = None
+    section_id: str = None,
+    lazy: bool = False
 ) -> Section:
     """
     Create a section with multiple rows of tabs.
@@ -189,6 +203,7 @@ def create_multi_row_section(
         icon: Section icon/emoji
         rows: List of rows, each row is a list of (label, render_function) tuples
         section_id: Optional section ID
+        lazy: Render only the selected tab of each row (see TabRow)
     
     Returns:
         Section object
@@ -213,7 +228,7 @@ def create_multi_row_section(
                 render=render_fn)
             for label, render_fn in row_tabs
         ]
-        tab_rows.append(TabRow(tabs=tab_objects, key=f"{section_id}_row_{row_idx}"))
+        tab_rows.append(TabRow(tabs=tab_objects, key=f"{section_id}_row_{row_idx}", lazy=lazy))
     
     return Section(
         id=section_id,
@@ -5,9 +5,40 @@ Task rendering components for Walk Today section.
 ---------------------------------------------------------
 """
 
-import streamlit as st
+from datetime import date
 from typing import Dict, List
 
+import pandas as pd
+import streamlit as st
+
+from core.task_logic import TaskHierarchy, TaskIndex
+from utils.profiler import profiled
+
+# Task unit row markup, compiled once; the grid mirrors the former st.columns([1, 2, 1.5, 1])
+_TASK_ROW_HTML = (
+    "<div class='row-grid' style='grid-template-columns: 1fr 2fr 1.5fr 1fr;'>"
+    "<div><small><strong>Unit {unit}</strong></small></div>"
+    "<div><small>{unit_id}</small></div>"
+    "<div><small>Vendor: {vendor}</small></div>"
+    "<div><small>Status: {status}</small></div>"
+    "</div>"
+).format
+
+
+def task_unit_row_html(unit_data: dict) -> str:
+    """
+    Build the HTML for one unit row of a task group.
+
+    Args:
+        unit_data: Dict with keys: unit, unit_id, vendor, status
+    """
+    return _TASK_ROW_HTML(
+        unit=unit_data.get('unit', 'N/A'),
+        unit_id=unit_data.get('unit_id', '—'),
+        vendor=unit_data.get('vendor', '—'),
+        status=unit_data.get('status', '—'),
+    )
+
 
 def render_task_unit_row(unit_data: dict) -> None:
     """
@@ -16,71 +47,84 @@ def render_task_unit_row(unit_data: dict) -> None:
     Args:
         unit_data: Dict with keys: unit, unit_id, vendor, status
     """
-    col1, col2, col3, col4 = st.columns([1, 2, 1.5, 1])
-    
-    with col1:
-        st.markdown(f"<small><strong>Unit {unit_data.get('unit', 'N/A')}</strong></small>", unsafe_allow_html=True)
-    
-    with col2:
-        st.markdown(f"<small>{unit_data.get('unit_id', '—')}</small>", unsafe_allow_html=True)
-    
-    with col3:
-        st.markdown(f"<small>Vendor: {unit_data.get('vendor', '—')}</small>", unsafe_allow_html=True)
-    
-    with col4:
-        st.markdown(f"<small>Status: {unit_data.get('status', '—')}</small>", unsafe_allow_html=True)
+    st.markdown(task_unit_row_html(unit_data), unsafe_allow_html=True)
+
 
+def render_task_unit_rows(units: List[Dict]) -> None:
+    """
+    Render all unit rows of a task group as a single element, separated by rules.
 
-def render_task_hierarchy(task_name: str, hierarchy: Dict[str, Dict[str, List[Dict]]]) -> None:
+    Args:
+        units: List of dicts with keys: unit, unit_id, vendor, status
+    """
+    if not units:
+        return
+    st.markdown("\n\n<hr>\n\n".join(task_unit_row_html(u) for u in units), unsafe_allow_html=True)
+
+
+def render_task_hierarchy(task_name: str, hierarchy: TaskHierarchy) -> None:
     """
     Render task hierarchy: Phase → Building → Unit.
     
     Args:
         task_name: Name of the task type
-        hierarchy: Nested dict {phase: {building: [units]}}
+        hierarchy: core.task_logic.TaskHierarchy (sorted, totals precomputed)
     """
     if not hierarchy:
         st.info(f"No {task_name} tasks to walk today")
         return
     
-    total_units = sum(len(units) for phase_data in hierarchy.values() for units in phase_data.values())
-    
-    with st.expander(f"🔧 {task_name} — {total_units} units", expanded=False):
-        for phase in sorted(hierarchy.keys()):
-            phase_data = hierarchy[phase]
-            phase_total = sum(len(units) for units in phase_data.values())
+    with st.expander(f"🔧 {task_name} — {hierarchy.total} units", expanded=False):
+        for phase in hierarchy.phases:
+            st.markdown(f"**🧱 Phase {phase.phase}** — {phase.total} units")
             
-            st.markdown(f"**🧱 Phase {phase}** — {phase_total} units")
-            
-            for building in sorted(phase_data.keys()):
-                units = phase_data[building]
-                
-                with st.expander(f"🏢 Building {building} — {len(units)} units", expanded=False):
-                    for idx, unit_data in enumerate(units):
-                        render_task_unit_row(unit_data)
-                        if idx < len(units) - 1:
-                            st.divider()
+            for building in phase.buildings:
+                label = f"🏢 Building {building.building} — {building.total} units"
+                with st.expander(label, expanded=False):
+                    render_task_unit_rows(building.units)
             
             st.divider()
 
 
-def render_all_tasks(tasks_by_type: Dict[str, any], units_df: any) -> None:
+@profiled()
+def render_all_tasks(task_hierarchies: Dict[str, TaskHierarchy]) -> None:
     """
     Render all task types in one main expander.
     
     Args:
-        tasks_by_type: Dict mapping task type to DataFrame
-        units_df: Units DataFrame for context
+        task_hierarchies: Dict mapping task type to its TaskHierarchy
+                          (see core.task_logic.TaskIndex.hierarchies_for)
     """
-    from core.task_logic import group_tasks_by_hierarchy
-    
-    total_tasks = sum(len(df) for df in tasks_by_type.values())
+    total_tasks = sum(hierarchy.task_rows for hierarchy in task_hierarchies.values())
     
     with st.expander(f"✅ Tasks to Walk Today — {total_tasks} total", expanded=True):
-        if not tasks_by_type:
+        if not task_hierarchies:
             st.info("No tasks to walk today")
             return
         
-        for task_name, tasks_df in tasks_by_type.items():
-            hierarchy = group_tasks_by_hierarchy(tasks_df)
+        for task_name, hierarchy in task_hierarchies.items():
             render_task_hierarchy(task_name, hierarchy)
+
+
+def render_task_calendar(task_index: TaskIndex, start: date, end: date) -> None:
+    """
+    Render task counts per day and task type for a date range (inclusive).
+    
+    Args:
+        task_index: TaskIndex for the current data version
+        start: First day of the range
+        end: Last day of the range
+    """
+    counts = task_index.task_counts(start, end, by=('task_type',))
+    if counts.empty:
+        st.info("No tasks scheduled in this range")
+        return
+    
+    calendar = counts.pivot_table(
+        index='Date', columns='Task Type', values='Tasks',
+        aggfunc='sum', fill_value=0, observed=True,
+    )
+    calendar = calendar.reindex(pd.date_range(start, end, freq='D'), fill_value=0)
+    calendar.index = calendar.index.strftime('%a %m/%d')
+    calendar['Total'] = calendar.sum(axis=1)
+    st.dataframe(calendar, width='stretch')
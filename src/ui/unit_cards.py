@@ -77,3 +77,28 @@ def render_unit_kpi_cards(metrics: dict) -> None:
 
     with col9:
         st.metric("Vacancy %", f"{metrics.get('vacancy_pct', 0):.1f}%")
+
+
+def render_unit_changes(transitions: list[dict]) -> None:
+    """
+    Highlight units whose NVM or lifecycle status changed since the previous data version.
+
+    Args:
+        transitions: List of dicts with keys unit_id, field, before, after
+    """
+    if not transitions:
+        return
+
+    field_labels = {'nvm': 'Nvm', 'lifecycle_label': 'Lifecycle'}
+    lines = []
+    for change in transitions:
+        before = change.get('before') or '—'
+        after = change.get('after') or '—'
+        nvm_emoji = ''
+        if change.get('field') == 'nvm':
+            nvm_emoji = NVM_EMOJI_MAP.get(str(after).lower().strip(), '')
+        label = field_labels.get(change.get('field'), change.get('field'))
+        lines.append(f"- **{change.get('unit_id')}** · {label}: {before} → {nvm_emoji} {after}")
+
+    with st.expander(f"🔔 Status Changes Since Last Refresh ({len(transitions)})", expanded=False):
+        st.markdown("\n".join(lines))
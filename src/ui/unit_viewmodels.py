@@ -1,47 +1,127 @@
 """
 ui/unit_viewmodels.py
 ---------------------------------------------------------
-Transforms raw unit rows into dictionaries consumed by
-ui/unit_cards.render_enhanced_unit_row, centralizing view-model shaping.
+Columnar view models for the unit rows rendered by
+ui/expanders.render_unit_rows on the Units page. The table
+is built once per data version (formatted dates, day
+strings, emoji, task summaries) and renderers only index
+into it, centralizing view-model shaping.
 ---------------------------------------------------------
 """
 
 from __future__ import annotations
 
+from typing import Any, Dict, List, Optional
+
+import numpy as np
 import pandas as pd
 
+from core.phase_logic import iter_unit_records
+from core.task_logic import TASK_SUMMARY_COLUMNS
+from utils.helpers import fmt_dates
+from utils.profiler import profiled
+
+# Lifecycle status → row emoji / readiness (unknown labels: 🏠, 0%)
+LIFECYCLE_STATUS_EMOJI = {'Ready': '✅', 'In Turn': '🔧', 'Not Ready': '⚠️'}
+LIFECYCLE_READINESS_PCT = {'Ready': 100, 'In Turn': 50}
+
+# Record keys, in order ('*_str' / 'unit_num' / 'days_to_be_ready' are the
+# render_unit_row names of the same values)
+VIEWMODEL_COLUMNS = [
+    'unit_id', 'unit_num', 'status_emoji',
+    'move_out', 'move_out_str', 'move_in', 'move_in_str',
+    'days_vacant', 'days_to_ready', 'days_to_be_ready',
+    'readiness_pct', 'nvm', 'lifecycle_label',
+] + TASK_SUMMARY_COLUMNS + ['task_summary']
+
+
+def _day_strings(values: pd.Series) -> np.ndarray:
+    """Whole-day counts as strings, '—' where missing."""
+    days = pd.to_numeric(values, errors='coerce')
+    out = np.full(len(days), '—', dtype=object)
+    known = days.notna().to_numpy()
+    out[known] = days[known].astype('int64').astype(str).to_numpy(dtype=object)
+    return out
+
+
+def _date_strings(units_df: pd.DataFrame, col: str) -> pd.Series:
+    if col not in units_df.columns:
+        return pd.Series('—', index=units_df.index, dtype=object)
+    dates = units_df[col]
+    if not pd.api.types.is_datetime64_any_dtype(dates):
+        dates = pd.to_datetime(dates, errors='coerce')
+    return fmt_dates(dates)
+
+
+def _task_summary_labels(frame: pd.DataFrame) -> np.ndarray:
+    """'🧰 Paint 10/21 · 4 tasks' per unit ('' for units without tasks)."""
+    count = frame['tasks_scheduled'].to_numpy()
+    next_task = frame['next_task'].to_numpy(dtype=object)
+    labels = np.full(len(frame), '', dtype=object)
+    for i in np.flatnonzero(count > 0):
+        noun = 'task' if count[i] == 1 else 'tasks'
+        counted = f"{count[i]} {noun}"
+        labels[i] = f"🧰 {next_task[i]} · {counted}" if next_task[i] else f"🧰 {counted}"
+    return labels
 
-def build_enhanced_unit(row: pd.Series, tasks_df: pd.DataFrame) -> dict:
+
+@profiled()
+def build_unit_viewmodels(
+    units_df: pd.DataFrame, task_summaries: Optional[pd.DataFrame] = None
+) -> pd.DataFrame:
     """
-    Shape a unit row + optional tasks context into a compact view model.
+    Shape every unit row (plus its task summary) into a view-model table.
+
     Inputs are expected to include: unit_id, move_in, move_out, days_vacant,
-    days_to_be_ready, lifecycle_label, nvm.
+    days_to_be_ready, lifecycle_label, nvm. task_summaries comes from
+    core.task_logic.build_task_summaries and is joined on the stripped unit_id.
+
+    Returns:
+        DataFrame with VIEWMODEL_COLUMNS, indexed like units_df.
     """
-    unit_id = str(row.get('unit_id', ''))  # Full path
-    lifecycle = row.get('lifecycle_label', 'Unknown')
-    status_emoji_map = {'Ready': '✅', 'In Turn': '🔧', 'Not Ready': '⚠️'}
-    status_emoji = status_emoji_map.get(lifecycle, '🏠')
-    readiness_pct = 100 if lifecycle == 'Ready' else 50 if lifecycle == 'In Turn' else 0
-
-    days_vacant = row.get('days_vacant')
-    days_vacant_str = str(int(days_vacant)) if pd.notna(days_vacant) and days_vacant != '' else '—'
-
-    days_to_ready = row.get('days_to_be_ready')
-    days_to_ready_str = str(int(days_to_ready)) if pd.notna(days_to_ready) and days_to_ready != '' else '—'
-
-    return {
-        'unit_id': unit_id,  # Full path (for Units page)
-        'unit_num': unit_id,  # Also as unit_num (for render_unit_row compatibility)
-        'status_emoji': status_emoji,
-        'move_out': row.get('move_out', pd.NaT).strftime('%m/%d/%y') if pd.notna(row.get('move_out')) else '—',
-        'move_out_str': row.get('move_out', pd.NaT).strftime('%m/%d/%y') if pd.notna(row.get('move_out')) else '—',  # Compatible key
-        'move_in': row.get('move_in', pd.NaT).strftime('%m/%d/%y') if pd.notna(row.get('move_in')) else '—',
-        'move_in_str': row.get('move_in', pd.NaT).strftime('%m/%d/%y') if pd.notna(row.get('move_in')) else '—',  # Compatible key
-        'days_vacant': days_vacant_str,
-        'days_to_ready': days_to_ready_str,
-        'days_to_be_ready': days_to_ready_str,  # Compatible key
+    index = units_df.index
+
+    def column(col: str, default: Any) -> pd.Series:
+        if col in units_df.columns:
+            return units_df[col].astype(object)
+        return pd.Series(default, index=index, dtype=object)
+
+    unit_id = column('unit_id', '').map(str)  # Full path
+    lifecycle = column('lifecycle_label', 'Unknown')
+    readiness_pct = lifecycle.map(lambda label: LIFECYCLE_READINESS_PCT.get(label, 0))
+    readiness_pct = readiness_pct.astype('int64')
+    move_out = _date_strings(units_df, 'move_out')
+    move_in = _date_strings(units_df, 'move_in')
+    days_vacant = _day_strings(column('days_vacant', None))
+    days_to_ready = _day_strings(column('days_to_be_ready', None))
+
+    frame = pd.DataFrame({
+        'unit_id': unit_id,
+        'unit_num': unit_id,
+        'status_emoji': lifecycle.map(lambda label: LIFECYCLE_STATUS_EMOJI.get(label, '🏠')),
+        'move_out': move_out,
+        'move_out_str': move_out,
+        'move_in': move_in,
+        'move_in_str': move_in,
+        'days_vacant': days_vacant,
+        'days_to_ready': days_to_ready,
+        'days_to_be_ready': days_to_ready,
         'readiness_pct': readiness_pct,
-        'nvm': row.get('nvm', '—'),
-        'lifecycle_label': lifecycle  # Add lifecycle_label for render_unit_row
-    }
+        'nvm': column('nvm', '—'),
+        'lifecycle_label': lifecycle,
+        'unit_key': unit_id.str.strip(),
+    }, index=index)
+
+    if task_summaries is None:
+        task_summaries = pd.DataFrame(columns=TASK_SUMMARY_COLUMNS)
+    frame = frame.join(task_summaries[TASK_SUMMARY_COLUMNS], on='unit_key')
+    frame['tasks_scheduled'] = frame['tasks_scheduled'].fillna(0).astype('int64')
+    for col in ('next_task', 'task_status', 'task_vendor'):
+        frame[col] = frame[col].astype(object).fillna('')
+    frame['task_summary'] = _task_summary_labels(frame)
+    return frame[VIEWMODEL_COLUMNS]
+
 
+def unit_records(viewmodels: pd.DataFrame, units: pd.DataFrame) -> List[Dict[str, Any]]:
+    """View-model dicts for the given unit rows (a filtered / paged slice of the units frame)."""
+    return list(iter_unit_records(viewmodels.loc[units.index]))
@@ -5,16 +5,38 @@ These values define required sheets, refresh rates, and common references.
 
 
 # 🏢 Property Configuration
-TOTAL_UNITS = 1244  # Total units in property
+TOTAL_UNITS = 1244  # Units of the default property (core.properties registers the others)
+PROPERTY_LOAD_WORKERS = 4  # Properties downloaded and parsed concurrently by load_portfolio
 
 # 📊 Excel Configuration
 REQUIRED_SHEETS = ["Unit", "Task"]
 
 # ⏱️ Refresh Settings
-REFRESH_INTERVAL_MIN = 5  # minutes (used later for scheduler.py)
+REFRESH_INTERVAL_MIN = 5  # minutes a fetched workbook is served before revalidating
+PREFETCH_LEAD_S = 30  # core.scheduler refreshes this long before the workbook goes stale
+PREFETCH_RETRY_S = 15  # First retry delay after a failed prefetch (doubles per failure)
+PREFETCH_MAX_BACKOFF_MIN = 10  # Cap on the prefetch retry delay
+FETCH_CONNECT_TIMEOUT_S = 5  # Google Sheets connect timeout
+FETCH_READ_TIMEOUT_S = 30  # Google Sheets read timeout (downloads run off the script thread)
+REVALIDATE_WAIT_S = 2  # Page loads wait this long for a revalidation before serving stale data
+BREAKER_FAILURES = 3  # Consecutive download failures that open the circuit breaker
+BREAKER_COOLDOWN_S = 60  # No downloads are attempted while the breaker is open
+FETCH_POOL_SIZE = 4  # Kept-alive connections to Google Sheets (shared by all sessions)
+FETCH_CHUNK_BYTES = 256 * 1024  # Streamed download chunk size
+FETCH_METRICS_HISTORY = 20  # Recent downloads kept for the debug panel
 
 # 🗂️ File Paths
 EXCEL_FILE_PATH = "data/DRMB.xlsx"
+SNAPSHOT_DIR = "data/snapshots"  # Parsed-sheet snapshots keyed by workbook hash
+SNAPSHOT_KEEP = 3  # Number of workbook versions kept on disk
+WORKBOOK_CACHE_ENTRIES = 16  # Parsed workbooks / snapshots kept in memory (all properties together)
+PARSE_PROCESS_MIN_BYTES = 2 * 1024 * 1024  # Workbooks this large parse one sheet per worker process
+PARSE_MAX_WORKERS = 4  # Cap on sheet parse worker processes (also capped by CPU count)
+PARSE_WORKER_TIMEOUT_S = 120  # Pooled sheet parses slower than this are redone in-process
+WORKBOOK_READER = "pandas"  # "streaming": core.sheet_reader (read-only openpyxl, used columns only)
+
+# 🖥️ Rendering
+UNITS_PAGE_SIZE = 25  # Unit rows shown per page inside a building expander
 
 # 🎨 Theme & Styling (for CSS alignment)
 PRIMARY_COLOR = "#007BFF"
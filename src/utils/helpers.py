@@ -9,6 +9,7 @@ and small date computations used across pages and core.
 from __future__ import annotations
 
 from typing import Optional
+import numpy as np
 import pandas as pd
 
 
@@ -20,7 +21,9 @@ def normalize_nvm(value: object) -> str:
 
 
 def normalize_nvm_series(series: pd.Series) -> pd.Series:
-    """Vectorized normalization for NVM columns."""
+    """Vectorized normalization for NVM columns (plain or categorical)."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        series = series.astype(object)
     return series.fillna("").astype(str).str.strip().str.lower()
 
 
@@ -38,6 +41,16 @@ def fmt_date(value: object, fmt: str = "%m/%d/%y") -> str:
     return "—"
 
 
+def fmt_dates(dates: pd.Series, fmt: str = "%m/%d/%y") -> pd.Series:
+    """
+    Vectorized fmt_date for a datetime column: strings, '—' where missing.
+    Move dates repeat across units, so each distinct date is formatted once.
+    """
+    codes, uniques = pd.factorize(dates)  # NaT -> code -1
+    labels = np.append(uniques.strftime(fmt).to_numpy(dtype=object), "—")
+    return pd.Series(labels[codes], index=dates.index, dtype=object)
+
+
 def days_between(later: object, earlier: object) -> Optional[int]:
     """Return integer day difference (later - earlier) or None on error."""
     try:
@@ -1,10 +1,16 @@
-import os
+
+import atexit
 import datetime
+import json
+import os
+import queue
+import threading
 from pathlib import Path
 
 # Optional: mirror logs in Streamlit if running in that environment
 try:
     import streamlit as st
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
     STREAMLIT_AVAILABLE = True
 except ImportError:
     STREAMLIT_AVAILABLE = False
@@ -13,31 +19,108 @@ except ImportError:
 LOG_DIR = Path("logs")
 LOG_DIR.mkdir(exist_ok=True)
 
+# "text" (default) or "json" (one JSON object per line, *.jsonl)
+LOG_FORMAT = os.environ.get("DMRB_LOG_FORMAT", "text").lower()
+LOG_TO_CONSOLE = os.environ.get("DMRB_LOG_CONSOLE", "1") != "0"
+MAX_BATCH = 500  # Records written per file write
+
+
 def _get_log_path() -> Path:
     """Return today's log file path."""
     today = datetime.date.today().strftime("%Y%m%d")
-    return LOG_DIR / f"app_{today}.log"
+    suffix = "jsonl" if LOG_FORMAT == "json" else "log"
+    return LOG_DIR / f"app_{today}.{suffix}"
+
+
+def _format_text(record: dict) -> str:
+    return f"{record['ts']} | {record['level']:<5} | {record['message']}"
+
+
+class _LogWriter(threading.Thread):
+    """
+    Background writer: drains the queue in batches and appends them through a
+    single open handle, reopening it when the day (file name) changes.
+    A single writer per process keeps lines from concurrent sessions intact.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(name="dmrb-log-writer", daemon=True)
+        self.queue: "queue.Queue[dict]" = queue.Queue()
+        self._handle = None
+        self._path = None
+
+    def _file(self):
+        path = _get_log_path()
+        if path != self._path:
+            if self._handle is not None:
+                self._handle.close()
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._handle = open(path, "a", encoding="utf-8")
+            self._path = path
+        return self._handle
+
+    def _write(self, batch: list) -> None:
+        text_lines = [_format_text(r) for r in batch]
+        if LOG_FORMAT == "json":
+            file_lines = [json.dumps(r, default=str, ensure_ascii=False) for r in batch]
+        else:
+            file_lines = text_lines
+
+        if LOG_TO_CONSOLE:
+            print("\n".join(text_lines), flush=True)
+
+        handle = self._file()
+        handle.write("\n".join(file_lines) + "\n")
+        handle.flush()
+
+    def run(self) -> None:
+        while True:
+            batch = [self.queue.get()]
+            while len(batch) < MAX_BATCH:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._write(batch)
+            except Exception as e:  # never let a bad write kill the writer
+                print(f"[logger] Failed to write {len(batch)} log records: {e}")
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+
+
+_writer = _LogWriter()
+_writer.start()
+
+
+def flush_logs() -> None:
+    """Block until every queued record has been written."""
+    _writer.queue.join()
+
+
+atexit.register(flush_logs)
 
 
 def log_event(level: str, message: str) -> None:
     """
     Log an event to console, file, and Streamlit (if available).
     Format: 2025-10-23 14:32:10 | INFO | message
+    Console and file output are written by a background thread; this call only
+    enqueues the record. Set DMRB_LOG_FORMAT=json for JSON-lines files.
     """
-    timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    line = f"{timestamp} | {level.upper():<5} | {message}"
-
-    # --- Console ---
-    print(line)
-
-    # --- File ---
-    with open(_get_log_path(), "a", encoding="utf-8") as log_file:
-        log_file.write(line + "\n")
+    _writer.queue.put_nowait({
+        "ts": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "level": level.upper(),
+        "message": message,
+        "thread": threading.current_thread().name,
+    })
 
     # --- Streamlit Mirror (if running in app) ---
     # Suppress INFO-level output in the UI to avoid noisy banners.
-    # Only surface warnings and errors to the Streamlit interface.
-    if STREAMLIT_AVAILABLE:
+    # Only surface warnings and errors to the Streamlit interface, and only
+    # from a script run (background threads have no page to write to).
+    if STREAMLIT_AVAILABLE and get_script_run_ctx(suppress_warning=True) is not None:
         level_up = level.upper()
         if level_up in ("WARN", "WARNING"):
             st.warning(message)
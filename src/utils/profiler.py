@@ -0,0 +1,151 @@
+"""
+utils/profiler.py
+---------------------------------------------------------
+Per-rerun stage profiler.
+Pages call start_rerun() / end_rerun(); functions decorated
+with @profiled (or wrapped in `with stage(...)`) record wall
+time, call count and rows processed into the current rerun.
+Outside a rerun (other threads, scripts, tests) it is a no-op.
+---------------------------------------------------------
+"""
+
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import pandas as pd
+
+
+@dataclass
+class StageStats:
+    """
+    Aggregated timings of one stage within a rerun.
+
+    Args:
+        name: Stage name
+        depth: Nesting depth of the first call (0 = top level)
+        calls: Number of calls
+        total_s: Wall time across calls (seconds, includes nested stages)
+        rows: Rows processed across calls
+    """
+    name: str
+    depth: int
+    calls: int = 0
+    total_s: float = 0.0
+    rows: int = 0
+
+
+@dataclass
+class RerunProfile:
+    """Stages recorded during one script rerun, in first-call order."""
+    page: str
+    started: float = field(default_factory=time.perf_counter)
+    stages: Dict[str, StageStats] = field(default_factory=dict)
+    total_s: Optional[float] = None
+    _stack: List[str] = field(default_factory=list, repr=False)
+
+    def rows(self) -> List[Dict[str, Any]]:
+        """Stage table for display: stage (nested stages marked └), calls, ms, rows."""
+        return [
+            {
+                'stage': f"{'· ' * (s.depth - 1)}└ {s.name}" if s.depth else s.name,
+                'calls': s.calls,
+                'ms': round(s.total_s * 1000, 1),
+                'rows': s.rows,
+            }
+            for s in self.stages.values()
+        ]
+
+    def summary(self) -> str:
+        """One-line summary for the log."""
+        total = f"{self.total_s * 1000:.0f} ms" if self.total_s is not None else "running"
+        top = [s for s in self.stages.values() if s.depth == 0]
+        parts = [f"{s.name} {s.total_s * 1000:.0f} ms x{s.calls}" for s in top]
+        return f"[profile] {self.page}: {total} | " + " | ".join(parts)
+
+
+_local = threading.local()
+
+
+def start_rerun(page: str) -> RerunProfile:
+    """Start collecting stages for this thread's script rerun."""
+    _local.profile = RerunProfile(page=page)
+    return _local.profile
+
+
+def current_profile() -> Optional[RerunProfile]:
+    """The rerun being profiled on this thread, if any."""
+    return getattr(_local, 'profile', None)
+
+
+def end_rerun() -> Optional[RerunProfile]:
+    """Stop collecting and return the finished profile (None if none was started)."""
+    profile = current_profile()
+    _local.profile = None
+    if profile is not None:
+        profile.total_s = time.perf_counter() - profile.started
+    return profile
+
+
+def count_rows(value: Any) -> int:
+    """Rows in a DataFrame / Series / list (first item of a tuple); 0 otherwise."""
+    if isinstance(value, tuple):
+        value = value[0] if value else None
+    return len(value) if isinstance(value, (pd.DataFrame, pd.Series, list)) else 0
+
+
+class _StageHandle:
+    """Yielded by stage(); set .rows to report rows processed."""
+    __slots__ = ('rows',)
+
+    def __init__(self, rows: int = 0):
+        self.rows = rows
+
+
+@contextmanager
+def stage(name: str, rows: int = 0) -> Iterator[_StageHandle]:
+    """Time a block as a stage of the current rerun (no-op outside one)."""
+    handle = _StageHandle(rows)
+    profile = current_profile()
+    if profile is None:
+        yield handle
+        return
+
+    stats = profile.stages.get(name)
+    if stats is None:
+        stats = profile.stages[name] = StageStats(name=name, depth=len(profile._stack))
+    profile._stack.append(name)
+    start = time.perf_counter()
+    try:
+        yield handle
+    finally:
+        stats.total_s += time.perf_counter() - start
+        stats.calls += 1
+        stats.rows += handle.rows
+        profile._stack.pop()
+
+
+def profiled(name: Optional[str] = None) -> Callable[[Callable], Callable]:
+    """
+    Decorator recording a function as a stage of the current rerun.
+
+    Rows processed are taken from the first positional DataFrame / Series /
+    list argument (e.g. the input units), else from the return value.
+    """
+    def decorator(fn: Callable) -> Callable:
+        stage_name = name or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if current_profile() is None:
+                return fn(*args, **kwargs)
+            with stage(stage_name) as handle:
+                result = fn(*args, **kwargs)
+                sized = next((a for a in args if count_rows(a)), None)
+                handle.rows = count_rows(sized if sized is not None else result)
+                return result
+        return wrapper
+    return decorator
@@ -0,0 +1,106 @@
+"""
+Shared test data: build_units (the make_units fixture) builds one seeded,
+random set of units at any stage of the pipeline, with the blanks, mixed
+types and messy labels of the real workbook. Reference implementations
+the optimized code is checked against live in legacy_reference.py.
+"""
+
+import sys
+from datetime import date
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import numpy as np
+import pandas as pd
+import pytest
+
+TODAY = date(2025, 10, 23)
+
+# Pipeline stages build_units can stop at
+UNIT_STAGES = ("raw", "enriched", "compact", "dashboard")
+
+PHASES = [5, 10, 3, None, "Annex"]
+BUILDINGS = [1, 2, 12, None]
+STATUSES = [
+    "Ready", "ready ", "In Turn", "currently work", "Started", "in progress", "Pending", None,
+]
+COMMENTS = ["ok", "On HOLD for parts", "blocked pipe", "issue with AC", "", None, "fine"]
+NVM_INPUTS = ["Vacant", "vacant", "notice", "", None]
+
+
+def _dates(rng: np.random.Generator, today: date, n: int, missing: float) -> list:
+    """Dates within 45 days of today (some with a time of day), a `missing` share blank."""
+    base = pd.Timestamp(today)
+    offsets = rng.integers(-45, 45, size=n)
+    hours = rng.choice([0, 0, 0, 13], size=n)
+    return [
+        None if rng.random() < missing else base + pd.Timedelta(days=int(d), hours=int(h))
+        for d, h in zip(offsets, hours)
+    ]
+
+
+def _choice(rng: np.random.Generator, values: list, n: int) -> np.ndarray:
+    return rng.choice(np.array(values, dtype=object), size=n)
+
+
+def build_units(
+    n: int = 200,
+    seed: int = 0,
+    today: date = TODAY,
+    stage: str = "raw",
+    excel_days: bool = False,
+    missing: float = 0.25,
+) -> pd.DataFrame:
+    """
+    Build n random units.
+
+    Args:
+        n: Number of units (unit ids are unique)
+        seed: Random seed
+        today: Reference day for dates and derived fields
+        stage: "raw" (Unit sheet with canonical names, as snapshot_service
+               renames it), "enriched" (compute_all_unit_fields), "compact"
+               (apply_unit_schema) or "dashboard" (compact, Dashboard names)
+        excel_days: Include Excel DV / DTBR columns (partially blank)
+        missing: Share of blank move dates
+    """
+    if stage not in UNIT_STAGES:
+        raise ValueError(f"Unknown stage: {stage!r}")
+    rng = np.random.default_rng(seed)
+    phase, building = _choice(rng, PHASES, n), _choice(rng, BUILDINGS, n)
+    unit_number = np.arange(100, 100 + n)
+    units = pd.DataFrame({
+        'unit_id': [f"P-{p} / Bld-{b} / U-{u}" for p, b, u in zip(phase, building, unit_number)],
+        'unit_number': unit_number,
+        'phase': phase,
+        'building': building,
+        'move_out': _dates(rng, today, n, missing),
+        'move_in': _dates(rng, today, n, missing),
+        'status': _choice(rng, STATUSES, n),
+        'comments': _choice(rng, COMMENTS, n),
+        'nvm': _choice(rng, NVM_INPUTS, n),
+    })
+    if excel_days:
+        days_vacant = rng.integers(0, 40, size=n).astype(float)
+        days_vacant[rng.random(n) < 0.25] = np.nan
+        units['days_vacant'] = days_vacant
+        units['days_to_be_ready'] = rng.integers(-20, 20, size=n).astype(float)
+    if stage == "raw":
+        return units
+
+    from core.data_logic import compute_all_unit_fields
+    from core.schema import apply_unit_schema
+    from core.snapshot_service import DASHBOARD_COLUMN_MAP
+
+    units = compute_all_unit_fields(units, today=today)
+    if stage == "enriched":
+        return units
+    units = apply_unit_schema(units)
+    return units if stage == "compact" else units.rename(columns=DASHBOARD_COLUMN_MAP)
+
+
+@pytest.fixture
+def make_units():
+    """Factory for sample units (see build_units)."""
+    return build_units
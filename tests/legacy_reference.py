@@ -0,0 +1,118 @@
+"""
+Original row-by-row implementations the optimized code is checked against:
+core.phase_logic (build_phase_overview, build_all_units) and
+ui.unit_viewmodels (build_enhanced_unit). Kept verbatim as references.
+"""
+
+import sys
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import pandas as pd
+
+from utils.helpers import days_between, fmt_date, is_vacant, normalize_nvm_series
+
+
+def legacy_build_phase_overview(units_df, today):
+    """Original per-phase / per-building mask-and-iterrows implementation (reference)."""
+    phase_data = []
+    for phase in sorted(units_df['Phases'].dropna().unique(), key=str):
+        phase_units = units_df[units_df['Phases'] == phase].copy()
+        buildings = []
+        for building in sorted(phase_units['Building'].dropna().unique(), key=str):
+            building_units = phase_units[phase_units['Building'] == building].copy()
+            nvm_norm = normalize_nvm_series(building_units['nvm'])
+            notice_count = int(nvm_norm.str.contains('notice', na=False).sum())
+            vacant_count = int(nvm_norm.isin(['vacant', 'smi']).sum())
+            move_in_count = int((nvm_norm == 'move in').sum())
+            total = len(building_units)
+            vacant_units_list = []
+            for _, row in building_units[nvm_norm.isin(['vacant', 'smi'])].iterrows():
+                dv = days_between(datetime.now(), row.get('Move-out'))
+                dr = days_between(row.get('Move-in'), datetime.now())
+                vacant_units_list.append({
+                    'unit_num': str(row.get('Unit', '')).strip(),
+                    'status_emoji': '🟢',
+                    'move_out_str': fmt_date(row.get('Move-out')),
+                    'days_vacant': dv if dv is not None else '—',
+                    'move_in_str': fmt_date(row.get('Move-in')),
+                    'days_to_be_ready': dr if dr is not None else '—',
+                    'lifecycle_label': row.get('lifecycle_label', 'Not Ready'),
+                    'nvm': row.get('nvm', '—'),
+                })
+            move_events = []
+            for col, icon, verb in (('Move-out', '🟥', 'Move Out'), ('Move-in', '🟩', 'Move In')):
+                dates = pd.to_datetime(building_units[col], errors='coerce')
+                for _, r in building_units[dates.dt.date == today].iterrows():
+                    unit_label = str(r.get('Unit', '')).strip()
+                    move_date = fmt_date(r.get(col), '%Y-%m-%d')
+                    if unit_label and move_date != '—':
+                        move_events.append(f"{icon} Unit {unit_label} - {verb} {move_date}")
+            buildings.append({
+                'label': f'B{building}',
+                'total_units': total,
+                'notice_count': notice_count,
+                'vacant_count': vacant_count,
+                'move_in_count': move_in_count,
+                'vacant': vacant_count,
+                'occupied': total - vacant_count,
+                'move_events': move_events,
+                'vacant_units': vacant_units_list,
+            })
+        try:
+            phase_label = f'Phase {int(phase)}'
+        except (ValueError, TypeError):
+            phase_label = f'Phase {phase}'
+        phase_data.append({'phase_label': phase_label, 'buildings': buildings})
+    return phase_data
+
+
+def legacy_build_all_units(units_df):
+    """Original iterrows implementation of build_all_units (reference)."""
+    all_units = []
+    now = datetime.now()
+    for _, row in units_df.iterrows():
+        unit_id_val = str(row.get('Unit id', '')).strip() if 'Unit id' in row else ''
+        unit_num = unit_id_val or str(row.get('Unit', '')).strip()
+        if not unit_num:
+            continue
+        dv = days_between(now, row.get('Move-out'))
+        dr = days_between(row.get('Move-in'), now)
+        all_units.append({
+            'unit_num': unit_num,
+            'status_emoji': '🟢' if is_vacant(row.get('nvm', '')) else '🔴',
+            'move_out_str': fmt_date(row.get('Move-out')),
+            'days_vacant': dv if dv is not None else '—',
+            'days_vacant_sort': dv if dv is not None else -1,
+            'move_in_str': fmt_date(row.get('Move-in')),
+            'days_to_be_ready': dr if dr is not None else '—',
+            'nvm': row.get('nvm', '—'),
+            'lifecycle_label': row.get('lifecycle_label', 'Not Ready'),
+        })
+    all_units.sort(key=lambda x: x['days_vacant_sort'], reverse=True)
+    return all_units
+
+
+def legacy_build_enhanced_unit(row):
+    """Original per-row implementation (reference)."""
+    unit_id = str(row.get('unit_id', ''))
+    lifecycle = row.get('lifecycle_label', 'Unknown')
+    status_emoji = {'Ready': '✅', 'In Turn': '🔧', 'Not Ready': '⚠️'}.get(lifecycle, '🏠')
+    readiness_pct = 100 if lifecycle == 'Ready' else 50 if lifecycle == 'In Turn' else 0
+    days_vacant = row.get('days_vacant')
+    has_days_vacant = pd.notna(days_vacant) and days_vacant != ''
+    days_vacant_str = str(int(days_vacant)) if has_days_vacant else '—'
+    days_to_ready = row.get('days_to_be_ready')
+    has_days_to_ready = pd.notna(days_to_ready) and days_to_ready != ''
+    days_to_ready_str = str(int(days_to_ready)) if has_days_to_ready else '—'
+    move_out = row.get('move_out').strftime('%m/%d/%y') if pd.notna(row.get('move_out')) else '—'
+    move_in = row.get('move_in').strftime('%m/%d/%y') if pd.notna(row.get('move_in')) else '—'
+    return {
+        'unit_id': unit_id, 'unit_num': unit_id, 'status_emoji': status_emoji,
+        'move_out': move_out, 'move_out_str': move_out, 'move_in': move_in, 'move_in_str': move_in,
+        'days_vacant': days_vacant_str,
+        'days_to_ready': days_to_ready_str, 'days_to_be_ready': days_to_ready_str,
+        'readiness_pct': readiness_pct, 'nvm': row.get('nvm', '—'), 'lifecycle_label': lifecycle,
+    }
@@ -0,0 +1,45 @@
+"""
+Smoke tests for the benchmark harness and synthetic workbook generator.
+"""
+
+import sys
+from datetime import date
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).parent.parent / "benchmarks"))
+
+from run_benchmarks import STAGES, benchmark_size, compare_results
+from synthetic_workbook import TASK_DATE_COLUMNS, generate_tasks, generate_units
+
+
+def test_synthetic_sheets_use_real_columns():
+    units = generate_units(500, seed=1, today=date(2026, 1, 15))
+    assert list(units.columns) == [
+        'Unit id', 'Unit', 'Phases', 'Building', 'Move-out', 'Move-in', 'Status', 'DV', 'DTBR',
+    ]
+    assert len(units) == 500 and units['Unit id'].is_unique
+    tasks = generate_tasks(units, seed=1, today=date(2026, 1, 15))
+    task_columns = ['Unit ID', 'Vendor / Employee', 'Task Status'] + TASK_DATE_COLUMNS
+    assert list(tasks.columns) == task_columns
+    assert len(tasks) == units['Move-out'].notna().sum()
+
+
+def test_benchmark_size_times_every_stage():
+    result = benchmark_size(120, repeat=1, cache_dir=None)
+    assert result['units'] == 120 and result['tasks'] > 0
+    assert list(result['stages']) == STAGES
+    assert result['memory_bytes']['units_compact'] < result['memory_bytes']['units_enriched']
+    assert result['download']['wire_bytes'] == result['workbook_bytes']
+    assert set(result['peak_bytes']) == {'read_excel', 'stream_sheets'}
+    timings = result['stages'].values()
+    assert all(len(timing['runs']) == 1 and timing['median'] >= 0 for timing in timings)
+
+
+def test_compare_results_flags_slower_stages():
+    def report(seconds):
+        return {"results": [{"units": 1000, "stages": {"read_excel": {"median": seconds}}}]}
+    slower = compare_results(report(0.5), report(0.3))
+    assert slower == ["1000 units / read_excel: 300.0 ms -> 500.0 ms"]
+    assert compare_results(report(0.32), report(0.3)) == []
+    assert compare_results(report(0.004), report(0.001)) == []  # below the noise floor
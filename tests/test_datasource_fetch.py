@@ -0,0 +1,227 @@
+"""
+Revalidating fetch tests for core.datasource against a local HTTP stand-in
+for the Google Sheets export endpoint.
+"""
+
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import pytest
+import requests
+
+from core import datasource
+from core.datasource import CircuitBreaker, SourceUnavailable, content_hash, fetch_excel_payload
+
+
+class StandInSheet:
+    """Mutable state served by the stand-in server."""
+
+    def __init__(self, body: bytes, validators: bool = True):
+        self.body = body
+        self.validators = validators
+        self.version = 1
+        self.status = 200
+        self.delay = 0.0
+        self.requests: list[dict] = []
+
+    @property
+    def etag(self) -> str:
+        return f'"v{self.version}"'
+
+
+def _make_handler(sheet: StandInSheet):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            sheet.requests.append(dict(self.headers))
+            time.sleep(sheet.delay)
+            if sheet.status != 200:
+                self.send_response(sheet.status)
+                self.end_headers()
+                return
+            if sheet.validators and self.headers.get("If-None-Match") == sheet.etag:
+                self.send_response(304)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(sheet.body)))
+            if sheet.validators:
+                self.send_header("ETag", sheet.etag)
+                self.send_header("Last-Modified", "Thu, 23 Oct 2025 14:32:10 GMT")
+            self.end_headers()
+            self.wfile.write(sheet.body)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+@pytest.fixture
+def stand_in():
+    """Yield (sheet, url) for a stand-in export server on a free local port."""
+    servers = []
+
+    def _start(body: bytes = b"xlsx-v1", validators: bool = True):
+        sheet = StandInSheet(body, validators)
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _make_handler(sheet))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return sheet, f"http://127.0.0.1:{server.server_address[1]}/export?format=xlsx"
+
+    yield _start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def test_first_fetch_returns_changed_payload(stand_in):
+    sheet, url = stand_in()
+    payload = fetch_excel_payload(url)
+    assert payload.changed
+    assert payload.content == b"xlsx-v1"
+    assert payload.sha256 == content_hash(b"xlsx-v1")
+    assert payload.etag == '"v1"'
+
+
+def test_not_modified_reuses_previous_payload(stand_in):
+    sheet, url = stand_in()
+    first = fetch_excel_payload(url)
+    second = fetch_excel_payload(url, previous=first)
+    assert not second.changed
+    assert second.content is first.content
+    assert second.sha256 == first.sha256
+    assert sheet.requests[-1].get("If-None-Match") == '"v1"'
+    assert sheet.requests[-1].get("If-Modified-Since") == "Thu, 23 Oct 2025 14:32:10 GMT"
+
+
+def test_hash_fallback_without_validators(stand_in):
+    sheet, url = stand_in(validators=False)
+    first = fetch_excel_payload(url)
+    second = fetch_excel_payload(url, previous=first)
+    assert "If-None-Match" not in sheet.requests[-1]
+    assert not second.changed
+    assert second.content is first.content
+
+
+def test_modified_body_is_a_new_version(stand_in):
+    sheet, url = stand_in()
+    first = fetch_excel_payload(url)
+    sheet.body, sheet.version = b"xlsx-v2", 2
+    second = fetch_excel_payload(url, previous=first)
+    assert second.changed
+    assert second.content == b"xlsx-v2"
+    assert second.sha256 != first.sha256
+    assert second.etag == '"v2"'
+
+
+def test_http_error_raises(stand_in):
+    sheet, url = stand_in()
+    sheet.status = 500
+    with pytest.raises(requests.HTTPError):
+        fetch_excel_payload(url)
+
+
+@pytest.fixture
+def fresh_state(monkeypatch):
+    """Start from an empty payload cache pointed at the stand-in server."""
+    monkeypatch.setattr(datasource, "_sources", {})
+    monkeypatch.setattr(datasource, "BREAKER_FAILURES", 2)
+    return lambda url: monkeypatch.setenv("GDRIVE_XLSX_URL", url)
+
+
+def test_fresh_payload_served_without_refetch(stand_in, fresh_state):
+    sheet, url = stand_in()
+    fresh_state(url)
+    first = datasource.load_excel_payload()
+    assert datasource.load_excel_payload() is first
+    assert len(sheet.requests) == 1
+
+    datasource.clear_data_cache()
+    assert datasource.fresh_payload() is None
+    second = datasource.load_excel_payload()
+    assert len(sheet.requests) == 2 and not second.changed  # revalidated (304)
+
+
+def test_refresh_extends_freshness(stand_in, fresh_state):
+    sheet, url = stand_in()
+    fresh_state(url)
+    datasource.refresh_payload()
+    sheet.body, sheet.version = b"xlsx-v2", 2
+    assert datasource.refresh_payload().content == b"xlsx-v2"
+    assert datasource.load_excel_payload().content == b"xlsx-v2"
+    assert len(sheet.requests) == 2
+
+
+def test_slow_revalidation_serves_stale_payload(stand_in, fresh_state):
+    sheet, url = stand_in()
+    fresh_state(url)
+    first = datasource.load_excel_payload()
+    datasource.clear_data_cache()
+    sheet.body, sheet.version, sheet.delay = b"xlsx-v2", 2, 1.0
+
+    started = time.perf_counter()
+    assert datasource.load_excel_payload(wait_s=0.1) is first
+    assert time.perf_counter() - started < 0.5
+    assert datasource.source_status().revalidating
+
+    datasource.get_source().revalidation.join()
+    assert datasource.load_excel_payload(wait_s=0.1).content == b"xlsx-v2"
+
+
+def test_failed_revalidation_serves_stale_payload(stand_in, fresh_state):
+    sheet, url = stand_in()
+    fresh_state(url)
+    first = datasource.load_excel_payload()
+    datasource.clear_data_cache()
+    sheet.status = 500
+    assert datasource.load_excel_payload() is first
+    assert not datasource.source_status().fresh
+    assert datasource.source_status().last_error
+
+
+def test_breaker_stops_requests_after_failures(stand_in, fresh_state):
+    sheet, url = stand_in()
+    fresh_state(url)
+    sheet.status = 500
+    for _ in range(2):
+        with pytest.raises(SourceUnavailable):
+            datasource.load_excel_payload()
+    assert datasource.source_status().breaker_open_until is not None
+
+    with pytest.raises(SourceUnavailable):
+        datasource.load_excel_payload()
+    assert len(sheet.requests) == 2
+
+
+def test_breaker_lets_one_trial_through_after_cooldown():
+    breaker = CircuitBreaker(threshold=2, cooldown_s=0.05)
+    assert not breaker.record_failure(RuntimeError("1"))
+    assert breaker.record_failure(RuntimeError("2"))
+    assert not breaker.allow()
+
+    time.sleep(0.06)
+    assert breaker.allow()
+    assert not breaker.allow()  # one trial at a time
+    breaker.record_success()
+    assert breaker.allow() and breaker.failures == 0
+
+
+def test_sources_keep_separate_state(stand_in, fresh_state):
+    sheet_a, url_a = stand_in(b"xlsx-a")
+    sheet_b, url_b = stand_in(b"xlsx-b")
+    sheet_b.status = 500
+    fresh_state(url_a)
+    assert datasource.load_excel_payload().content == b"xlsx-a"
+    with pytest.raises(SourceUnavailable):
+        datasource.load_excel_payload(url=url_b)
+    status_b = datasource.source_status(url_b)
+    assert status_b.last_error and status_b.last_fetch is None
+    assert datasource.source_status().fresh and not datasource.source_status().last_error
+    assert datasource.source_status().last_fetch.url == url_a
+    datasource.clear_data_cache()
+    assert not datasource.source_status().fresh
@@ -0,0 +1,35 @@
+"""
+Tests for utils.logger: records are written by the background writer
+in order, in text or JSON-lines format.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from utils import logger
+
+
+def test_log_lines_written_in_order(tmp_path, monkeypatch):
+    monkeypatch.setattr(logger, "LOG_DIR", tmp_path)
+    for i in range(50):
+        logger.log_event("INFO", f"message {i}")
+    logger.flush_logs()
+
+    lines = logger._get_log_path().read_text(encoding="utf-8").splitlines()
+    assert [line.split(" | ")[2] for line in lines] == [f"message {i}" for i in range(50)]
+    assert lines[0].split(" | ")[1] == "INFO "
+
+
+def test_json_lines_format(tmp_path, monkeypatch):
+    monkeypatch.setattr(logger, "LOG_DIR", tmp_path)
+    monkeypatch.setattr(logger, "LOG_FORMAT", "json")
+    logger.log_event("debug", "structured")
+    logger.flush_logs()
+
+    path = logger._get_log_path()
+    assert path.suffix == ".jsonl"
+    record = json.loads(path.read_text(encoding="utf-8").splitlines()[-1])
+    assert record["level"] == "DEBUG" and record["message"] == "structured"
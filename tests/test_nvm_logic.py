@@ -5,18 +5,21 @@ Validates the compute_nvm_status function against all scenarios.
 
 import sys
 from pathlib import Path
+
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
-import pandas as pd
 from datetime import datetime, timedelta
+
+import pandas as pd
+
 from core.data_logic import compute_nvm_status
 from utils.constants import (
+    NVM_STATUS_BLANK,
     NVM_STATUS_MOVE_IN,
+    NVM_STATUS_NOTICE,
+    NVM_STATUS_NOTICE_SMI,
     NVM_STATUS_SMI,
     NVM_STATUS_VACANT,
-    NVM_STATUS_NOTICE_SMI,
-    NVM_STATUS_NOTICE,
-    NVM_STATUS_BLANK
 )
 
 
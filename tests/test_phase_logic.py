@@ -0,0 +1,81 @@
+"""
+Tests for core.phase_logic aggregations.
+The grouped build_phase_overview and the columnar build_all_units must
+match the original iterrows output (legacy_reference).
+"""
+
+import sys
+from datetime import date
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from legacy_reference import legacy_build_all_units, legacy_build_phase_overview
+
+from core.phase_logic import (
+    build_all_units,
+    build_all_units_frame,
+    build_phase_overview,
+    iter_unit_records,
+)
+
+
+def _dashboard_units(make_units, n: int = 300, seed: int = 4):
+    # The legacy references count days from datetime.now()
+    return make_units(n, seed=seed, today=date.today(), stage="dashboard")
+
+
+def test_phase_overview_matches_legacy(make_units):
+    units = _dashboard_units(make_units)
+    today = date.today()
+    assert build_phase_overview(units, today=today) == legacy_build_phase_overview(units, today)
+
+
+def test_phase_overview_structure(make_units):
+    units = _dashboard_units(make_units, n=60, seed=8)
+    phases = build_phase_overview(units)
+    assert [p['phase_label'] for p in phases] == ['Phase 10', 'Phase 3', 'Phase 5', 'Phase Annex']
+    for phase in phases:
+        for building in phase['buildings']:
+            assert building['vacant_count'] == len(building['vacant_units'])
+            assert building['occupied'] == building['total_units'] - building['vacant_count']
+
+
+def test_phase_overview_empty(make_units):
+    units = _dashboard_units(make_units, n=10)
+    assert build_phase_overview(units.iloc[0:0]) == []
+
+
+def _with_blank_unit_ids(units):
+    """Blank 'Unit id' on some rows (build_all_units falls back to 'Unit')."""
+    unit_ids = units['Unit id'].tolist()
+    unit_ids[::7] = [''] * len(unit_ids[::7])
+    return units.assign(**{'Unit id': unit_ids})
+
+
+def test_all_units_matches_legacy(make_units):
+    units = _with_blank_unit_ids(_dashboard_units(make_units))
+    assert build_all_units(units) == legacy_build_all_units(units)
+
+
+def test_all_units_matches_legacy_without_optional_columns(make_units):
+    units = _dashboard_units(make_units, n=80, seed=2)
+    units = units.drop(columns=['Unit id', 'nvm', 'lifecycle_label'])
+    assert build_all_units(units) == legacy_build_all_units(units)
+
+
+def test_all_units_types_and_order(make_units):
+    units = _with_blank_unit_ids(_dashboard_units(make_units, n=120, seed=5))
+    records = build_all_units(units)
+    days = [r['days_vacant_sort'] for r in records]
+    assert days == sorted(days, reverse=True)
+    assert all(type(r['days_vacant_sort']) is int and type(r['unit_num']) is str for r in records)
+
+
+def test_all_units_records_are_lazy_per_slice(make_units):
+    units = _with_blank_unit_ids(_dashboard_units(make_units, n=50, seed=6))
+    frame = build_all_units_frame(units)
+    page = iter_unit_records(frame.iloc[10:20])
+    assert next(page) == build_all_units(units)[10]
+    assert len(list(page)) == 9
+    assert build_all_units(units.iloc[0:0]) == []
@@ -0,0 +1,56 @@
+"""
+Tests for utils.profiler: stages nest and aggregate calls and rows
+within a rerun, and are a no-op outside one.
+"""
+
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from utils.profiler import count_rows, current_profile, end_rerun, profiled, stage, start_rerun  # noqa: E402
+
+
+@profiled()
+def _double(df):
+    return pd.concat([df, df])
+
+
+@profiled("build")
+def _build():
+    return [1, 2, 3]
+
+
+def test_noop_outside_rerun():
+    assert current_profile() is None
+    with stage("x") as handle:
+        handle.rows = 5
+    assert len(_double(pd.DataFrame({'a': [1]}))) == 2
+    assert end_rerun() is None
+
+
+def test_stages_nest_and_aggregate():
+    start_rerun("Test")
+    with stage("outer"):
+        _double(pd.DataFrame({'a': [1, 2]}))
+        _double(pd.DataFrame({'a': [1, 2, 3]}))
+    _build()
+    profile = end_rerun()
+
+    assert current_profile() is None
+    assert profile.total_s is not None
+    outer, double, build = profile.stages.values()
+    assert (outer.depth, double.depth, build.depth) == (0, 1, 0)
+    assert double.calls == 2 and double.rows == 5  # rows from the input frames
+    assert build.name == "build" and build.rows == 3  # rows from the result
+    assert [r['stage'] for r in profile.rows()] == ["outer", "└ _double", "build"]
+    assert profile.summary().startswith("[profile] Test: ")
+
+
+def test_count_rows():
+    assert count_rows(pd.Series([1, 2])) == 2
+    assert count_rows((pd.DataFrame({'a': [1]}), {})) == 1
+    assert count_rows({'a': 1}) == 0
+    assert count_rows(b"abc") == 0
@@ -0,0 +1,62 @@
+"""
+Tests for core.properties: registry entries are parsed from the
+DMRB_PROPERTIES override, and the default property is served when no
+registry (or an invalid one) is configured.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import pytest
+
+from core.properties import (
+    DEFAULT_PROPERTY_KEY,
+    PROPERTIES_ENV,
+    get_property,
+    load_properties,
+    parse_properties,
+    portfolio_total_units,
+)
+from utils.constants import TOTAL_UNITS
+
+REGISTRY = {
+    "oaks": {
+        "name": "Thousand Oaks",
+        "url": "https://example.com/oaks/export?format=xlsx",
+        "total_units": 1244,
+    },
+    "pine": {"name": "Pine Ridge", "path": "data/pine.xlsx", "total_units": 312},
+}
+
+
+def test_registry_from_environment(monkeypatch):
+    monkeypatch.setenv(PROPERTIES_ENV, json.dumps(REGISTRY))
+    oaks, pine = load_properties()
+    fields = (oaks.key, oaks.name, oaks.total_units, oaks.path)
+    assert fields == ("oaks", "Thousand Oaks", 1244, None)
+    assert (pine.url, pine.path) == (None, "data/pine.xlsx")
+    assert get_property("pine").name == "Pine Ridge"
+    assert get_property("unknown").key == "oaks"
+    assert portfolio_total_units() == 1244 + 312
+
+
+def test_default_property_without_registry(monkeypatch):
+    monkeypatch.delenv(PROPERTIES_ENV, raising=False)
+    (prop,) = load_properties()
+    assert prop.key == DEFAULT_PROPERTY_KEY
+    assert prop.total_units == TOTAL_UNITS
+    assert prop.url is None
+
+
+def test_invalid_registry_falls_back_to_default(monkeypatch):
+    registry = {"oaks": {"name": "Thousand Oaks", "total_units": 10}}
+    monkeypatch.setenv(PROPERTIES_ENV, json.dumps(registry))
+    assert [prop.key for prop in load_properties()] == [DEFAULT_PROPERTY_KEY]
+
+
+def test_entry_requires_unit_count():
+    with pytest.raises(ValueError):
+        parse_properties({"oaks": {"url": "https://example.com/export"}})
@@ -0,0 +1,62 @@
+"""
+Tests for core.scheduler: refresh bookkeeping, exponential backoff
+after failures, the last good result, and the background thread.
+"""
+
+import sys
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from core.scheduler import PrefetchScheduler
+
+
+class FlakyRefresh:
+    """Returns increasing versions; raises while .failing is set."""
+
+    def __init__(self):
+        self.calls = 0
+        self.failing = False
+        self.called = threading.Event()
+
+    def __call__(self):
+        self.calls += 1
+        self.called.set()
+        if self.failing:
+            raise ConnectionError("sheet unavailable")
+        return f"v{self.calls}"
+
+
+def test_backoff_doubles_and_resets():
+    refresh = FlakyRefresh()
+    scheduler = PrefetchScheduler(refresh, interval_s=270, retry_s=15, max_backoff_s=100)
+    assert scheduler.run_once() and scheduler.last_good == "v1"
+    assert scheduler.next_delay() == 270
+
+    refresh.failing = True
+    delays = []
+    for _ in range(5):
+        assert not scheduler.run_once()
+        delays.append(scheduler.next_delay())
+    assert delays == [15, 30, 60, 100, 100]
+    status = scheduler.status()
+    assert status.failures == 5 and status.last_error == "sheet unavailable"
+    assert scheduler.last_good == "v1"  # kept through failures
+
+    refresh.failing = False
+    assert scheduler.run_once() and scheduler.last_good == "v7"
+    assert scheduler.next_delay() == 270 and scheduler.status().last_error is None
+
+
+def test_background_thread_refreshes_and_stops():
+    refresh = FlakyRefresh()
+    scheduler = PrefetchScheduler(
+        refresh, interval_s=0.01, retry_s=0.01, max_backoff_s=0.01, name="test-prefetch"
+    )
+    scheduler.start()
+    scheduler.start()  # idempotent
+    assert refresh.called.wait(5)
+    scheduler.stop(timeout=5)
+    assert not scheduler.status().running
+    assert scheduler.last_good is not None and scheduler.status().last_success is not None
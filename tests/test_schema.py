@@ -0,0 +1,52 @@
+"""
+Tests for core.schema: compact dtypes keep every value, leave columns
+that would lose information alone, and the memory report covers all
+columns of every frame.
+"""
+
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from core.schema import apply_unit_schema, frame_bytes, memory_report
+
+
+def _units(make_units, n=200):
+    return make_units(n, stage="enriched", excel_days=True)
+
+
+def test_schema_casts_and_keeps_values(make_units):
+    units = _units(make_units)
+    compact = apply_unit_schema(units)
+
+    for col in ('phase', 'building', 'status', 'nvm', 'lifecycle_label'):
+        assert isinstance(compact[col].dtype, pd.CategoricalDtype), col
+        assert compact[col].astype(object).where(compact[col].notna(), None).tolist() == \
+            units[col].astype(object).where(units[col].notna(), None).tolist()
+    assert str(compact['move_out'].dtype) == 'datetime64[ns]'
+    assert compact['move_in'].isna().sum() == units['move_in'].isna().sum()
+    assert str(compact['days_vacant'].dtype) == 'Int16'
+    assert str(compact['days_to_be_ready'].dtype) == 'Int16'
+    assert compact['days_vacant'].astype('float64').equals(units['days_vacant'])
+    assert compact['unit_id'].dtype == units['unit_id'].dtype  # unique ids stay strings
+    assert frame_bytes(compact) < frame_bytes(units)
+    assert units['days_vacant'].dtype == 'float64'  # input untouched
+
+
+def test_schema_leaves_lossy_day_columns():
+    units = pd.DataFrame({'days_vacant': [1.5, 2.0], 'days_to_be_ready': ['3', 'soon']})
+    compact = apply_unit_schema(units)
+    assert compact['days_vacant'].dtype == 'float64'
+    assert compact['days_to_be_ready'].tolist() == ['3', 'soon']
+
+
+def test_memory_report_lists_every_column(make_units):
+    units, tasks = _units(make_units), pd.DataFrame({'Unit ID': ['a', 'b']})
+    report = memory_report({'units': units, 'tasks': tasks})
+    assert list(report.columns) == ['frame', 'column', 'dtype', 'kb']
+    # Plus one index row per frame
+    assert len(report) == len(units.columns) + len(tasks.columns) + 2
+    assert report['kb'].is_monotonic_decreasing
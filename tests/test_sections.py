@@ -0,0 +1,47 @@
+"""
+Tests for ui.sections: lazy tab rows run only the selected tab's
+render function and keep the selection in session state.
+"""
+
+from pathlib import Path
+
+from streamlit.testing.v1 import AppTest
+
+SRC = str(Path(__file__).parent.parent / "src")
+
+
+def _lazy_section_app(src: str):
+    import sys
+    sys.path.insert(0, src)
+
+    import streamlit as st
+
+    from ui.sections import create_simple_section, render_section
+
+    def make_tab(name):
+        def render(context):
+            context['rendered'].append(name)
+            st.markdown(f"tab {name}")
+        return render
+
+    context = {'rendered': []}
+    section = create_simple_section(
+        title="Demo",
+        icon="🧪",
+        tabs=[("One", make_tab("one")), ("Two", make_tab("two"))],
+        lazy=True,
+    )
+    render_section(section, context)
+    st.session_state['rendered'] = context['rendered']
+
+
+def test_lazy_tab_row_renders_selected_tab_only():
+    at = AppTest.from_function(_lazy_section_app, args=(SRC,))
+    at.run()
+    assert not at.exception
+    assert at.session_state['rendered'] == ["one"]
+
+    at.session_state["demo_row"] = "Two"
+    at.run()
+    assert not at.exception
+    assert at.session_state['rendered'] == ["two"]
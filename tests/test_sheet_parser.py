@@ -0,0 +1,133 @@
+"""
+Tests for core.sheet_parser: frames survive the Arrow IPC / pickle
+transfer unchanged, small workbooks stay in-process, sheets parsed by
+the worker pool match the in-process parse, and any pool failure
+(including a stuck worker) falls back to parsing in-process.
+"""
+
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import pandas as pd
+import pytest
+
+from core import sheet_parser
+from core.sheet_parser import (
+    ARROW_FRAME,
+    PICKLED_FRAME,
+    decode_frame,
+    encode_frame,
+    parse_sheets,
+    process_workers,
+    workbook_sheet_names,
+)
+
+
+def _workbook() -> bytes:
+    units = pd.DataFrame({
+        ' Unit ': [f"U-{i}" for i in range(50)],
+        'Move-out': pd.date_range("2026-01-01", periods=50, freq="D"),
+        'DV': range(50),
+    })
+    tasks = pd.DataFrame({
+        'Unit ID': [f"U-{i}" for i in range(30)],
+        'Paint': pd.date_range("2026-02-01", periods=30),
+    })
+    buffer = BytesIO()
+    with pd.ExcelWriter(buffer) as writer:
+        units.to_excel(writer, sheet_name="Unit", index=False)
+        tasks.to_excel(writer, sheet_name="Task", index=False)
+        pd.DataFrame({'x': [1]}).to_excel(writer, sheet_name="Notes", index=False)
+    return buffer.getvalue()
+
+
+def test_frames_round_trip_through_arrow():
+    df = pd.DataFrame({'a': [1, 2], 'b': ["x", None], 'c': pd.to_datetime(["2026-01-01", None])})
+    kind, payload = encode_frame(df)
+    assert kind == ARROW_FRAME
+    pd.testing.assert_frame_equal(decode_frame(kind, payload), df)
+
+
+def test_mixed_type_column_falls_back_to_pickle():
+    df = pd.DataFrame({'mixed': [1, "two", 3.0]})
+    kind, payload = encode_frame(df)
+    assert kind == PICKLED_FRAME
+    pd.testing.assert_frame_equal(decode_frame(kind, payload), df)
+
+
+def test_sheet_names_without_loading_the_workbook():
+    assert workbook_sheet_names(_workbook()) == ["Unit", "Task", "Notes"]
+
+
+def test_small_workbooks_and_single_cores_stay_in_process(monkeypatch):
+    monkeypatch.setattr(sheet_parser.os, "cpu_count", lambda: 8)
+    assert process_workers(2, n_bytes=10, min_bytes=100) == 0
+    assert process_workers(1, n_bytes=1000, min_bytes=100) == 0
+    assert process_workers(2, n_bytes=1000, min_bytes=100) == 2
+    monkeypatch.setattr(sheet_parser.os, "cpu_count", lambda: 1)
+    assert process_workers(2, n_bytes=1000, min_bytes=100) == 0
+    monkeypatch.setattr(sheet_parser.os, "cpu_count", lambda: 8)
+    monkeypatch.setenv(sheet_parser.PARSE_PROCESSES_ENV, "0")
+    assert process_workers(2, n_bytes=1000, min_bytes=100) == 0
+
+
+@pytest.fixture
+def worker_pool(monkeypatch):
+    monkeypatch.setattr(sheet_parser.os, "cpu_count", lambda: 2)
+    yield
+    sheet_parser.shutdown_pool()
+
+
+def test_pool_parse_matches_in_process(worker_pool):
+    excel_bytes = _workbook()
+    in_process = parse_sheets(excel_bytes, ["Unit", "Task"])
+    pooled = parse_sheets(excel_bytes, ["Unit", "Task"], min_bytes=0)
+    assert sheet_parser._pool is not None
+    assert list(pooled) == ["Unit", "Task"]
+    assert list(pooled["Unit"].columns) == ["Unit", "Move-out", "DV"]
+    for name in in_process:
+        pd.testing.assert_frame_equal(pooled[name], in_process[name])
+
+
+def test_pool_failures_fall_back_to_in_process(worker_pool, monkeypatch):
+    excel_bytes = _workbook()
+    in_process = parse_sheets(excel_bytes, ["Unit", "Task"])
+    calls = []
+
+    replaced = ProcessPoolExecutor(max_workers=1)
+    replaced.shutdown()  # Shut down by another thread: submit raises RuntimeError
+
+    def replaced_pool(workers):
+        calls.append(workers)
+        return replaced
+
+    def fork_fails(workers):
+        calls.append(workers)
+        raise OSError("Cannot allocate memory")
+
+    for get_pool in (replaced_pool, fork_fails):
+        monkeypatch.setattr(sheet_parser, "_get_pool", get_pool)
+        fallback = parse_sheets(excel_bytes, ["Unit", "Task"], min_bytes=0)
+        for name in in_process:
+            pd.testing.assert_frame_equal(fallback[name], in_process[name])
+    assert calls == [2, 2]
+
+
+def _hang(*args):
+    time.sleep(60)
+
+
+def test_stuck_worker_times_out_and_falls_back(worker_pool, monkeypatch):
+    excel_bytes = _workbook()
+    monkeypatch.setattr(sheet_parser, "_parse_in_worker", _hang)
+    monkeypatch.setattr(sheet_parser, "PARSE_WORKER_TIMEOUT_S", 0.5)
+    started = time.perf_counter()
+    sheets = parse_sheets(excel_bytes, ["Unit", "Task"], min_bytes=0)
+    assert time.perf_counter() - started < 10
+    assert list(sheets) == ["Unit", "Task"]
+    assert sheet_parser._pool is None  # Discarded; the next large parse starts a new one
@@ -0,0 +1,83 @@
+"""
+Tests for core.sheet_reader: the streaming reader returns the same
+frames as pd.read_excel for the projected columns, including blanks,
+mixed types, error cells and trailing empty rows.
+"""
+
+import sys
+from datetime import date
+from io import BytesIO
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+sys.path.insert(0, str(Path(__file__).parent.parent / "benchmarks"))
+
+import pandas as pd
+from synthetic_workbook import build_workbook_bytes
+
+from core.sheet_parser import parse_sheets
+from core.sheet_reader import (
+    SHEET_COLUMNS,
+    STREAMING_READER,
+    UNIT_SHEET_COLUMNS,
+    read_projected_sheets,
+)
+from core.snapshot_service import UNIT_COLUMN_MAP
+
+
+def _reference(excel_bytes: bytes) -> dict[str, pd.DataFrame]:
+    """Current path (pd.read_excel + stripped names), projected to the used columns."""
+    sheets = {}
+    for name, df in pd.read_excel(BytesIO(excel_bytes), sheet_name=["Unit", "Task"]).items():
+        df.columns = df.columns.str.strip()
+        sheets[name] = df[[c for c in df.columns if c in SHEET_COLUMNS[name]]]
+    return sheets
+
+
+def _assert_matches_reference(excel_bytes: bytes) -> dict[str, pd.DataFrame]:
+    streamed = read_projected_sheets(excel_bytes, ["Unit", "Task"])
+    for name, expected in _reference(excel_bytes).items():
+        pd.testing.assert_frame_equal(streamed[name], expected)
+    return streamed
+
+
+def test_projection_covers_the_unit_column_map():
+    assert set(UNIT_SHEET_COLUMNS) == set(UNIT_COLUMN_MAP)
+
+
+def test_synthetic_workbook_matches_read_excel():
+    streamed = _assert_matches_reference(build_workbook_bytes(200, seed=3, today=date(2026, 3, 1)))
+    assert len(streamed["Unit"]) == 200
+
+
+def test_messy_cells_match_read_excel():
+    units = pd.DataFrame({
+        ' Unit ': [210, "211A", None, 213],
+        'Move-out': [pd.Timestamp("2026-01-02"), None, "n/a", pd.Timestamp("2026-01-05")],
+        'DV': [1, None, 3, 4.5],
+        'DTBR': [1, 2, 3, 4],
+        'Status': ["Ready", "N/A", "#REF!", ""],
+        'Notes': ["x", "y", "z", "w"],
+    })
+    tasks = pd.DataFrame({
+        'Unit ID': ["P-1 / Bld-1 / U-1", None, None],
+        'Paint Date': [pd.Timestamp("2026-01-01"), None, None],
+        'Comments': ["a", "b", None],
+    })
+    buffer = BytesIO()
+    with pd.ExcelWriter(buffer) as writer:
+        units.to_excel(writer, sheet_name="Unit", index=False)
+        tasks.to_excel(writer, sheet_name="Task", index=False)
+    streamed = _assert_matches_reference(buffer.getvalue())
+    assert list(streamed["Unit"].columns) == ['Unit', 'Move-out', 'DV', 'DTBR', 'Status']
+    # Second row kept for its unprojected Comments cell, trailing empty row dropped
+    # (as read_excel does)
+    assert len(streamed["Task"]) == 2
+
+
+def test_parse_sheets_uses_the_streaming_reader():
+    excel_bytes = build_workbook_bytes(50, seed=1, today=date(2026, 3, 1))
+    sheets = parse_sheets(excel_bytes, ["Unit", "Task"], reader=STREAMING_READER)
+    task_columns = sheets["Task"].columns
+    assert list(task_columns) == [c for c in SHEET_COLUMNS["Task"] if c in task_columns]
+    pd.testing.assert_frame_equal(sheets["Unit"], _reference(excel_bytes)["Unit"])
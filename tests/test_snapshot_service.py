@@ -0,0 +1,183 @@
+"""
+Tests for core.snapshot_service: a failed workbook load serves the
+last good snapshot of the same source, or raises when there is none,
+and a slow sheet does not hold up reruns that have one; properties
+never share a source;
+snapshot_freshness() flags snapshots the sheet has not confirmed;
+load_portfolio() loads properties concurrently and combines their units.
+"""
+
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import pandas as pd
+import pytest
+
+from core import datasource, snapshot_service
+from core.datasource import SourceStatus
+from core.properties import Property
+
+
+def _failing_read(file_path=None, url=None, cold_wait_s=None):
+    raise ConnectionError("sheet unavailable")
+
+
+def test_failed_load_serves_last_good_snapshot(monkeypatch):
+    last_good = SimpleNamespace(version="a" * 64)
+    monkeypatch.setattr(snapshot_service, "read_workbook_bytes", _failing_read)
+    monkeypatch.setitem(
+        snapshot_service._latest_snapshots, snapshot_service.REMOTE_SOURCE, last_good
+    )
+    assert snapshot_service.get_enriched_snapshot() is last_good
+
+
+def test_failed_load_without_last_good_raises(monkeypatch):
+    monkeypatch.setattr(snapshot_service, "read_workbook_bytes", _failing_read)
+    monkeypatch.setattr(snapshot_service, "read_manifest", lambda snapshot_dir=None: None)
+    monkeypatch.delitem(
+        snapshot_service._latest_snapshots, snapshot_service.REMOTE_SOURCE, raising=False
+    )
+    with pytest.raises(ConnectionError):
+        snapshot_service.get_enriched_snapshot()
+
+
+def test_slow_sheet_does_not_block_reruns_with_a_last_good_snapshot(monkeypatch):
+    def slow_failing_fetch(url, previous=None):
+        time.sleep(1.0)
+        raise ConnectionError("sheet timed out")
+
+    last_good = SimpleNamespace(version="a" * 64)
+    monkeypatch.setattr(datasource, "_sources", {})
+    monkeypatch.setattr(datasource, "fetch_excel_payload", slow_failing_fetch)
+    monkeypatch.setattr(snapshot_service, "REVALIDATE_WAIT_S", 0.1)
+    monkeypatch.setenv("GDRIVE_XLSX_URL", "http://127.0.0.1:9/export?format=xlsx")
+    monkeypatch.setitem(
+        snapshot_service._latest_snapshots, snapshot_service.REMOTE_SOURCE, last_good
+    )
+    for _ in range(2):  # Cold-start reruns while the first download is in flight
+        started = time.perf_counter()
+        assert snapshot_service.get_enriched_snapshot() is last_good
+        assert time.perf_counter() - started < 0.5
+    datasource.get_source().revalidation.join()
+
+
+def test_path_only_property_without_its_file_is_an_error(monkeypatch, tmp_path):
+    def unexpected_read(file_path=None, url=None, cold_wait_s=None):
+        raise AssertionError("must not fall back to the default sheet")
+
+    monkeypatch.setattr(snapshot_service, "read_workbook_bytes", unexpected_read)
+    pine = Property(
+        key="pine", name="Pine Ridge", total_units=312, path=str(tmp_path / "pine.xlsx")
+    )
+    portfolio = snapshot_service.load_portfolio([pine])
+    assert not portfolio.snapshots
+    assert "pine.xlsx" in portfolio.errors["pine"]
+
+
+def test_properties_keep_separate_last_good_snapshots(monkeypatch):
+    oaks_good = SimpleNamespace(version="a" * 64)
+    monkeypatch.setattr(snapshot_service, "read_workbook_bytes", _failing_read)
+    monkeypatch.setattr(snapshot_service, "source_status", lambda url=None: _status())
+    monkeypatch.setitem(
+        snapshot_service._latest_snapshots, snapshot_service.remote_source("oaks"), oaks_good
+    )
+    shared_url = "https://example.com/export"
+    oaks = Property(key="oaks", name="Oaks", total_units=10, url=shared_url)
+    pine = Property(key="pine", name="Pine", total_units=10, url=shared_url)
+    assert snapshot_service.get_property_snapshot(oaks) is oaks_good
+    with pytest.raises(ConnectionError):
+        snapshot_service.get_property_snapshot(pine)
+    assert snapshot_service.remote_source("default") == snapshot_service.REMOTE_SOURCE
+
+
+def _status(**overrides) -> SourceStatus:
+    fields = dict(
+        version="a" * 64, fetched_at=datetime(2025, 10, 23, 14, 30), fresh=True,
+        revalidating=False, breaker_open_until=None, last_error=None,
+    )
+    fields.update(overrides)
+    return SourceStatus(**fields)
+
+
+def _remote_snapshot(version="a" * 64):
+    return SimpleNamespace(
+        version=version, source=snapshot_service.REMOTE_SOURCE, url=None,
+        fetched_at=datetime(2025, 10, 23, 9, 0), built_at=datetime(2025, 10, 23, 9, 1),
+    )
+
+
+def test_current_fresh_snapshot_is_not_stale(monkeypatch):
+    monkeypatch.setattr(snapshot_service, "source_status", lambda url=None: _status())
+    assert not snapshot_service.snapshot_freshness(_remote_snapshot()).stale
+
+
+def test_revalidating_snapshot_is_stale(monkeypatch):
+    status = _status(fresh=False, revalidating=True)
+    monkeypatch.setattr(snapshot_service, "source_status", lambda url=None: status)
+    freshness = snapshot_service.snapshot_freshness(_remote_snapshot())
+    assert freshness.stale
+    assert freshness.as_of == datetime(2025, 10, 23, 14, 30)
+    assert "background" in freshness.detail
+
+
+def test_fallback_snapshot_is_stale_while_breaker_open(monkeypatch):
+    status = _status(
+        fresh=False, breaker_open_until=datetime(2025, 10, 23, 15, 5), last_error="500"
+    )
+    monkeypatch.setattr(snapshot_service, "source_status", lambda url=None: status)
+    freshness = snapshot_service.snapshot_freshness(_remote_snapshot("b" * 64))
+    assert freshness.stale
+    assert freshness.as_of == datetime(2025, 10, 23, 9, 0)  # the snapshot's own fetch time
+    assert "15:05" in freshness.detail
+
+
+def test_local_snapshot_is_never_stale(monkeypatch):
+    local = SimpleNamespace(
+        version="c" * 64, source="/data/DRMB.xlsx", url=None, fetched_at=None,
+        built_at=datetime.now(),
+    )
+    monkeypatch.setattr(snapshot_service, "source_status", lambda url=None: _status(fresh=False))
+    assert not snapshot_service.snapshot_freshness(local).stale
+
+
+def _units_snapshot(units: pd.DataFrame) -> SimpleNamespace:
+    return SimpleNamespace(version="d" * 64, units_frame=units, kpis={'units_in_data': len(units)})
+
+
+def test_portfolio_loads_properties_concurrently(monkeypatch):
+    properties = [
+        Property(key=f"p{i}", name=f"P{i}", total_units=10, url=f"https://example.com/{i}")
+        for i in range(4)
+    ]
+
+    def slow_snapshot(prop):
+        time.sleep(0.3)
+        if prop.key == "p3":
+            raise ConnectionError("sheet unavailable")
+        return _units_snapshot(pd.DataFrame({'unit_id': [f"{prop.key}-1", f"{prop.key}-2"]}))
+
+    monkeypatch.setattr(snapshot_service, "get_property_snapshot", slow_snapshot)
+    started = time.perf_counter()
+    portfolio = snapshot_service.load_portfolio(properties, workers=4)
+    assert time.perf_counter() - started < 0.9  # Not 4 x 0.3s
+    assert list(portfolio.snapshots) == ["p0", "p1", "p2"]
+    assert "sheet unavailable" in portfolio.errors["p3"]
+    assert portfolio.total_units == 40
+    assert list(portfolio.summary()['error'] != '') == [False, False, False, True]
+
+
+def test_portfolio_units_are_tagged_by_property():
+    snapshots = {
+        "oaks": _units_snapshot(pd.DataFrame({'unit_id': ["U-1", "U-2"], 'nvm': ["VACANT", ""]})),
+        "pine": _units_snapshot(pd.DataFrame({'unit_id': ["U-1"], 'nvm': ["NOTICE"]})),
+    }
+    units = snapshot_service.build_portfolio_units(snapshots)
+    assert list(units.columns) == ['property', 'unit_id', 'nvm']
+    assert list(units['property']) == ["oaks", "oaks", "pine"]
+    assert list(units['property'].cat.categories) == ["oaks", "pine"]
+    assert snapshot_service.build_portfolio_units({}).empty
@@ -0,0 +1,75 @@
+"""
+Round-trip tests for the on-disk parsed-sheet snapshots in core.snapshot_store.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import pandas as pd
+import pandas.testing as pdt
+
+from core import snapshot_store
+from core.snapshot_store import latest_snapshot_hash, load_snapshot, save_snapshot
+
+
+def _sheets() -> dict[str, pd.DataFrame]:
+    units = pd.DataFrame({
+        "Unit id": ["P-5 / Bld-1 / U-210", "P-5 / Bld-1 / U-211"],
+        "Move-out": [pd.Timestamp("2025-10-01"), pd.NaT],
+        "DV": [22.0, None],
+    })
+    tasks = pd.DataFrame({
+        "Unit ID": ["P-5 / Bld-1 / U-210"],
+        "Paint Date": [pd.Timestamp("2025-10-20")],
+    })
+    return {"Unit": units, "Task": tasks}
+
+
+def test_round_trip(tmp_path):
+    sheets = _sheets()
+    assert save_snapshot("abc123", sheets, snapshot_dir=tmp_path)
+    loaded = load_snapshot("abc123", ["Unit", "Task"], snapshot_dir=tmp_path)
+    assert loaded is not None
+    for name, df in sheets.items():
+        pdt.assert_frame_equal(loaded[name], df, check_dtype=False)
+    assert latest_snapshot_hash(tmp_path) == "abc123"
+
+
+def test_mixed_type_column_round_trips(tmp_path):
+    sheets = {"Unit": pd.DataFrame({"Unit": [210, "210A", None]})}
+    assert save_snapshot("mixed", sheets, snapshot_dir=tmp_path)
+    loaded = load_snapshot("mixed", ["Unit"], snapshot_dir=tmp_path)
+    assert loaded["Unit"]["Unit"].tolist()[:2] == [210, "210A"]
+
+
+def test_concurrent_save_of_same_version(tmp_path, monkeypatch):
+    write_sheet = snapshot_store._write_sheet
+
+    def other_writer_finishes_first(df, folder, sheet_name):
+        # Another worker saves the same version while this one is still writing
+        monkeypatch.setattr(snapshot_store, "_write_sheet", write_sheet)
+        assert save_snapshot("abc123", _sheets(), snapshot_dir=tmp_path)
+        write_sheet(df, folder, sheet_name)
+
+    monkeypatch.setattr(snapshot_store, "_write_sheet", other_writer_finishes_first)
+    assert save_snapshot("abc123", _sheets(), snapshot_dir=tmp_path)
+    assert [p.name for p in tmp_path.iterdir() if p.is_dir()] == ["abc123"]
+    assert load_snapshot("abc123", ["Unit", "Task"], snapshot_dir=tmp_path) is not None
+
+
+def test_missing_snapshot_or_sheet(tmp_path):
+    assert load_snapshot("nope", ["Unit"], snapshot_dir=tmp_path) is None
+    save_snapshot("abc123", {"Unit": _sheets()["Unit"]}, snapshot_dir=tmp_path)
+    assert load_snapshot("abc123", ["Unit", "Task"], snapshot_dir=tmp_path) is None
+
+
+def test_prune_keeps_latest_versions(tmp_path):
+    (tmp_path / "pine").mkdir()  # A property's snapshot folder, older than every version
+    versions = [str(i) * 64 for i in range(1, 5)]
+    for version in versions:
+        save_snapshot(version, _sheets(), snapshot_dir=tmp_path, keep=2)
+    remaining = sorted(p.name for p in tmp_path.iterdir() if p.is_dir())
+    assert len(remaining) == 3
+    assert versions[-1] in remaining and "pine" in remaining
@@ -0,0 +1,216 @@
+"""
+Tests for core.task_logic date lookups.
+TaskIndex lookups must match the original per-column filter + parse_unit_id output;
+per-unit task summaries must match a row-by-row reference.
+"""
+
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import numpy as np
+import pandas as pd
+import pandas.testing as pdt
+import pytest
+
+from core.task_logic import (
+    TASK_DATE_COLUMNS,
+    build_task_hierarchy,
+    build_task_index,
+    build_task_summaries,
+    get_tasks_for_date,
+    group_tasks_by_hierarchy,
+    parse_unit_id,
+    parse_unit_ids,
+)
+
+BASE_DAY = date(2026, 3, 10)
+
+
+def _legacy_get_tasks_for_date(tasks_df, target_date):
+    """Original implementation (reference)."""
+    results = {}
+    for task_name, date_col in TASK_DATE_COLUMNS.items():
+        if date_col not in tasks_df.columns:
+            continue
+        task_dates = pd.to_datetime(tasks_df[date_col], errors='coerce')
+        matching_tasks = tasks_df[task_dates.dt.date == target_date].copy()
+        if len(matching_tasks) > 0:
+            matching_tasks[['Phase', 'Building', 'Unit']] = matching_tasks['Unit ID'].apply(
+                lambda x: pd.Series(parse_unit_id(x))
+            )
+            results[task_name] = matching_tasks
+    return results
+
+
+def _legacy_group_tasks_by_hierarchy(tasks):
+    """Original iterrows implementation (reference)."""
+    hierarchy = {}
+    for _, row in tasks.iterrows():
+        phase = str(row.get('Phase', ''))
+        building = str(row.get('Building', ''))
+        unit = str(row.get('Unit', ''))
+        if not phase or not building or not unit:
+            continue
+        hierarchy.setdefault(phase, {}).setdefault(building, []).append({
+            'unit': unit,
+            'unit_id': row.get('Unit ID', ''),
+            'vendor': row.get('Vendor / Employee', '—'),
+            'status': row.get('Task Status', '—')
+        })
+    return hierarchy
+
+
+def _sample_tasks(n: int = 200, seed: int = 3) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    unit_ids = [
+        f"P-{rng.integers(1, 6)} / Bld-{rng.integers(1, 9)} / U-{rng.integers(100, 400)}"
+        for _ in range(n)
+    ]
+    unit_ids[0], unit_ids[1], unit_ids[2] = None, "malformed", "P-1/Bld-2/U-3/extra"
+    frame = {
+        'Unit ID': unit_ids,
+        'Vendor / Employee': rng.choice(['Ana', 'Bo', None], size=n),
+        'Task Status': rng.choice(['Open', 'Done'], size=n),
+    }
+    for date_col in list(TASK_DATE_COLUMNS.values())[:-1]:  # 'Final walk Date' missing
+        offsets = rng.integers(-4, 4, size=n)
+        days = [pd.Timestamp(BASE_DAY + timedelta(days=int(d))) for d in offsets]
+        frame[date_col] = [None if rng.random() < 0.4 else d for d in days]
+    frame['Bids Date'] = [
+        d.strftime('%m/%d/%Y') if d is not None else 'TBD' for d in frame['Bids Date']
+    ]
+    return pd.DataFrame(frame)
+
+
+def test_parse_unit_ids_matches_scalar_parser():
+    ids = pd.Series([
+        "P-5 / Bld-1 / U-210", "P-1/Bld-2/U-3/extra", "a/b", None, 42, " P-A / Bld-B /U-C ",
+    ])
+    expected = pd.DataFrame(
+        [parse_unit_id(x) for x in ids], columns=['Phase', 'Building', 'Unit']
+    ).astype(str)
+    pdt.assert_frame_equal(parse_unit_ids(ids), expected)
+
+
+def test_task_index_matches_legacy_for_each_day():
+    tasks = _sample_tasks()
+    index = build_task_index(tasks)
+    for offset in range(-6, 6):
+        target = BASE_DAY + timedelta(days=offset)
+        expected = _legacy_get_tasks_for_date(tasks, target)
+        actual = index.tasks_for(target)
+        assert list(actual) == list(expected)
+        for task_name in expected:
+            pdt.assert_frame_equal(actual[task_name], expected[task_name])
+
+
+def test_get_tasks_for_date_without_date_columns():
+    tasks = pd.DataFrame({'Unit ID': ["P-1 / Bld-1 / U-1"]})
+    assert get_tasks_for_date(tasks, BASE_DAY) == {}
+    assert len(build_task_index(tasks)) == 0
+
+
+def test_task_counts_match_single_day_lookups():
+    tasks = _sample_tasks()
+    index = build_task_index(tasks)
+    start, end = BASE_DAY - timedelta(days=2), BASE_DAY + timedelta(days=3)
+
+    expected = {}
+    for offset in range((end - start).days + 1):
+        day = start + timedelta(days=offset)
+        for task_name, frame in _legacy_get_tasks_for_date(tasks, day).items():
+            expected[(pd.Timestamp(day), task_name)] = len(frame)
+
+    counts = index.task_counts(start, end)
+    actual = {(day, task_name): n for day, task_name, n in counts.itertuples(index=False)}
+    assert actual == expected
+    assert len(index.tasks_between(start, end)) == sum(expected.values())
+    assert index.tasks_between(end, start).empty
+
+
+def test_task_counts_by_vendor_and_phase():
+    tasks = _sample_tasks()
+    index = build_task_index(tasks)
+    entries = index.tasks_between(BASE_DAY, BASE_DAY + timedelta(days=1))
+    counts = index.task_counts(
+        BASE_DAY, BASE_DAY + timedelta(days=1), by=('phase', 'vendor'), per_day=False
+    )
+    assert list(counts.columns) == ['Phase', 'Vendor / Employee', 'Tasks']
+    assert counts['Tasks'].sum() == len(entries)
+    with pytest.raises(ValueError):
+        index.task_counts(BASE_DAY, BASE_DAY, by=('unit',))
+
+
+def test_hierarchy_matches_legacy_grouping():
+    index = build_task_index(_sample_tasks())
+    for task_name, tasks in index.tasks_for(BASE_DAY).items():
+        legacy = _legacy_group_tasks_by_hierarchy(tasks)
+        grouped = group_tasks_by_hierarchy(tasks)
+        assert grouped == legacy
+        # Keys come out sorted, as render_task_hierarchy expects
+        assert list(grouped) == sorted(legacy)
+
+        hierarchy = build_task_hierarchy(tasks)
+        assert hierarchy.task_rows == len(tasks)
+        legacy_total = sum(len(units) for phase in legacy.values() for units in phase.values())
+        assert hierarchy.total == legacy_total
+        for phase in hierarchy.phases:
+            assert phase.total == sum(b.total for b in phase.buildings)
+            assert [b.building for b in phase.buildings] == sorted(legacy[phase.phase])
+
+
+def test_hierarchy_memoized_per_date_and_type():
+    index = build_task_index(_sample_tasks())
+    hierarchies = index.hierarchies_for(BASE_DAY)
+    assert list(hierarchies) == list(index.tasks_for(BASE_DAY))
+    task_name = next(iter(hierarchies))
+    assert index.hierarchy_for(BASE_DAY, task_name) is hierarchies[task_name]
+    assert not index.hierarchy_for(BASE_DAY, 'Final Walk')
+    assert not build_task_hierarchy(pd.DataFrame({'Unit ID': []}))
+
+
+def _reference_task_summaries(tasks_df, today):
+    """Row-by-row task summaries: {unit key: (scheduled, next_task, status, vendor)}."""
+    summaries = {}
+    for row_no, (_, row) in enumerate(tasks_df.iterrows()):
+        key = str(row['Unit ID']).strip() if pd.notna(row['Unit ID']) else ''
+        if not key:
+            continue
+        scheduled, upcoming, status, vendor = summaries.get(key, (0, [], None, None))
+        if status is None:
+            status = str(row['Task Status']) if pd.notna(row['Task Status']) else ''
+            vendor = str(row['Vendor / Employee']) if pd.notna(row['Vendor / Employee']) else ''
+        for type_no, (task_name, date_col) in enumerate(TASK_DATE_COLUMNS.items()):
+            if date_col not in tasks_df.columns:
+                continue
+            day = pd.to_datetime(row[date_col], errors='coerce')
+            if pd.isna(day):
+                continue
+            scheduled += 1
+            if day.date() >= today:
+                upcoming = upcoming + [(day, type_no, row_no, f"{task_name} {day:%m/%d}")]
+        summaries[key] = (scheduled, upcoming, status, vendor)
+    return {
+        key: (scheduled, min(upcoming)[3] if upcoming else '', status, vendor)
+        for key, (scheduled, upcoming, status, vendor) in summaries.items()
+    }
+
+
+def test_task_summaries_match_reference():
+    tasks = _sample_tasks()
+    tasks = pd.concat([tasks, tasks.iloc[10:30]], ignore_index=True)  # units with several rows
+    summaries = build_task_summaries(build_task_index(tasks), BASE_DAY)
+    actual = {
+        key: (row.tasks_scheduled, row.next_task, row.task_status, row.task_vendor)
+        for key, row in summaries.iterrows()
+    }
+    assert actual == _reference_task_summaries(tasks, BASE_DAY)
+
+
+def test_task_summaries_without_unit_ids():
+    tasks = pd.DataFrame({'MR date': ['2026-03-10']})
+    summaries = build_task_summaries(build_task_index(tasks), BASE_DAY)
+    assert summaries.empty
@@ -0,0 +1,126 @@
+"""
+Tests for core.transport: streamed downloads match the served body and
+its hash, gzip bodies are decoded, the pooled session reuses one
+keep-alive connection per host (also across a redirect), and each
+download records its metrics.
+"""
+
+import gzip
+import hashlib
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import pytest
+import requests
+
+from core.transport import HTTPTransport
+
+BODY = bytes(range(256)) * 4000  # ~1 MB, several stream chunks
+
+
+@pytest.fixture
+def servers():
+    """Start keep-alive HTTP/1.1 servers; each yields (url, state), state records client ports."""
+    started = []
+
+    def _start():
+        state = {"ports": set(), "gzip": False, "status": 200, "redirect": None}
+        httpd = ThreadingHTTPServer(("127.0.0.1", 0), _make_handler(state))
+        threading.Thread(target=httpd.serve_forever, daemon=True).start()
+        started.append(httpd)
+        return f"http://127.0.0.1:{httpd.server_address[1]}/export", state
+
+    yield _start
+    for httpd in started:
+        httpd.shutdown()
+        httpd.server_close()
+
+
+@pytest.fixture
+def server(servers):
+    return servers()
+
+
+def _make_handler(state: dict):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            state["ports"].add(self.client_address[1])
+            if state["redirect"]:
+                self.send_response(302)
+                self.send_header("Location", state["redirect"])
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            if state["status"] != 200:
+                self.send_response(state["status"])
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            body = BODY
+            self.send_response(200)
+            if state["gzip"] and "gzip" in self.headers.get("Accept-Encoding", ""):
+                body = gzip.compress(BODY)
+                self.send_header("Content-Encoding", "gzip")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def test_streamed_body_and_hash(server):
+    url, _ = server
+    transport = HTTPTransport(chunk_bytes=64 * 1024)
+    download = transport.get(url)
+    assert download.status == 200
+    assert download.content == BODY
+    assert download.sha256 == hashlib.sha256(BODY).hexdigest()
+    assert download.metrics.body_bytes == download.metrics.wire_bytes == len(BODY)
+    assert download.metrics.throughput_bps > 0
+
+
+def test_gzip_body_is_decoded(server):
+    url, state = server
+    state["gzip"] = True
+    download = HTTPTransport().get(url)
+    assert download.content == BODY
+    assert download.metrics.encoding == "gzip"
+    assert download.metrics.wire_bytes < download.metrics.body_bytes
+
+
+def test_session_keeps_connection_alive(server):
+    url, state = server
+    transport = HTTPTransport()
+    for _ in range(3):
+        transport.get(url)
+    assert len(state["ports"]) == 1
+    assert len(transport.recent()) == 3
+    assert transport.last() is transport.recent()[-1]
+
+
+def test_connections_stay_alive_across_a_redirect(servers):
+    export_url, export = servers()
+    content_url, content = servers()
+    export["redirect"] = content_url  # Like docs.google.com -> *.googleusercontent.com
+    transport = HTTPTransport()
+    for _ in range(3):
+        assert transport.get(export_url).content == BODY
+    assert len(export["ports"]) == 1 and len(content["ports"]) == 1
+
+
+def test_http_error_raises_without_metrics(server):
+    url, state = server
+    state["status"] = 503
+    transport = HTTPTransport()
+    with pytest.raises(requests.HTTPError):
+        transport.get(url)
+    assert transport.last() is None
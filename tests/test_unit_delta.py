@@ -0,0 +1,94 @@
+"""
+Incremental recomputation tests: patching only changed units must give the
+same enriched frame and building aggregates as a full recompute.
+"""
+
+import sys
+from datetime import date
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import pandas as pd
+import pandas.testing as pdt
+
+from core.data_logic import compute_all_unit_fields
+from core.phase_logic import build_building_stats
+from core.schema import apply_unit_schema
+from core.unit_delta import apply_unit_delta, make_delta_base, patch_building_stats
+
+TODAY = date(2025, 10, 23)
+
+
+def _raw_units(make_units, n: int = 200, seed: int = 2) -> pd.DataFrame:
+    return make_units(n, seed=seed, today=TODAY, excel_days=True)
+
+
+def _stats(units: pd.DataFrame) -> pd.DataFrame:
+    return build_building_stats(units, phase_col='phase', building_col='building')
+
+
+def test_incremental_matches_full_recompute(make_units):
+    old_raw = _raw_units(make_units)
+    old_enriched = compute_all_unit_fields(old_raw, today=TODAY)
+    base = make_delta_base(old_raw, TODAY)
+
+    new_raw = old_raw.copy()
+    new_raw.loc[3, 'status'] = 'On hold'
+    new_raw.loc[10, 'move_in'] = pd.Timestamp(TODAY) - pd.Timedelta(days=60)
+    new_raw.loc[20, 'building'] = 0  # moves to a new building
+    new_raw = new_raw.drop(index=[50, 51])
+    extra = _raw_units(make_units, n=2, seed=9).assign(unit_id=['NEW-1', 'NEW-2'])
+    new_raw = pd.concat([new_raw, extra], ignore_index=True)
+
+    patched, delta = apply_unit_delta(base, old_enriched, new_raw, TODAY)
+    full = compute_all_unit_fields(new_raw, today=TODAY)
+
+    assert not delta.full_recompute
+    assert sorted(delta.added) == ['NEW-1', 'NEW-2']
+    assert len(delta.removed) == 2
+    assert delta.recomputed == 5
+    pdt.assert_frame_equal(patched, full)
+
+    stats = patch_building_stats(_stats(old_enriched), old_enriched, patched, delta)
+    pdt.assert_frame_equal(stats, _stats(full))
+
+
+def test_patched_compact_frame_keeps_compact_dtypes(make_units):
+    # As snapshot_service does: the previous frame already went through the schema.
+    # Fully filled Excel day columns are int64, and Int16 + int64 concatenates to Int64.
+    old_raw = _raw_units(make_units).fillna({'days_vacant': 0})
+    old_raw = old_raw.astype({'days_vacant': int, 'days_to_be_ready': int})
+    old_compact = apply_unit_schema(compute_all_unit_fields(old_raw, today=TODAY))
+    new_raw = old_raw.copy()
+    new_raw.loc[3, 'status'] = 'On hold'
+
+    patched, delta = apply_unit_delta(make_delta_base(old_raw, TODAY), old_compact, new_raw, TODAY)
+    assert not delta.full_recompute
+    full = apply_unit_schema(compute_all_unit_fields(new_raw, today=TODAY))
+    patched = apply_unit_schema(patched)
+    assert str(patched['days_vacant'].dtype) == 'Int16'
+    pdt.assert_frame_equal(patched, full)
+
+
+def test_transitions_reported(make_units):
+    old_raw = _raw_units(make_units)
+    old_enriched = compute_all_unit_fields(old_raw, today=TODAY)
+    new_raw = old_raw.copy()
+    ready = old_enriched.loc[5, 'lifecycle_label'] == 'Ready'
+    new_raw.loc[5, 'status'] = 'Pending' if ready else 'Ready'
+
+    _, delta = apply_unit_delta(make_delta_base(old_raw, TODAY), old_enriched, new_raw, TODAY)
+    assert delta.changed == [old_raw.loc[5, 'unit_id']]
+    fields = {(t['unit_id'], t['field']) for t in delta.transitions}
+    assert (old_raw.loc[5, 'unit_id'], 'lifecycle_label') in fields
+
+
+def test_day_change_forces_full_recompute(make_units):
+    old_raw = _raw_units(make_units)
+    old_enriched = compute_all_unit_fields(old_raw, today=TODAY)
+    tomorrow = date(2025, 10, 24)
+    base = make_delta_base(old_raw, TODAY)
+    patched, delta = apply_unit_delta(base, old_enriched, old_raw, tomorrow)
+    assert delta.full_recompute
+    pdt.assert_frame_equal(patched, compute_all_unit_fields(old_raw, today=tomorrow))
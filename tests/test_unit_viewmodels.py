@@ -0,0 +1,65 @@
+"""
+Tests for ui.unit_viewmodels: the columnar view-model table must match the
+original per-row build_enhanced_unit output (legacy_reference) and carry the
+joined task summaries.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import pandas as pd
+from legacy_reference import legacy_build_enhanced_unit
+
+from core.task_logic import TASK_SUMMARY_COLUMNS
+from ui.unit_viewmodels import VIEWMODEL_COLUMNS, build_unit_viewmodels, unit_records
+
+
+def _compact_units(make_units, n: int = 200, seed: int = 2) -> pd.DataFrame:
+    units = make_units(n, seed=seed, stage="compact", excel_days=True)
+    # Rows are looked up by label, not position
+    return units.set_axis(pd.RangeIndex(1000, 1000 + n))
+
+
+def test_viewmodels_match_legacy_rows(make_units):
+    units = _compact_units(make_units)
+    records = unit_records(build_unit_viewmodels(units), units)
+    for record, (_, row) in zip(records, units.iterrows()):
+        legacy = legacy_build_enhanced_unit(row)
+        for key, value in legacy.items():
+            both_missing = pd.isna(value) and pd.isna(record[key])
+            assert type(record[key]) is type(value), key
+            assert record[key] == value or both_missing, key
+
+
+def test_viewmodels_index_by_unit_rows(make_units):
+    units = _compact_units(make_units, n=40)
+    viewmodels = build_unit_viewmodels(units)
+    assert list(viewmodels.columns) == VIEWMODEL_COLUMNS
+    page = units[units['lifecycle_label'] == 'Ready'].iloc[2:5]
+    assert [r['unit_id'] for r in unit_records(viewmodels, page)] == list(page['unit_id'])
+
+
+def test_task_summaries_are_joined_on_unit_id(make_units):
+    units = _compact_units(make_units, n=10)
+    first, second = units['unit_id'].iloc[0], units['unit_id'].iloc[1]
+    summaries = pd.DataFrame(
+        {
+            'tasks_scheduled': [3, 1],
+            'next_task': ['Paint 03/12', ''],
+            'task_status': ['Open', ''],
+            'task_vendor': ['Ana', ''],
+        },
+        index=pd.Index([first, second], name='unit_key'),
+    )[TASK_SUMMARY_COLUMNS]
+    padded = units.assign(unit_id=units['unit_id'] + ' ')
+    records = unit_records(build_unit_viewmodels(padded, summaries), units)
+    assert records[0]['task_summary'] == '🧰 Paint 03/12 · 3 tasks'
+    assert records[1]['task_summary'] == '🧰 1 task'
+    assert records[2]['tasks_scheduled'] == 0 and records[2]['task_summary'] == ''
+    assert records[0]['task_status'] == 'Open'
+
+
+def test_viewmodels_of_empty_frame(make_units):
+    assert build_unit_viewmodels(_compact_units(make_units).iloc[0:0]).empty